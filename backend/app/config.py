@@ -1,15 +1,100 @@
+import os
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
+# Project root (repository root), the default base for relative data paths
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
 
 class Settings(BaseSettings):
     POLYGON_API_KEY: str = ""
     DATABASE_URL: str = "sqlite+aiosqlite:///data/stocks.db"
+    # Base for relative data paths, the SQLite database included; empty means
+    # PROJECT_ROOT. Containers set it to their working directory (/app).
+    DATA_ROOT: str = ""
     SURGE_THRESHOLD_PCT: float = 20.0
+    BAR_STORE_DIR: str = "data/bars"
+    # Flat file imports are only read from under this directory
+    FLAT_FILE_IMPORT_DIR: str = "data/flat_files"
+    # "memory" (per process) or "sqlite" (shared by all processes on the host)
+    RATE_LIMITER_BACKEND: str = "memory"
+    RATE_LIMITER_PATH: str = "data/rate_limit.db"
+    RESPONSE_CACHE_PATH: str = "data/response_cache.db"
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_MAX_ROWS: int = 100_000
+    # "polygon" (live), "record" (live, saved to CASSETTE_PATH),
+    # "replay" (from CASSETTE_PATH, offline) or "synthetic" (generated)
+    DATA_SOURCE: str = "polygon"
+    CASSETTE_PATH: str = "data/cassette.jsonl.gz"
+    SYNTHETIC_SYMBOLS: int = 5000
+    SYNTHETIC_SEED: int = 0
 
     model_config = {
         "env_file": "../.env",
         "env_file_encoding": "utf-8",
     }
 
+    @model_validator(mode="after")
+    def _separate_offline_data(self) -> "Settings":
+        """Keep non-live data sources out of the live bar store and database.
+
+        Synthetic, replayed and recorded bars get ``data/<DATA_SOURCE>/``
+        unless configured explicitly; explicitly pointing them at the live
+        store or database is refused.
+        """
+        mode = self.DATA_SOURCE
+        if mode == "polygon":
+            return self
+        defaults = type(self).model_fields
+        offline_defaults = {
+            "BAR_STORE_DIR": f"data/{mode}/bars",
+            "DATABASE_URL": f"sqlite+aiosqlite:///data/{mode}/stocks.db",
+        }
+        for name, offline_default in offline_defaults.items():
+            value = getattr(self, name)
+            live_default = defaults[name].default
+            if _data_location(value) != _data_location(live_default):
+                continue
+            if name in self.model_fields_set:
+                raise ValueError(
+                    f"{name}={value!r} is the live data location; point it "
+                    f"elsewhere (or leave it unset) with DATA_SOURCE={mode!r}"
+                )
+            setattr(self, name, offline_default)
+        return self
+
+
+def _data_location(value: str) -> str:
+    """Normalized path of a data directory or SQLite URL, for comparison."""
+    for prefix in ("sqlite+aiosqlite:///", "sqlite:///"):
+        if value.startswith(prefix):
+            value = value[len(prefix) :]
+            break
+    return os.path.normpath(value)
+
+
+def resolve_data_path(path: str) -> str:
+    """Resolve a relative data path against DATA_ROOT (or the project root)."""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(settings.DATA_ROOT or PROJECT_ROOT, path)
+
+
+def resolve_database_url(url: str) -> str:
+    """Point a relative SQLite URL at the same base as the other data paths.
+
+    Plain ``sqlite:///`` URLs are switched to the aiosqlite driver.
+    """
+    for prefix in ("sqlite+aiosqlite:///", "sqlite:///"):
+        if url.startswith(prefix):
+            path = url[len(prefix) :]
+            if path and path != ":memory:":
+                path = resolve_data_path(path)
+            return f"sqlite+aiosqlite:///{path}"
+    return url
+
 
 settings = Settings()
@@ -0,0 +1,224 @@
+import logging
+import math
+import os
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from typing import Any
+
+from app.data_sources.base import DataSourceWrapper, StockDataSource
+
+logger = logging.getLogger(__name__)
+
+# Columns persisted for every symbol, in Polygon grouped_daily key names
+FIELDS = ("o", "h", "l", "c", "v", "vw", "t", "n")
+
+_MAGIC = b"USBAR1\n"
+_HEADER = struct.Struct("<II")  # row count, symbol block length
+_FILE_SUFFIX = ".bars"
+
+
+@dataclass
+class DayBars:
+    """Columnar snapshot of one grouped_daily payload."""
+
+    symbols: list[str] = field(default_factory=list)
+    columns: dict[str, array] = field(
+        default_factory=lambda: {name: array("d") for name in FIELDS}
+    )
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @classmethod
+    def from_results(cls, results: list[dict[str, Any]]) -> "DayBars":
+        bars = cls()
+        nan = math.nan
+        for item in results:
+            symbol = item.get("T")
+            if not symbol:
+                continue
+            bars.symbols.append(symbol)
+            for name in FIELDS:
+                value = item.get(name)
+                bars.columns[name].append(nan if value is None else float(value))
+        return bars
+
+    def to_results(self) -> list[dict[str, Any]]:
+        """Rebuild the grouped_daily payload (missing values are omitted)."""
+        results: list[dict[str, Any]] = [{"T": symbol} for symbol in self.symbols]
+        for name in FIELDS:
+            for item, value in zip(results, self.columns[name], strict=True):
+                if value == value:  # skip NaN
+                    item[name] = int(value) if name in ("t", "n") else value
+        return results
+
+    def encode(self) -> bytes:
+        symbol_block = "\n".join(self.symbols).encode("utf-8")
+        parts = [_HEADER.pack(len(self.symbols), len(symbol_block)), symbol_block]
+        for name in FIELDS:
+            column = self.columns[name]
+            if sys.byteorder == "big":
+                column = array("d", column)
+                column.byteswap()
+            parts.append(column.tobytes())
+        return _MAGIC + zlib.compress(b"".join(parts), 6)
+
+    @classmethod
+    def decode(cls, blob: bytes) -> "DayBars":
+        if not blob.startswith(_MAGIC):
+            raise ValueError("Not a bar store file")
+        payload = zlib.decompress(blob[len(_MAGIC) :])
+        count, symbol_len = _HEADER.unpack_from(payload)
+        offset = _HEADER.size
+        symbol_block = payload[offset : offset + symbol_len].decode("utf-8")
+        offset += symbol_len
+        bars = cls(symbols=symbol_block.split("\n") if count else [])
+        width = count * 8
+        for name in FIELDS:
+            column = array("d")
+            column.frombytes(payload[offset : offset + width])
+            if sys.byteorder == "big":
+                column.byteswap()
+            bars.columns[name] = column
+            offset += width
+        return bars
+
+
+class BarStore:
+    """Date-partitioned on-disk store of grouped_daily snapshots.
+
+    Each trading date lives in its own compressed columnar file
+    (``<root>/<YYYY>/<YYYY-MM-DD>.bars``). An empty file marks a date that
+    is known to have no data (weekend/holiday) so it is never fetched again.
+    """
+
+    def __init__(self, root: str) -> None:
+        self._root = root
+        # Cached latest_session(); None until first computed
+        self._latest: tuple[date | None] | None = None
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    def _path(self, target_date: date) -> str:
+        return os.path.join(
+            self._root,
+            f"{target_date.year:04d}",
+            f"{target_date.isoformat()}{_FILE_SUFFIX}",
+        )
+
+    def has(self, target_date: date) -> bool:
+        return os.path.exists(self._path(target_date))
+
+    def load(self, target_date: date) -> DayBars | None:
+        """Load a stored day, or None if it has never been stored."""
+        path = self._path(target_date)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            return DayBars.decode(blob)
+        except (ValueError, zlib.error, struct.error) as e:
+            logger.warning("Discarding corrupt bar file %s: %s", path, e)
+            os.remove(path)
+            self._latest = None
+            return None
+
+    def save(self, target_date: date, bars: DayBars) -> None:
+        """Atomically write a day's snapshot."""
+        path = self._path(target_date)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(bars.encode())
+        os.replace(tmp_path, path)
+        if self._latest is not None:
+            (latest,) = self._latest
+            if len(bars) and (latest is None or target_date > latest):
+                self._latest = (target_date,)
+            elif not len(bars) and target_date == latest:
+                self._latest = None
+
+    def stored_dates(self) -> list[date]:
+        """All dates present in the store, in ascending order."""
+        dates: list[date] = []
+        if not os.path.isdir(self._root):
+            return dates
+        for year_dir in os.listdir(self._root):
+            year_path = os.path.join(self._root, year_dir)
+            if not os.path.isdir(year_path):
+                continue
+            for name in os.listdir(year_path):
+                if name.endswith(_FILE_SUFFIX):
+                    try:
+                        dates.append(date.fromisoformat(name[: -len(_FILE_SUFFIX)]))
+                    except ValueError:
+                        continue
+        dates.sort()
+        return dates
+
+    def latest_session(self) -> date | None:
+        """Most recent stored date that has bars (not a holiday marker).
+
+        Scanned once, then kept up to date by ``save``. Days saved by other
+        processes are not seen, which only makes the answer older.
+        """
+        if self._latest is None:
+            self._latest = (self._scan_latest_session(),)
+        return self._latest[0]
+
+    def _scan_latest_session(self) -> date | None:
+        for stored_date in reversed(self.stored_dates()):
+            bars = self.load(stored_date)
+            if bars is not None and len(bars):
+                return stored_date
+        return None
+
+
+class StoredBarSource(DataSourceWrapper):
+    """Serves grouped_daily from a BarStore, fetching each date at most once.
+
+    With ``refetch`` each date is fetched from the inner source once per
+    process even when already stored, so a recording source sees it.
+    """
+
+    def __init__(
+        self, inner: StockDataSource, store: BarStore, refetch: bool = False
+    ) -> None:
+        super().__init__(inner)
+        self._store = store
+        self._refetch = refetch
+        self._fetched: set[date] = set()
+        self.fetch_count = 0  # grouped_daily calls that reached the inner source
+
+    @property
+    def store(self) -> BarStore:
+        return self._store
+
+    async def grouped_daily(self, target_date: date) -> list[dict[str, Any]]:
+        return (await self.grouped_daily_bars(target_date)).to_results()
+
+    async def grouped_daily_bars(self, target_date: date) -> DayBars:
+        """Columnar grouped_daily for a date, fetched only on a store miss."""
+        if not self._refetch or target_date in self._fetched:
+            bars = self._store.load(target_date)
+            if bars is not None:
+                return bars
+
+        self.fetch_count += 1
+        self._fetched.add(target_date)
+        results = await self._inner.grouped_daily(target_date)
+        bars = DayBars.from_results(results)
+        # An empty answer for today or a future date just means "not yet
+        # published", so only past empty days are remembered as holidays.
+        today = datetime.now(UTC).date()
+        if results or target_date < today:
+            self._store.save(target_date, bars)
+        return bars
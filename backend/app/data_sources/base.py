@@ -15,7 +15,12 @@ class StockDataSource(ABC):
         ...
 
     @abstractmethod
-    async def tickers_list(self, page: int = 1) -> dict[str, Any]:
+    async def search_tickers(self, query: str, limit: int = 20) -> list[dict[str, Any]]:
+        """Search active tickers by symbol or name."""
+        ...
+
+    @abstractmethod
+    async def tickers_list(self, cursor: str | None = None) -> dict[str, Any]:
         """Fetch paginated list of active tickers."""
         ...
 
@@ -25,3 +30,34 @@ class StockDataSource(ABC):
     ) -> list[dict[str, Any]]:
         """Fetch aggregate bars for a symbol over a date range."""
         ...
+
+
+class DataSourceWrapper(StockDataSource):
+    """Data source that delegates every call to an inner source.
+
+    Subclasses override only the methods they add behaviour to.
+    """
+
+    def __init__(self, inner: StockDataSource) -> None:
+        self._inner = inner
+
+    @property
+    def inner(self) -> StockDataSource:
+        return self._inner
+
+    async def grouped_daily(self, target_date: date) -> list[dict[str, Any]]:
+        return await self._inner.grouped_daily(target_date)
+
+    async def ticker_details(self, symbol: str) -> dict[str, Any] | None:
+        return await self._inner.ticker_details(symbol)
+
+    async def search_tickers(self, query: str, limit: int = 20) -> list[dict[str, Any]]:
+        return await self._inner.search_tickers(query, limit)
+
+    async def tickers_list(self, cursor: str | None = None) -> dict[str, Any]:
+        return await self._inner.tickers_list(cursor)
+
+    async def aggregate_bars(
+        self, symbol: str, from_date: date, to_date: date
+    ) -> list[dict[str, Any]]:
+        return await self._inner.aggregate_bars(symbol, from_date, to_date)
@@ -0,0 +1,70 @@
+from datetime import UTC, date, datetime
+from typing import Any
+
+from app.data_sources.bar_store import BarStore
+from app.data_sources.base import DataSourceWrapper, StockDataSource
+from app.utils.response_cache import TieredCache
+
+# Bars for a range past the last published session can still change
+OPEN_RANGE_TTL = 5 * 60
+TICKER_DETAILS_TTL = 24 * 60 * 60
+SEARCH_TTL = 60 * 60
+
+
+class CachedSource(DataSourceWrapper):
+    """Caches aggregate_bars, ticker_details and search_tickers responses.
+
+    Daily bars never change once a session is published, so ranges ending
+    on or before the latest session in ``store`` (and before today) are
+    cached without expiry. Other ranges, e.g. ending on a day Polygon has
+    not published yet, get a short TTL, as do all ranges without a store.
+    """
+
+    def __init__(
+        self, inner: StockDataSource, cache: TieredCache, store: BarStore | None = None
+    ) -> None:
+        super().__init__(inner)
+        self._cache = cache
+        self._store = store
+
+    @property
+    def cache(self) -> TieredCache:
+        return self._cache
+
+    async def aggregate_bars(
+        self, symbol: str, from_date: date, to_date: date
+    ) -> list[dict[str, Any]]:
+        key = f"aggs:{symbol}:{from_date.isoformat()}:{to_date.isoformat()}"
+        hit, bars = await self._cache.get(key)
+        if hit:
+            return bars
+        bars = await self._inner.aggregate_bars(symbol, from_date, to_date)
+        ttl = None if self._is_final(to_date) else OPEN_RANGE_TTL
+        await self._cache.set(key, bars, ttl)
+        return bars
+
+    def _is_final(self, to_date: date) -> bool:
+        if self._store is None or to_date >= datetime.now(UTC).date():
+            return False
+        latest = self._store.latest_session()
+        return latest is not None and to_date <= latest
+
+    async def ticker_details(self, symbol: str) -> dict[str, Any] | None:
+        key = f"details:{symbol}"
+        hit, entry = await self._cache.get(key)
+        if hit:
+            return entry["details"]
+        details = await self._inner.ticker_details(symbol)
+        # Wrapped so "no such ticker" (None) is cached too
+        await self._cache.set(key, {"details": details}, TICKER_DETAILS_TTL)
+        return details
+
+    async def search_tickers(self, query: str, limit: int = 20) -> list[dict[str, Any]]:
+        key = f"search:{query.upper()}:{limit}"
+        hit, results = await self._cache.get(key)
+        if hit:
+            return results
+        results = await self._inner.search_tickers(query, limit)
+        if results:  # a failed search also returns [], so don't pin it
+            await self._cache.set(key, results, SEARCH_TTL)
+        return results
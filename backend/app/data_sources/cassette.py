@@ -0,0 +1,143 @@
+import asyncio
+import gzip
+import json
+import os
+from datetime import date
+from typing import Any
+
+from app.data_sources.base import DataSourceWrapper, StockDataSource
+
+
+class Cassette:
+    """Recorded data source responses in a gzip-compressed JSON Lines file.
+
+    Each record is appended as its own gzip member, so recording never
+    rewrites the file. Later records for the same key win on load.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._entries: dict[str, Any] | None = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def _load(self) -> dict[str, Any]:
+        if self._entries is None:
+            entries: dict[str, Any] = {}
+            if os.path.exists(self._path):
+                with gzip.open(self._path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        record = json.loads(line)
+                        entries[record["key"]] = record["value"]
+            self._entries = entries
+        return self._entries
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._load()
+
+    def get(self, key: str) -> Any:
+        """Recorded response for ``key``. Raises LookupError if missing."""
+        entries = self._load()
+        if key not in entries:
+            raise LookupError(f"No recorded response for {key} in {self._path}")
+        return entries[key]
+
+    def _append(self, key: str, value: Any) -> None:
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        line = json.dumps({"key": key, "value": value}, separators=(",", ":"))
+        with gzip.open(self._path, "at", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    async def record(self, key: str, value: Any) -> None:
+        self._load()[key] = value
+        await asyncio.to_thread(self._append, key, value)
+
+
+def _grouped_key(target_date: date) -> str:
+    return f"grouped_daily:{target_date.isoformat()}"
+
+
+def _details_key(symbol: str) -> str:
+    return f"ticker_details:{symbol}"
+
+
+def _search_key(query: str, limit: int) -> str:
+    return f"search_tickers:{query}:{limit}"
+
+
+def _tickers_key(cursor: str | None) -> str:
+    return f"tickers_list:{cursor or ''}"
+
+
+def _aggs_key(symbol: str, from_date: date, to_date: date) -> str:
+    return f"aggregate_bars:{symbol}:{from_date.isoformat()}:{to_date.isoformat()}"
+
+
+class RecordingSource(DataSourceWrapper):
+    """Passes calls through to ``inner`` and records every response."""
+
+    def __init__(self, inner: StockDataSource, cassette: Cassette) -> None:
+        super().__init__(inner)
+        self._cassette = cassette
+
+    async def grouped_daily(self, target_date: date) -> list[dict[str, Any]]:
+        results = await self._inner.grouped_daily(target_date)
+        await self._cassette.record(_grouped_key(target_date), results)
+        return results
+
+    async def ticker_details(self, symbol: str) -> dict[str, Any] | None:
+        details = await self._inner.ticker_details(symbol)
+        await self._cassette.record(_details_key(symbol), details)
+        return details
+
+    async def search_tickers(self, query: str, limit: int = 20) -> list[dict[str, Any]]:
+        results = await self._inner.search_tickers(query, limit)
+        await self._cassette.record(_search_key(query, limit), results)
+        return results
+
+    async def tickers_list(self, cursor: str | None = None) -> dict[str, Any]:
+        page = await self._inner.tickers_list(cursor)
+        await self._cassette.record(_tickers_key(cursor), page)
+        return page
+
+    async def aggregate_bars(
+        self, symbol: str, from_date: date, to_date: date
+    ) -> list[dict[str, Any]]:
+        bars = await self._inner.aggregate_bars(symbol, from_date, to_date)
+        await self._cassette.record(_aggs_key(symbol, from_date, to_date), bars)
+        return bars
+
+
+class ReplaySource(StockDataSource):
+    """Serves responses from a cassette with no network access or latency.
+
+    A call that was never recorded raises LookupError, so replayed runs
+    are deterministic rather than silently returning empty data.
+    """
+
+    def __init__(self, cassette: Cassette) -> None:
+        self._cassette = cassette
+
+    async def grouped_daily(self, target_date: date) -> list[dict[str, Any]]:
+        return self._cassette.get(_grouped_key(target_date))
+
+    async def ticker_details(self, symbol: str) -> dict[str, Any] | None:
+        return self._cassette.get(_details_key(symbol))
+
+    async def search_tickers(self, query: str, limit: int = 20) -> list[dict[str, Any]]:
+        return self._cassette.get(_search_key(query, limit))
+
+    async def tickers_list(self, cursor: str | None = None) -> dict[str, Any]:
+        return self._cassette.get(_tickers_key(cursor))
+
+    async def aggregate_bars(
+        self, symbol: str, from_date: date, to_date: date
+    ) -> list[dict[str, Any]]:
+        return self._cassette.get(_aggs_key(symbol, from_date, to_date))
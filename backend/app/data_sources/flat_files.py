@@ -0,0 +1,104 @@
+import csv
+import gzip
+import math
+import os
+import re
+from datetime import date
+
+from app.data_sources.bar_store import BarStore, DayBars
+
+# Polygon day-aggregate CSV columns -> bar store (grouped_daily) fields
+COLUMN_FIELDS = {
+    "open": "o",
+    "high": "h",
+    "low": "l",
+    "close": "c",
+    "volume": "v",
+    "window_start": "t",
+    "transactions": "n",
+}
+FLAT_FILE_SUFFIX = ".csv.gz"
+
+_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})\.csv\.gz$")
+
+
+def flat_file_date(path: str) -> date | None:
+    """Trading date of a flat file, taken from its ``YYYY-MM-DD.csv.gz`` name."""
+    match = _DATE_RE.search(os.path.basename(path))
+    if match is None:
+        return None
+    try:
+        return date.fromisoformat(match.group(1))
+    except ValueError:
+        return None
+
+
+def find_flat_files(directory: str) -> list[tuple[date, str]]:
+    """All dated ``.csv.gz`` files under ``directory``, oldest first."""
+    files = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if not name.endswith(FLAT_FILE_SUFFIX):
+                continue
+            path = os.path.join(root, name)
+            file_date = flat_file_date(path)
+            if file_date is not None:
+                files.append((file_date, path))
+    files.sort()
+    return files
+
+
+def read_flat_file(path: str) -> DayBars:
+    """Parse one day-aggregate file into columns, streaming row by row.
+
+    Memory is bounded by the day's columns, never the decompressed text.
+    ``window_start`` (Unix nanoseconds) becomes ``t`` in milliseconds as in
+    grouped_daily; the files carry no VWAP, so ``vw`` is left missing.
+    """
+    bars = DayBars()
+    nan = math.nan
+    with gzip.open(path, "rt", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return bars
+        position = {name: i for i, name in enumerate(header)}
+        if "ticker" not in position:
+            raise ValueError(f"{path}: missing ticker column")
+        ticker_at = position["ticker"]
+        columns = [
+            (bars.columns[field], position.get(column))
+            for column, field in COLUMN_FIELDS.items()
+        ]
+        t_column = bars.columns["t"]
+        vwaps = bars.columns["vw"]
+        for row in reader:
+            if not row or not row[ticker_at]:
+                continue
+            bars.symbols.append(row[ticker_at])
+            for values, at in columns:
+                raw = row[at] if at is not None and at < len(row) else ""
+                values.append(float(raw) if raw else nan)
+            vwaps.append(nan)
+        # ns -> ms, in one pass over the column
+        for i, value in enumerate(t_column):
+            t_column[i] = value // 1_000_000
+    return bars
+
+
+def import_flat_file(path: str, store_root: str) -> tuple[date, int | None]:
+    """Parse a flat file into the bar store. Returns (date, rows).
+
+    Days already in the store are left alone (rows is None): bars fetched
+    over REST carry the VWAP that flat files lack. Runs in a worker
+    process: only the date and row count travel back.
+    """
+    file_date = flat_file_date(path)
+    if file_date is None:
+        raise ValueError(f"{path}: no YYYY-MM-DD date in file name")
+    store = BarStore(store_root)
+    if store.has(file_date):
+        return file_date, None
+    bars = read_flat_file(path)
+    store.save(file_date, bars)
+    return file_date, len(bars)
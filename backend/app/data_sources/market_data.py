@@ -0,0 +1,46 @@
+from app.config import resolve_data_path, settings
+from app.data_sources.bar_store import BarStore, StoredBarSource
+from app.data_sources.base import StockDataSource
+from app.data_sources.cached_source import CachedSource
+from app.data_sources.cassette import Cassette, RecordingSource, ReplaySource
+from app.data_sources.polygon_client import polygon_client
+from app.data_sources.synthetic import SyntheticMarketSource
+from app.utils.response_cache import DiskCache, LRUCache, TieredCache
+
+bar_store = BarStore(resolve_data_path(settings.BAR_STORE_DIR))
+
+response_cache = TieredCache(
+    LRUCache(settings.RESPONSE_CACHE_MAX_BYTES),
+    DiskCache(
+        resolve_data_path(settings.RESPONSE_CACHE_PATH),
+        settings.RESPONSE_CACHE_MAX_ROWS,
+    ),
+)
+
+
+def _build_source() -> StockDataSource:
+    """Upstream source selected by ``settings.DATA_SOURCE``."""
+    mode = settings.DATA_SOURCE
+    if mode == "polygon":
+        return CachedSource(polygon_client, response_cache, bar_store)
+    if mode == "synthetic":
+        return SyntheticMarketSource(
+            settings.SYNTHETIC_SYMBOLS, seed=settings.SYNTHETIC_SEED
+        )
+    cassette = Cassette(resolve_data_path(settings.CASSETTE_PATH))
+    if mode == "record":
+        # Uncached, so every live response ends up on the cassette
+        return RecordingSource(polygon_client, cassette)
+    if mode == "replay":
+        return ReplaySource(cassette)
+    raise ValueError(f"Unknown DATA_SOURCE: {mode!r}")
+
+
+# Data source used by collection, backfill, tracking and charting.
+# grouped_daily snapshots are persisted locally and fetched at most once;
+# with the live source, chart, details and search responses go through
+# the tiered cache. Non-live sources get their own store (see Settings);
+# while recording, stored dates are fetched again so they reach the cassette.
+market_data = StoredBarSource(
+    _build_source(), bar_store, refetch=settings.DATA_SOURCE == "record"
+)
@@ -1,46 +1,136 @@
+import asyncio
 import logging
+import time
 from datetime import date
 from typing import Any
 
 import httpx
 
-from app.config import settings
+from app.config import resolve_data_path, settings
 from app.data_sources.base import StockDataSource
-from app.utils.rate_limiter import RateLimiter
+from app.utils.metrics import registry
+from app.utils.rate_limiter import (
+    BATCH,
+    INTERACTIVE,
+    RateLimiter,
+    SqliteTokenBucket,
+    TokenBucket,
+)
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://api.polygon.io"
 
+REQUESTS = registry.counter(
+    "polygon_requests_total",
+    "Polygon HTTP requests by endpoint and status (coalesced callers excluded)",
+    ("endpoint", "status"),
+)
+REQUEST_SECONDS = registry.histogram(
+    "polygon_request_duration_seconds",
+    "Polygon HTTP request latency by endpoint, excluding rate-limit waits",
+    ("endpoint",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+def _make_bucket(max_tokens: int, refill_rate: float) -> TokenBucket:
+    """Token state for the configured rate limiter backend."""
+    backend = settings.RATE_LIMITER_BACKEND.lower()
+    if backend == "sqlite":
+        return SqliteTokenBucket(
+            resolve_data_path(settings.RATE_LIMITER_PATH), max_tokens, refill_rate
+        )
+    if backend != "memory":
+        raise ValueError(
+            f"Unknown RATE_LIMITER_BACKEND: {settings.RATE_LIMITER_BACKEND}"
+        )
+    return TokenBucket(max_tokens, refill_rate)
+
 
 class PolygonFreeSource(StockDataSource):
     def __init__(self) -> None:
         self._api_key = settings.POLYGON_API_KEY
-        self._rate_limiter = RateLimiter(max_tokens=5, refill_rate=5 / 60)
+        # One token is held back from batch jobs for interactive requests
+        self._rate_limiter = RateLimiter(
+            interactive_reserve=1, bucket=_make_bucket(max_tokens=5, refill_rate=5 / 60)
+        )
         self._client = httpx.AsyncClient(timeout=30.0)
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self.request_count = 0
+        self.coalesced_count = 0
 
     async def close(self) -> None:
         await self._client.aclose()
 
-    async def _request(self, url: str, params: dict | None = None) -> dict[str, Any]:
-        await self._rate_limiter.acquire()
-        if params is None:
-            params = {}
-        params["apiKey"] = self._api_key
-        response = await self._client.get(url, params=params)
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._rate_limiter
+
+    async def _request(
+        self,
+        url: str,
+        params: dict | None = None,
+        lane: str = BATCH,
+        endpoint: str = "other",
+    ) -> dict[str, Any]:
+        """Rate-limited GET, coalescing concurrent identical requests.
+
+        Callers asking for the same URL and params while a request is in
+        flight share its result instead of spending another token.
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced_count += 1
+            return await asyncio.shield(inflight)
+
+        task = asyncio.ensure_future(self._fetch(url, params, lane, endpoint))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._request_done(key, t))
+        # Shielded so one caller's cancellation does not fail the others
+        return await asyncio.shield(task)
+
+    def _request_done(self, key: tuple, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller went away
+
+    async def _fetch(
+        self, url: str, params: dict | None, lane: str, endpoint: str
+    ) -> dict[str, Any]:
+        await self._rate_limiter.acquire(lane)
+        self.request_count += 1
+        params = {**(params or {}), "apiKey": self._api_key}
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._client.get(url, params=params)
+            status = str(response.status_code)
+        finally:
+            REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint)
+            REQUESTS.inc(endpoint, status)
         response.raise_for_status()
         return response.json()
 
+    def stats(self) -> dict[str, int]:
+        """HTTP requests issued, requests served by coalescing, in flight."""
+        return {
+            "requests": self.request_count,
+            "coalesced": self.coalesced_count,
+            "in_flight": len(self._inflight),
+        }
+
     async def grouped_daily(self, target_date: date) -> list[dict[str, Any]]:
         date_str = target_date.strftime("%Y-%m-%d")
         url = f"{BASE_URL}/v2/aggs/grouped/locale/us/market/stocks/{date_str}"
-        data = await self._request(url)
+        data = await self._request(url, endpoint="grouped_daily")
         return data.get("results", [])
 
     async def ticker_details(self, symbol: str) -> dict[str, Any] | None:
         url = f"{BASE_URL}/v3/reference/tickers/{symbol}"
         try:
-            data = await self._request(url)
+            data = await self._request(url, lane=INTERACTIVE, endpoint="ticker_details")
             return data.get("results")
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
@@ -56,7 +146,9 @@ class PolygonFreeSource(StockDataSource):
             "limit": str(limit),
         }
         try:
-            data = await self._request(url, params)
+            data = await self._request(
+                url, params, lane=INTERACTIVE, endpoint="search_tickers"
+            )
             return data.get("results", [])
         except Exception as e:
             logger.warning("Polygon ticker search failed: %s", e)
@@ -71,7 +163,7 @@ class PolygonFreeSource(StockDataSource):
         }
         if cursor:
             params["cursor"] = cursor
-        data = await self._request(url, params)
+        data = await self._request(url, params, endpoint="tickers_list")
         # Extract cursor from next_url for pagination
         next_cursor: str | None = None
         next_url = data.get("next_url")
@@ -92,13 +184,28 @@ class PolygonFreeSource(StockDataSource):
     ) -> list[dict[str, Any]]:
         from_str = from_date.strftime("%Y-%m-%d")
         to_str = to_date.strftime("%Y-%m-%d")
-        url = (
-            f"{BASE_URL}/v2/aggs/ticker/{symbol}"
-            f"/range/1/day/{from_str}/{to_str}"
-        )
-        data = await self._request(url)
+        url = f"{BASE_URL}/v2/aggs/ticker/{symbol}/range/1/day/{from_str}/{to_str}"
+        data = await self._request(url, lane=INTERACTIVE, endpoint="aggregate_bars")
         return data.get("results", [])
 
 
 # Singleton instance
 polygon_client = PolygonFreeSource()
+
+
+def _limiter_gauge(field: str) -> dict[tuple[str, ...], float]:
+    stats = polygon_client.rate_limiter.stats()
+    return {(lane,): lane_stats[field] for lane, lane_stats in stats.items()}
+
+
+registry.gauge(
+    "rate_limiter_queue_depth",
+    "Callers waiting for a Polygon rate-limit token, by lane",
+    ("lane",),
+    collect=lambda: _limiter_gauge("queue_depth"),
+)
+registry.gauge(
+    "polygon_requests_in_flight",
+    "Polygon HTTP requests currently in flight",
+    collect=lambda: {(): polygon_client.stats()["in_flight"]},
+)
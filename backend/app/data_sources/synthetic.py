@@ -0,0 +1,158 @@
+import random
+import string
+from datetime import UTC, date, datetime, time
+from typing import Any
+
+from app.data_sources.base import StockDataSource
+from app.utils.trading_calendar import is_trading_day, trading_days_between
+
+PAGE_SIZE = 1000
+# Per-day cache of generated sessions, so chart requests stay cheap
+_DAY_CACHE_SIZE = 64
+
+
+def _symbol_for(index: int) -> str:
+    """Deterministic 1-5 letter ticker for a universe index (A, B, ..., AA, ...)."""
+    letters = string.ascii_uppercase
+    symbol = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        symbol = letters[rem] + symbol
+    return symbol
+
+
+class SyntheticMarketSource(StockDataSource):
+    """Generated market with grouped_daily payloads shaped like Polygon's.
+
+    Every session is derived only from ``(seed, date)``, so any date can be
+    generated on its own and repeated runs see identical data. Each symbol
+    trades around a fixed base price with small daily noise; a fraction
+    ``surge_rate`` of symbols jump 20-150% on any given day, and a few
+    symbols skip a day, as halted or thinly traded tickers do.
+    """
+
+    def __init__(
+        self,
+        symbol_count: int = 5000,
+        seed: int = 0,
+        surge_rate: float = 0.005,
+        missing_rate: float = 0.01,
+    ) -> None:
+        self.symbol_count = symbol_count
+        self.seed = seed
+        self.surge_rate = surge_rate
+        self.missing_rate = missing_rate
+        rng = random.Random(seed)
+        self.symbols = [_symbol_for(i) for i in range(symbol_count)]
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        # Log-normal price and volume levels: mostly $5-$200, some pennies
+        self._base_price = [
+            round(min(max(rng.lognormvariate(3.3, 1.2), 0.5), 2000.0), 2)
+            for _ in range(symbol_count)
+        ]
+        self._base_volume = [rng.lognormvariate(12.5, 1.5) for _ in range(symbol_count)]
+        self._days: dict[date, list[dict[str, Any] | None]] = {}
+
+    def _session(self, target_date: date) -> list[dict[str, Any] | None]:
+        """Bars for every symbol (None where the symbol did not trade)."""
+        cached = self._days.get(target_date)
+        if cached is not None:
+            return cached
+
+        rng = random.Random(self.seed * 1_000_003 + target_date.toordinal())
+        close_time = datetime.combine(target_date, time(21, 0), tzinfo=UTC)
+        t = int(close_time.timestamp() * 1000)
+        bars: list[dict[str, Any] | None] = []
+        for i, symbol in enumerate(self.symbols):
+            # Draw every variate up front so one symbol's outcome never
+            # shifts the stream for the symbols after it
+            missing, surge, jump, noise, gap, wick_up, wick_down, vol = (
+                rng.random(),
+                rng.random(),
+                rng.uniform(0.2, 1.5),
+                rng.gauss(0.0, 0.02),
+                rng.gauss(0.0, 0.01),
+                rng.random(),
+                rng.random(),
+                rng.lognormvariate(0.0, 0.5),
+            )
+            if missing < self.missing_rate:
+                bars.append(None)
+                continue
+            base = self._base_price[i]
+            open_ = base * (1 + gap)
+            close = base * (1 + noise)
+            volume = self._base_volume[i] * vol
+            if surge < self.surge_rate:
+                close *= 1 + jump
+                volume *= 5
+            high = max(open_, close) * (1 + 0.02 * wick_up)
+            low = min(open_, close) * (1 - 0.02 * wick_down)
+            bars.append(
+                {
+                    "T": symbol,
+                    "o": round(open_, 4),
+                    "h": round(high, 4),
+                    "l": round(low, 4),
+                    "c": round(close, 4),
+                    "v": float(round(volume)),
+                    "vw": round((open_ + high + low + close) / 4, 4),
+                    "t": t,
+                    "n": max(1, int(volume / 150)),
+                }
+            )
+
+        if len(self._days) >= _DAY_CACHE_SIZE:
+            self._days.pop(next(iter(self._days)))
+        self._days[target_date] = bars
+        return bars
+
+    def _details(self, symbol: str) -> dict[str, Any]:
+        return {
+            "ticker": symbol,
+            "name": f"{symbol} Synthetic Corp",
+            "market": "stocks",
+            "primary_exchange": "XNAS" if self._index[symbol] % 2 else "XNYS",
+            "type": "CS",
+            "currency_name": "usd",
+            "active": True,
+        }
+
+    async def grouped_daily(self, target_date: date) -> list[dict[str, Any]]:
+        if not is_trading_day(target_date):
+            return []
+        return [bar for bar in self._session(target_date) if bar is not None]
+
+    async def ticker_details(self, symbol: str) -> dict[str, Any] | None:
+        if symbol not in self._index:
+            return None
+        return self._details(symbol)
+
+    async def search_tickers(self, query: str, limit: int = 20) -> list[dict[str, Any]]:
+        prefix = query.upper()
+        matches = [s for s in self.symbols if s.startswith(prefix)]
+        return [self._details(s) for s in matches[:limit]]
+
+    async def tickers_list(self, cursor: str | None = None) -> dict[str, Any]:
+        offset = int(cursor) if cursor else 0
+        page = self.symbols[offset : offset + PAGE_SIZE]
+        end = offset + len(page)
+        return {
+            "results": [self._details(s) for s in page],
+            "next_cursor": str(end) if end < self.symbol_count else None,
+            "count": len(page),
+        }
+
+    async def aggregate_bars(
+        self, symbol: str, from_date: date, to_date: date
+    ) -> list[dict[str, Any]]:
+        index = self._index.get(symbol)
+        if index is None:
+            return []
+        bars = []
+        for day in trading_days_between(from_date, to_date):
+            bar = self._session(day)[index]
+            if bar is not None:
+                bars.append({k: v for k, v in bar.items() if k != "T"})
+        return bars
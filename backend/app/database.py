@@ -1,21 +1,23 @@
+import logging
 import os
+import re
+import time
 from collections.abc import AsyncGenerator
 
-from sqlalchemy import event
+from sqlalchemy import event, inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from app.config import settings
+from app.config import resolve_database_url, settings
+from app.models import Base
+from app.utils.metrics import registry
 
-# Resolve relative SQLite path to absolute (relative to project root)
-_project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-_db_url = settings.DATABASE_URL
-_prefix = "sqlite+aiosqlite:///"
-if _db_url.startswith(_prefix):
-    _db_path = _db_url[len(_prefix):]
-    if _db_path and not os.path.isabs(_db_path):
-        _abs_db_path = os.path.join(_project_root, _db_path)
-        os.makedirs(os.path.dirname(_abs_db_path), exist_ok=True)
-        _db_url = f"{_prefix}{_abs_db_path}"
+logger = logging.getLogger(__name__)
+
+# Resolve a relative SQLite path against the same base as the other data paths
+_db_url = resolve_database_url(settings.DATABASE_URL)
+_db_path = _db_url.removeprefix("sqlite+aiosqlite:///")
+if os.path.isabs(_db_path):
+    os.makedirs(os.path.dirname(_db_path), exist_ok=True)
 
 engine = create_async_engine(
     _db_url,
@@ -32,9 +34,114 @@ def _set_sqlite_pragma(dbapi_connection, connection_record):
     cursor.close()
 
 
+_OPERATION_RE = re.compile(r"\s*(\w+)")
+
+STATEMENT_SECONDS = registry.histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time by statement type",
+    ("operation",),
+)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info["statement_started"] = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _observe_statement(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("statement_started", None)
+    if started is not None:
+        # The leading keyword keeps the label set small: SELECT, INSERT, ...
+        match = _OPERATION_RE.match(statement)
+        operation = match.group(1).upper() if match else "OTHER"
+        STATEMENT_SECONDS.observe(time.perf_counter() - started, operation)
+
+
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
+
+
+# Duplicate rows that would block a new unique index, keyed by index name.
+# Only the oldest row of each group is kept (with its tracking records).
+_DEDUPE_BEFORE_INDEX = {
+    "uq_surge_events_symbol_date": [
+        """
+        DELETE FROM surge_tracking WHERE surge_event_id IN (
+            SELECT id FROM surge_events WHERE id NOT IN (
+                SELECT MIN(id) FROM surge_events GROUP BY symbol, event_date
+            )
+        )
+        """,
+        """
+        DELETE FROM surge_events WHERE id NOT IN (
+            SELECT MIN(id) FROM surge_events GROUP BY symbol, event_date
+        )
+        """,
+    ],
+    "uq_surge_tracking_event_days": [
+        """
+        DELETE FROM surge_tracking WHERE id NOT IN (
+            SELECT MIN(id) FROM surge_tracking GROUP BY surge_event_id, days_after
+        )
+        """,
+    ],
+}
+
+# Single-column indexes superseded by a composite index with the same
+# leading column
+_OBSOLETE_INDEXES = [
+    "ix_surge_events_symbol",
+    "ix_surge_events_event_date",
+    "ix_surge_tracking_surge_event_id",
+]
+
+
+def _migrate(connection) -> None:
+    """Bring an existing database up to the current schema.
+
+    ``create_all`` only creates missing tables, so nullable columns and
+    indexes added to existing tables are created here, and superseded
+    indexes are dropped.
+    """
+    Base.metadata.create_all(connection)
+    for name in _OBSOLETE_INDEXES:
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    inspector = inspect(connection)
+    indexes_created = False
+    for table in Base.metadata.sorted_tables:
+        columns = {col["name"] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in columns:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(
+                text(
+                    f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'
+                )
+            )
+            logger.info("Added column %s.%s", table.name, column.name)
+
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            for statement in _DEDUPE_BEFORE_INDEX.get(index.name, []):
+                connection.execute(text(statement))
+            index.create(connection)
+            indexes_created = True
+            logger.info("Created index %s on %s", index.name, table.name)
+
+    if indexes_created:
+        # Refresh planner statistics so the new indexes get picked up
+        connection.execute(text("ANALYZE"))
+
+
+async def init_db() -> None:
+    """Create tables and apply schema migrations."""
+    async with engine.begin() as conn:
+        await conn.run_sync(_migrate)
@@ -2,15 +2,20 @@ import asyncio
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import func, select
 
-from app.database import async_session, engine
-from app.models.ticker import Base, Ticker
+from app.database import async_session, engine, init_db
+from app.models.ticker import Ticker
 from app.routers import admin, settings, stocks, surges, tracking
+from app.services import rollup_service
+from app.tasks.backfill import resume_interrupted_backfills
+from app.tasks.job_runner import job_runner
 from app.tasks.scheduler import scheduler, setup_scheduler
 from app.tasks.ticker_sync import run_ticker_sync
+from app.utils import metrics
+from app.utils.ticker_index import ticker_index
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,9 +27,8 @@ async def _initial_ticker_sync() -> None:
         result = await session.execute(select(func.count(Ticker.symbol)))
         count = result.scalar() or 0
     if count == 0:
-        logger.info("Tickers table empty, running initial sync...")
-        await run_ticker_sync()
-        logger.info("Initial ticker sync completed")
+        logger.info("Tickers table empty, queueing initial sync...")
+        await job_runner.submit("ticker_sync", run_ticker_sync)
     else:
         logger.info("Tickers table has %d records, skipping initial sync", count)
 
@@ -32,9 +36,12 @@ async def _initial_ticker_sync() -> None:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await init_db()
     logger.info("Database tables created")
+    async with async_session() as session:
+        await rollup_service.ensure_rollups(session)
+        await ticker_index.refresh(session)
+    logger.info("Ticker search index built (%d tickers)", len(ticker_index))
 
     setup_scheduler()
     scheduler.start()
@@ -42,12 +49,15 @@ async def lifespan(app: FastAPI):
 
     # Run initial ticker sync in background (non-blocking)
     asyncio.create_task(_initial_ticker_sync())
+    # Pick up backfills interrupted by a crash or restart
+    asyncio.create_task(resume_interrupted_backfills())
 
     yield
 
     # Shutdown
     scheduler.shutdown(wait=False)
     logger.info("Scheduler stopped")
+    await job_runner.shutdown()
     await engine.dispose()
 
 
@@ -58,6 +68,7 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(metrics.HTTPMetricsMiddleware, registry=metrics.registry)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
@@ -76,3 +87,8 @@ app.include_router(admin.router)
 @app.get("/api/health")
 async def health_check():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
@@ -1,13 +1,20 @@
+from app.models.change_counter import ChangeCounter
+from app.models.collected_date import CollectedDate
 from app.models.collection_log import CollectionLog
 from app.models.surge_event import SurgeEvent
+from app.models.surge_rollup import SurgeRollup
 from app.models.surge_tracking import SurgeTracking
-from app.models.ticker import Ticker
+from app.models.ticker import Base, Ticker
 from app.models.user_setting import UserSetting
 
 __all__ = [
+    "Base",
     "Ticker",
     "SurgeEvent",
+    "SurgeRollup",
     "SurgeTracking",
     "CollectionLog",
+    "CollectedDate",
+    "ChangeCounter",
     "UserSetting",
 ]
@@ -0,0 +1,29 @@
+from sqlalchemy import DDL, Integer, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.ticker import Base
+
+# Tables whose writers bump a counter
+COUNTED_TABLES = ("surge_events", "tickers")
+
+
+class ChangeCounter(Base):
+    """Per-table write counters, see ``change_counter_service``.
+
+    Caches of derived values key on a table's version, so a write from any
+    process sharing the database invalidates them.
+    """
+
+    __tablename__ = "change_counters"
+
+    table_name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+
+
+# Runs on every create_all, so existing databases get their rows as well
+for _table in COUNTED_TABLES:
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(f"INSERT OR IGNORE INTO change_counters VALUES ('{_table}', 0)"),
+    )
@@ -0,0 +1,18 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Float, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.ticker import Base
+
+
+class CollectedDate(Base):
+    """Per-date completion checkpoint for collection and backfill."""
+
+    __tablename__ = "collected_dates"
+
+    trade_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    threshold_pct: Mapped[float] = mapped_column(Float)
+    surge_count: Mapped[int] = mapped_column(Integer, default=0)
+    collection_log_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    completed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
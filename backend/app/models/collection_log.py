@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy import JSON, DateTime, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.ticker import Base
@@ -16,3 +17,9 @@ class CollectionLog(Base):
     status: Mapped[str] = mapped_column(String(20), default="running")
     records_count: Mapped[int] = mapped_column(Integer, default=0)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Job-specific counters and progress, e.g. {"inserted": 10, "updated": 2}
+    details: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    # Job runner instance that queued the job, refreshing heartbeat_at while
+    # the job is queued or running
+    owner: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
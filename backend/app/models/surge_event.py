@@ -1,6 +1,6 @@
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.ticker import Base
@@ -8,18 +8,23 @@ from app.models.ticker import Base
 
 class SurgeEvent(Base):
     __tablename__ = "surge_events"
+    __table_args__ = (
+        # De-duplication, and per-symbol lookups through its leading column
+        Index("uq_surge_events_symbol_date", "symbol", "event_date", unique=True),
+        # Date filters with change_pct ordering (today's surges, date ranges)
+        Index("ix_surge_events_date_change", "event_date", "change_pct"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    symbol: Mapped[str] = mapped_column(
-        String(20), ForeignKey("tickers.symbol"), index=True
-    )
-    event_date: Mapped[date] = mapped_column(Date, index=True)
+    symbol: Mapped[str] = mapped_column(String(20), ForeignKey("tickers.symbol"))
+    event_date: Mapped[date] = mapped_column(Date)
     open: Mapped[float] = mapped_column(Float)
     high: Mapped[float] = mapped_column(Float)
     low: Mapped[float] = mapped_column(Float)
     close: Mapped[float] = mapped_column(Float)
     volume: Mapped[int] = mapped_column(Integer)
     prev_close: Mapped[float] = mapped_column(Float)
+    # Also serves keyset paging: SQLite appends the rowid (id) to every index
     change_pct: Mapped[float] = mapped_column(Float, index=True)
     vwap: Mapped[float | None] = mapped_column(Float, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,24 @@
+from sqlalchemy import Float, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.ticker import Base
+
+
+class SurgeRollup(Base):
+    """Pre-aggregated surge statistics, one row per (dimension, key).
+
+    Dimensions: ``weekday`` (0=Monday), ``month`` (1-12), ``symbol`` and
+    ``horizon`` (tracking days_after). Maintained incrementally as events
+    and tracking records are written. Sectors are not a dimension: a
+    ticker's sector can be filled in after its events are rolled up, so
+    sector stats join the symbol rows to tickers when read.
+    """
+
+    __tablename__ = "surge_rollups"
+    __table_args__ = (Index("ix_surge_rollups_dimension_count", "dimension", "count"),)
+
+    dimension: Mapped[str] = mapped_column(String(20), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    change_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    win_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -1,6 +1,6 @@
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.ticker import Base
@@ -8,11 +8,17 @@ from app.models.ticker import Base
 
 class SurgeTracking(Base):
     __tablename__ = "surge_tracking"
+    __table_args__ = (
+        # One record per event and horizon; also the tracking existence check
+        Index(
+            "uq_surge_tracking_event_days", "surge_event_id", "days_after", unique=True
+        ),
+        # Covers win-rate/average aggregation and quantile scans per horizon
+        Index("ix_surge_tracking_days_change", "days_after", "change_from_surge_pct"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    surge_event_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("surge_events.id"), index=True
-    )
+    surge_event_id: Mapped[int] = mapped_column(Integer, ForeignKey("surge_events.id"))
     days_after: Mapped[int] = mapped_column(Integer)
     close_price: Mapped[float] = mapped_column(Float)
     change_from_surge_pct: Mapped[float] = mapped_column(Float)
@@ -17,7 +17,9 @@ class Ticker(Base):
     exchange: Mapped[str | None] = mapped_column(String(50), nullable=True)
     type: Mapped[str | None] = mapped_column(String(50), nullable=True)
     sic_code: Mapped[str | None] = mapped_column(String(10), nullable=True)
-    sic_description: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    sic_description: Mapped[str | None] = mapped_column(
+        String(255), nullable=True, index=True
+    )
     currency: Mapped[str | None] = mapped_column(String(10), nullable=True)
     active: Mapped[bool] = mapped_column(Boolean, default=True)
     updated_at: Mapped[datetime] = mapped_column(
@@ -1,10 +1,13 @@
-import asyncio
-from datetime import date, datetime, timezone
+import os
+from datetime import UTC, date, datetime
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import resolve_data_path, settings
+from app.data_sources.market_data import response_cache
+from app.data_sources.polygon_client import polygon_client
 from app.database import get_session
 from app.models.collection_log import CollectionLog
 from app.models.surge_event import SurgeEvent
@@ -12,12 +15,20 @@ from app.models.ticker import Ticker
 from app.schemas.admin import (
     AdminStatusResponse,
     BackfillResponse,
-    CollectResponse,
     CollectionLogResponse,
+    CollectResponse,
+    FlatFileImportResponse,
+    JobResponse,
+    RebuildRollupsResponse,
+    ReevaluateResponse,
     TickerSyncResponse,
 )
-from app.tasks.backfill import run_backfill
+from app.services import rollup_service
+from app.tasks.backfill import backfill_details, run_backfill
 from app.tasks.daily_collection import run_daily_collection
+from app.tasks.flat_file_import import run_flat_file_import
+from app.tasks.job_runner import job_runner
+from app.tasks.reevaluate import run_threshold_reevaluation
 from app.tasks.scheduler import scheduler
 from app.tasks.ticker_sync import run_ticker_sync
 
@@ -48,6 +59,9 @@ async def admin_status(
         ),
         total_surge_events=surge_count,
         total_tickers=ticker_count,
+        rate_limiter=polygon_client.rate_limiter.stats(),
+        polygon_requests=polygon_client.stats(),
+        response_cache=response_cache.stats(),
     )
 
 
@@ -56,15 +70,14 @@ async def manual_collect(
     target_date: date = Query(default=None, alias="date"),
 ):
     if target_date is None:
-        target_date = datetime.now(timezone.utc).date()
+        target_date = datetime.now(UTC).date()
 
-    try:
-        log_id = await run_daily_collection(target_date)
-        return CollectResponse(
-            message=f"Collection completed for {target_date}", log_id=log_id
-        )
-    except Exception as e:
-        return CollectResponse(message=f"Collection failed: {e}", log_id=None)
+    log_id = await job_runner.submit(
+        "daily_collection", run_daily_collection, target_date
+    )
+    return CollectResponse(
+        message=f"Collection queued for {target_date}", log_id=log_id
+    )
 
 
 @router.post("/backfill", response_model=BackfillResponse)
@@ -72,24 +85,101 @@ async def backfill(
     from_date: date = Query(alias="from_date"),
     to_date: date = Query(alias="to_date"),
 ):
-    try:
-        log_id = await run_backfill(from_date, to_date)
-        return BackfillResponse(
-            message=f"Backfill completed from {from_date} to {to_date}",
-            log_id=log_id,
+    if from_date > to_date:
+        raise HTTPException(status_code=400, detail="from_date must be <= to_date")
+
+    log_id = await job_runner.submit(
+        "backfill",
+        run_backfill,
+        from_date,
+        to_date,
+        details=backfill_details(from_date, to_date),
+    )
+    return BackfillResponse(
+        message=f"Backfill queued from {from_date} to {to_date}",
+        log_id=log_id,
+    )
+
+
+@router.post("/import-flat-files", response_model=FlatFileImportResponse)
+async def import_flat_files(
+    directory: str = Query(
+        default="",
+        description="Directory of YYYY-MM-DD.csv.gz day aggregates, "
+        "relative to FLAT_FILE_IMPORT_DIR",
+    ),
+):
+    root = os.path.realpath(resolve_data_path(settings.FLAT_FILE_IMPORT_DIR))
+    directory = os.path.realpath(os.path.join(root, directory))
+    if os.path.commonpath([root, directory]) != root:
+        raise HTTPException(
+            status_code=400, detail="directory must be inside the import directory"
         )
-    except Exception as e:
-        return BackfillResponse(message=f"Backfill failed: {e}", log_id=None)
+    if not os.path.isdir(directory):
+        raise HTTPException(status_code=400, detail="directory not found")
+
+    log_id = await job_runner.submit(
+        "flat_file_import", run_flat_file_import, directory, uses_api=False
+    )
+    return FlatFileImportResponse(
+        message=f"Flat file import queued from {directory}", log_id=log_id
+    )
 
 
 @router.post("/ticker-sync", response_model=TickerSyncResponse)
 async def manual_ticker_sync():
-    try:
-        log_id = await run_ticker_sync()
-        return TickerSyncResponse(
-            message="Ticker sync completed", log_id=log_id
-        )
-    except Exception as e:
-        return TickerSyncResponse(
-            message=f"Ticker sync failed: {e}", log_id=None
-        )
+    log_id = await job_runner.submit("ticker_sync", run_ticker_sync)
+    return TickerSyncResponse(message="Ticker sync queued", log_id=log_id)
+
+
+@router.post("/reevaluate", response_model=ReevaluateResponse)
+async def reevaluate(
+    threshold: float | None = Query(default=None, gt=0),
+    prune: bool = Query(default=False),
+):
+    log_id = await job_runner.submit(
+        "reevaluation",
+        run_threshold_reevaluation,
+        threshold=threshold,
+        prune=prune,
+        uses_api=False,
+    )
+    target = f"{threshold}%" if threshold is not None else "the current threshold"
+    return ReevaluateResponse(
+        message=f"Re-evaluation queued at {target}", log_id=log_id
+    )
+
+
+@router.post("/rebuild-rollups", response_model=RebuildRollupsResponse)
+async def rebuild_rollups(
+    session: AsyncSession = Depends(get_session),
+):
+    rows = await rollup_service.rebuild_rollups(session)
+    await session.commit()
+    return RebuildRollupsResponse(message=f"Rebuilt {rows} rollup rows", rows=rows)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def job_status(
+    job_id: int,
+    session: AsyncSession = Depends(get_session),
+):
+    log = await session.get(CollectionLog, job_id)
+    if log is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobResponse.model_validate(log).model_copy(
+        update={"active": job_runner.is_active(job_id)}
+    )
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(
+    job_id: int,
+    session: AsyncSession = Depends(get_session),
+):
+    log = await session.get(CollectionLog, job_id)
+    if log is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not job_runner.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Job is not running")
+    return JobResponse.model_validate(log).model_copy(update={"active": True})
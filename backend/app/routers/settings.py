@@ -4,6 +4,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_session
 from app.schemas.settings import SettingsResponse, SettingsUpdate
 from app.services import settings_service
+from app.tasks.job_runner import job_runner
+from app.tasks.reevaluate import run_threshold_reevaluation
 
 router = APIRouter(prefix="/api/settings", tags=["settings"])
 
@@ -31,7 +33,19 @@ async def update_settings(
         updates["collection_enabled"] = str(body.collection_enabled).lower()
 
     settings = await settings_service.update_settings(session, updates)
+    threshold = float(settings.get("surge_threshold_pct", "20.0"))
+
+    reevaluation_log_id = None
+    if body.reevaluate:
+        reevaluation_log_id = await job_runner.submit(
+            "reevaluation",
+            run_threshold_reevaluation,
+            threshold=threshold,
+            prune=body.prune_below_threshold,
+            uses_api=False,
+        )
     return SettingsResponse(
-        surge_threshold_pct=float(settings.get("surge_threshold_pct", "20.0")),
+        surge_threshold_pct=threshold,
         collection_enabled=settings.get("collection_enabled", "true").lower() == "true",
+        reevaluation_log_id=reevaluation_log_id,
     )
@@ -1,6 +1,7 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_session
@@ -10,7 +11,8 @@ from app.schemas.surge import (
     SurgeListResponse,
     SurgeStatsResponse,
 )
-from app.services import surge_service
+from app.services import export_service, surge_service
+from app.utils.fast_json import json_response
 
 router = APIRouter(prefix="/api/surges", tags=["surges"])
 
@@ -23,40 +25,34 @@ async def list_surges(
     to_date: date | None = None,
     min_pct: float | None = None,
     sector: str | None = None,
+    cursor: str | None = None,
     session: AsyncSession = Depends(get_session),
 ):
-    items, total = await surge_service.get_surges(
-        session,
-        page=page,
-        page_size=page_size,
-        from_date=from_date,
-        to_date=to_date,
-        min_pct=min_pct,
-        sector=sector,
-    )
-    return SurgeListResponse(
-        items=[
-            SurgeEventResponse(
-                id=s.id,
-                symbol=s.symbol,
-                event_date=s.event_date,
-                open=s.open,
-                high=s.high,
-                low=s.low,
-                close=s.close,
-                volume=s.volume,
-                prev_close=s.prev_close,
-                change_pct=s.change_pct,
-                vwap=s.vwap,
-                created_at=s.created_at,
-                ticker_name=s.ticker.name if s.ticker else None,
-                sic_description=s.ticker.sic_description if s.ticker else None,
-            )
-            for s in items
-        ],
-        total=total,
-        page=page,
-        page_size=page_size,
+    try:
+        items, total = await surge_service.get_surges(
+            session,
+            page=page,
+            page_size=page_size,
+            from_date=from_date,
+            to_date=to_date,
+            min_pct=min_pct,
+            sector=sector,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return json_response(
+        {
+            "items": [row._asdict() for row in items],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "next_cursor": (
+                surge_service.encode_cursor(items[-1])
+                if len(items) == page_size
+                else None
+            ),
+        }
     )
 
 
@@ -65,25 +61,7 @@ async def today_surges(
     session: AsyncSession = Depends(get_session),
 ):
     items = await surge_service.get_today_surges(session)
-    return [
-        SurgeEventResponse(
-            id=s.id,
-            symbol=s.symbol,
-            event_date=s.event_date,
-            open=s.open,
-            high=s.high,
-            low=s.low,
-            close=s.close,
-            volume=s.volume,
-            prev_close=s.prev_close,
-            change_pct=s.change_pct,
-            vwap=s.vwap,
-            created_at=s.created_at,
-            ticker_name=s.ticker.name if s.ticker else None,
-            sic_description=s.ticker.sic_description if s.ticker else None,
-        )
-        for s in items
-    ]
+    return json_response([row._asdict() for row in items])
 
 
 @router.get("/stats", response_model=SurgeStatsResponse)
@@ -94,6 +72,30 @@ async def surge_stats(
     return SurgeStatsResponse(**stats)
 
 
+@router.get("/export")
+async def export_surges(
+    format: export_service.ExportFormat = "csv",
+    from_date: date | None = None,
+    to_date: date | None = None,
+    min_pct: float | None = None,
+    sector: str | None = None,
+    session: AsyncSession = Depends(get_session),
+):
+    batches = export_service.export_batches(
+        session,
+        from_date=from_date,
+        to_date=to_date,
+        min_pct=min_pct,
+        sector=sector,
+    )
+    extension = "csv" if format == "csv" else "ndjson"
+    return StreamingResponse(
+        export_service.ENCODERS[format](batches),
+        media_type=export_service.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="surges.{extension}"'},
+    )
+
+
 @router.get("/{surge_id}", response_model=SurgeEventDetail)
 async def surge_detail(
     surge_id: int,
@@ -101,8 +103,6 @@ async def surge_detail(
 ):
     event = await surge_service.get_surge_detail(session, surge_id)
     if event is None:
-        from fastapi import HTTPException
-
         raise HTTPException(status_code=404, detail="Surge event not found")
     return SurgeEventDetail(
         id=event.id,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_session
@@ -10,15 +10,21 @@ router = APIRouter(prefix="/api/tracking", tags=["tracking"])
 
 @router.get("/", response_model=TrackingResponse)
 async def tracking_performance(
+    quantiles: bool = Query(False),
     session: AsyncSession = Depends(get_session),
 ):
-    performance = await tracking_service.get_tracking_performance(session)
+    performance = await tracking_service.get_tracking_performance(
+        session, include_quantiles=quantiles
+    )
     return TrackingResponse(performance=performance)
 
 
 @router.get("/by-sector", response_model=TrackingBySectorResponse)
 async def tracking_by_sector(
+    quantiles: bool = Query(False),
     session: AsyncSession = Depends(get_session),
 ):
-    sectors = await tracking_service.get_tracking_by_sector(session)
+    sectors = await tracking_service.get_tracking_by_sector(
+        session, include_quantiles=quantiles
+    )
     return TrackingBySectorResponse(sectors=sectors)
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Any
 
 from pydantic import BaseModel
 
@@ -11,15 +12,26 @@ class CollectionLogResponse(BaseModel):
     status: str
     records_count: int
     error_message: str | None = None
+    details: dict[str, Any] | None = None
 
     model_config = {"from_attributes": True}
 
 
+class RateLimiterLaneStats(BaseModel):
+    queue_depth: int
+    acquired: int
+    avg_wait: float
+    max_wait: float
+
+
 class AdminStatusResponse(BaseModel):
     scheduler_running: bool
     last_collection: CollectionLogResponse | None = None
     total_surge_events: int
     total_tickers: int
+    rate_limiter: dict[str, RateLimiterLaneStats] = {}
+    polygon_requests: dict[str, int] = {}
+    response_cache: dict[str, int] = {}
 
 
 class CollectResponse(BaseModel):
@@ -35,3 +47,22 @@ class BackfillResponse(BaseModel):
 class TickerSyncResponse(BaseModel):
     message: str
     log_id: int | None = None
+
+
+class FlatFileImportResponse(BaseModel):
+    message: str
+    log_id: int | None = None
+
+
+class ReevaluateResponse(BaseModel):
+    message: str
+    log_id: int | None = None
+
+
+class RebuildRollupsResponse(BaseModel):
+    message: str
+    rows: int
+
+
+class JobResponse(CollectionLogResponse):
+    active: bool = False
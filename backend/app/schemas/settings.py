@@ -4,8 +4,12 @@ from pydantic import BaseModel
 class SettingsResponse(BaseModel):
     surge_threshold_pct: float = 20.0
     collection_enabled: bool = True
+    reevaluation_log_id: int | None = None
 
 
 class SettingsUpdate(BaseModel):
     surge_threshold_pct: float | None = None
     collection_enabled: bool | None = None
+    # Re-detect surges across the stored history at the new threshold
+    reevaluate: bool = False
+    prune_below_threshold: bool = False
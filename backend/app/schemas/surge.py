@@ -2,7 +2,7 @@ from datetime import date, datetime
 
 from pydantic import BaseModel
 
-from app.schemas.tracking import TrackingRecord
+from app.schemas.tracking import PerformanceSummary, TrackingRecord
 
 
 class SurgeEventResponse(BaseModel):
@@ -33,6 +33,8 @@ class SurgeListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    # Pass as ?cursor= to fetch the page after this one
+    next_cursor: str | None = None
 
 
 class SectorStat(BaseModel):
@@ -66,3 +68,4 @@ class SurgeStatsResponse(BaseModel):
     by_day_of_week: list[DayOfWeekStat]
     by_month: list[MonthStat]
     repeat_surgers: list[RepeatSurger]
+    by_horizon: list[PerformanceSummary] = []
@@ -19,6 +19,10 @@ class PerformanceSummary(BaseModel):
     avg_change_pct: float
     win_rate: float
     sample_count: int
+    # Only populated when quantiles are requested
+    median_change_pct: float | None = None
+    p25_change_pct: float | None = None
+    p75_change_pct: float | None = None
 
 
 class TrackingResponse(BaseModel):
@@ -0,0 +1,25 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.change_counter import ChangeCounter
+
+
+async def bump(session: AsyncSession, table_name: str) -> None:
+    """Record a write to ``table_name``.
+
+    Writers call this once per insert or delete statement that changed
+    rows, in the same transaction, so the version moves exactly when the
+    change commits. Writes made outside the application do not move it.
+    """
+    await session.execute(
+        update(ChangeCounter)
+        .where(ChangeCounter.table_name == table_name)
+        .values(version=ChangeCounter.version + 1)
+    )
+
+
+async def get_version(session: AsyncSession, table_name: str) -> int:
+    version = await session.scalar(
+        select(ChangeCounter.version).where(ChangeCounter.table_name == table_name)
+    )
+    return version or 0
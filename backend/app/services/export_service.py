@@ -0,0 +1,102 @@
+import csv
+import io
+from collections.abc import AsyncIterator
+from datetime import date
+from typing import Literal
+
+from pydantic_core import to_json
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.surge_event import SurgeEvent
+from app.models.surge_tracking import SurgeTracking
+from app.models.ticker import Ticker
+from app.services.surge_service import SURGE_ROW_COLUMNS, surge_filters
+from app.tasks.daily_collection import TRACKING_DAYS
+
+# Accepted by the export endpoint; keys of ENCODERS and MEDIA_TYPES
+ExportFormat = Literal["csv", "ndjson", "columnar"]
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "columnar": "application/x-ndjson",
+}
+
+
+def _export_query(filters: list):
+    # One column per tracking horizon. Each is a lookup on the
+    # (surge_event_id, days_after) unique index, so rows stream out in id
+    # order without a GROUP BY over the whole result.
+    horizons = [
+        select(SurgeTracking.change_from_surge_pct)
+        .where(
+            SurgeTracking.surge_event_id == SurgeEvent.id,
+            SurgeTracking.days_after == days,
+        )
+        .scalar_subquery()
+        .label(f"change_{days}d")
+        for days in TRACKING_DAYS
+    ]
+    return (
+        select(*SURGE_ROW_COLUMNS, *horizons)
+        .select_from(SurgeEvent)
+        .join(Ticker, isouter=True)
+        .where(*filters)
+        .order_by(SurgeEvent.id)
+    )
+
+
+async def export_batches(
+    session: AsyncSession,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    min_pct: float | None = None,
+    sector: str | None = None,
+    batch_size: int | None = None,
+) -> AsyncIterator[list[Row]]:
+    """Surge events with tracking changes, in batches of ``batch_size`` rows.
+
+    Rows are read through a server-side cursor, so memory use is bounded by
+    one batch regardless of how many events match.
+    """
+    query = _export_query(surge_filters(from_date, to_date, min_pct, sector))
+    result = await session.stream(
+        query.execution_options(yield_per=batch_size or EXPORT_BATCH_SIZE)
+    )
+    async for rows in result.partitions():
+        yield rows
+
+
+async def encode_csv(batches: AsyncIterator[list[Row]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(col.name for col in _export_query([]).selected_columns)
+    async for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def encode_ndjson(batches: AsyncIterator[list[Row]]) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield b"".join(to_json(row._asdict()) + b"\n" for row in rows)
+
+
+async def encode_columnar(batches: AsyncIterator[list[Row]]) -> AsyncIterator[bytes]:
+    """One JSON line per batch: {"rows": n, "columns": {name: [values]}}."""
+    async for rows in batches:
+        names = list(rows[0]._fields)
+        columns = dict(zip(names, map(list, zip(*rows, strict=True)), strict=True))
+        yield to_json({"rows": len(rows), "columns": columns}) + b"\n"
+
+
+ENCODERS = {
+    "csv": encode_csv,
+    "ndjson": encode_ndjson,
+    "columnar": encode_columnar,
+}
@@ -0,0 +1,124 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import Integer, case, cast, delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.surge_event import SurgeEvent
+from app.models.surge_rollup import SurgeRollup
+from app.models.surge_tracking import SurgeTracking
+
+WEEKDAY = "weekday"
+MONTH = "month"
+SYMBOL = "symbol"
+HORIZON = "horizon"
+
+
+async def _apply(
+    session: AsyncSession, deltas: dict[tuple[str, str], list[float]]
+) -> None:
+    """Add [count, change_sum, win_count] deltas to their rollup rows."""
+    if not deltas:
+        return
+    table = SurgeRollup.__table__
+    stmt = sqlite_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["dimension", "key"],
+        set_={
+            column: table.c[column] + stmt.excluded[column]
+            for column in ("count", "change_sum", "win_count")
+        },
+    )
+    await session.execute(
+        stmt,
+        [
+            {
+                "dimension": dimension,
+                "key": key,
+                "count": int(count),
+                "change_sum": change_sum,
+                "win_count": int(win_count),
+            }
+            for (dimension, key), (count, change_sum, win_count) in deltas.items()
+        ],
+    )
+
+
+def _add(
+    deltas: dict[tuple[str, str], list[float]],
+    dimension: str,
+    key: Any,
+    change: float,
+) -> None:
+    delta = deltas[(dimension, str(key))]
+    delta[0] += 1
+    delta[1] += change
+    delta[2] += change > 0
+
+
+async def add_events(
+    session: AsyncSession, events: Iterable[tuple[str, Any, float]]
+) -> None:
+    """Roll newly inserted (symbol, event_date, change_pct) events up."""
+    deltas: dict[tuple[str, str], list[float]] = defaultdict(lambda: [0, 0.0, 0])
+    for symbol, event_date, change_pct in events:
+        _add(deltas, WEEKDAY, event_date.weekday(), change_pct)
+        _add(deltas, MONTH, event_date.month, change_pct)
+        _add(deltas, SYMBOL, symbol, change_pct)
+    await _apply(session, deltas)
+
+
+async def add_tracking(
+    session: AsyncSession, rows: Iterable[tuple[int, float]]
+) -> None:
+    """Roll newly inserted (days_after, change_from_surge_pct) rows up by horizon."""
+    deltas: dict[tuple[str, str], list[float]] = defaultdict(lambda: [0, 0.0, 0])
+    for days_after, change_pct in rows:
+        _add(deltas, HORIZON, days_after, change_pct)
+    await _apply(session, deltas)
+
+
+async def rebuild_rollups(session: AsyncSession) -> int:
+    """Recompute every rollup from the base tables. Returns rows written.
+
+    Needed once for data written before rollups existed, and after events
+    are deleted.
+    """
+    await session.execute(delete(SurgeRollup))
+
+    win = func.sum(case((SurgeEvent.change_pct > 0, 1), else_=0))
+    event_columns = (func.count(SurgeEvent.id), func.sum(SurgeEvent.change_pct), win)
+    weekday = cast(func.strftime("%w", SurgeEvent.event_date), Integer)
+    month = cast(func.strftime("%m", SurgeEvent.event_date), Integer)
+    queries = {
+        WEEKDAY: select(weekday, *event_columns).group_by(weekday),
+        MONTH: select(month, *event_columns).group_by(month),
+        SYMBOL: select(SurgeEvent.symbol, *event_columns).group_by(SurgeEvent.symbol),
+        HORIZON: select(
+            SurgeTracking.days_after,
+            func.count(SurgeTracking.id),
+            func.sum(SurgeTracking.change_from_surge_pct),
+            func.sum(case((SurgeTracking.change_from_surge_pct > 0, 1), else_=0)),
+        ).group_by(SurgeTracking.days_after),
+    }
+
+    deltas: dict[tuple[str, str], list[float]] = {}
+    for dimension, query in queries.items():
+        result = await session.execute(query)
+        for key, count, change_sum, win_count in result.all():
+            if dimension == WEEKDAY:
+                key = (key + 6) % 7  # SQLite %w is 0=Sunday; rollups use 0=Monday
+            deltas[(dimension, str(key))] = [count, change_sum or 0.0, win_count or 0]
+    await _apply(session, deltas)
+    return len(deltas)
+
+
+async def ensure_rollups(session: AsyncSession) -> None:
+    """Build rollups for a database that has events but no rollups yet."""
+    has_rollups = await session.scalar(select(SurgeRollup.key).limit(1))
+    has_events = await session.scalar(select(SurgeEvent.id).limit(1))
+    if has_rollups is None and has_events is not None:
+        await rebuild_rollups(session)
+        await session.commit()
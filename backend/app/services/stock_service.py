@@ -3,30 +3,32 @@ from datetime import date
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.data_sources.polygon_client import polygon_client
+from app.data_sources.market_data import market_data
 from app.models.ticker import Ticker
+from app.utils.ticker_index import ticker_index
 
 
-async def search_tickers(
-    session: AsyncSession, query: str, limit: int = 20
-) -> list:
-    """Search tickers by symbol or name. Falls back to Polygon.io API if local DB is empty."""
-    pattern = f"%{query.upper()}%"
-    stmt = (
-        select(Ticker)
-        .where(
-            (Ticker.symbol.like(pattern)) | (Ticker.name.like(pattern))
+async def search_tickers(session: AsyncSession, query: str, limit: int = 20) -> list:
+    """Search tickers by symbol or name. Falls back to Polygon.io API if nothing matches locally."""
+    if ticker_index.ready:
+        await ticker_index.ensure_current(session)
+        local_results = ticker_index.search(query, limit)
+    else:
+        # Index not built yet (startup): plain LIKE scan of the table
+        pattern = f"%{query.upper()}%"
+        stmt = (
+            select(Ticker)
+            .where((Ticker.symbol.like(pattern)) | (Ticker.name.like(pattern)))
+            .limit(limit)
         )
-        .limit(limit)
-    )
-    result = await session.execute(stmt)
-    local_results = list(result.scalars().all())
+        result = await session.execute(stmt)
+        local_results = list(result.scalars().all())
 
     if local_results:
         return local_results
 
     # Fallback: search via Polygon.io API
-    api_results = await polygon_client.search_tickers(query, limit)
+    api_results = await market_data.search_tickers(query, limit)
     return [
         _PolygonSearchResult(
             symbol=r.get("ticker", ""),
@@ -46,11 +48,9 @@ class _PolygonSearchResult:
         self.exchange = exchange
 
 
-async def get_chart_data(
-    symbol: str, from_date: date, to_date: date
-) -> list[dict]:
+async def get_chart_data(symbol: str, from_date: date, to_date: date) -> list[dict]:
     """Get OHLCV chart data for a symbol."""
-    bars = await polygon_client.aggregate_bars(symbol, from_date, to_date)
+    bars = await market_data.aggregate_bars(symbol, from_date, to_date)
     result = []
     for bar in bars:
         timestamp_ms = bar.get("t")
@@ -1,72 +1,163 @@
+import base64
+import binascii
+import calendar
+import json
 from datetime import date
 
-from sqlalchemy import func, select
+from sqlalchemy import ColumnElement, Row, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from app.models.surge_event import SurgeEvent
+from app.models.surge_rollup import SurgeRollup
 from app.models.ticker import Ticker
+from app.services import change_counter_service, rollup_service
 
 
-async def get_surges(
-    session: AsyncSession,
-    page: int = 1,
-    page_size: int = 50,
+class CountCache:
+    """Filtered surge totals, so paging doesn't re-run COUNT(*) per request.
+
+    The surge_events change counter is part of every key, so totals cached
+    before an insert or delete, by this process or another, are never
+    served afterwards; they just age out.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self._max_entries = max_entries
+        self._entries: dict[tuple, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> int | None:
+        return self._entries.get(key)
+
+    def set(self, key: tuple, total: int) -> None:
+        if len(self._entries) >= self._max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = total
+
+
+count_cache = CountCache()
+
+
+def encode_cursor(event: SurgeEvent | Row) -> str:
+    """Opaque keyset cursor pointing just after ``event``."""
+    raw = json.dumps([event.change_pct, event.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
+    """Raises ValueError for a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        change_pct, event_id = json.loads(raw)
+        return float(change_pct), int(event_id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+# Plain columns for list responses, named like SurgeEventResponse fields.
+# Rows are returned as-is: no ORM identity map or relationship loading.
+SURGE_ROW_COLUMNS = (
+    *SurgeEvent.__table__.c,
+    Ticker.name.label("ticker_name"),
+    Ticker.sic_description,
+)
+
+
+def surge_filters(
     from_date: date | None = None,
     to_date: date | None = None,
     min_pct: float | None = None,
     sector: str | None = None,
-) -> tuple[list[SurgeEvent], int]:
-    """Get paginated surge events with optional filters."""
-    query = select(SurgeEvent).join(Ticker, isouter=True)
-    count_query = select(func.count(SurgeEvent.id))
+) -> list[ColumnElement[bool]]:
+    """WHERE conditions for the surge list filters.
 
+    A ``sector`` condition references ``tickers``, so the query must join it.
+    """
+    conditions: list[ColumnElement[bool]] = []
     if from_date:
-        query = query.where(SurgeEvent.event_date >= from_date)
-        count_query = count_query.where(SurgeEvent.event_date >= from_date)
+        conditions.append(SurgeEvent.event_date >= from_date)
     if to_date:
-        query = query.where(SurgeEvent.event_date <= to_date)
-        count_query = count_query.where(SurgeEvent.event_date <= to_date)
+        conditions.append(SurgeEvent.event_date <= to_date)
     if min_pct is not None:
-        query = query.where(SurgeEvent.change_pct >= min_pct)
-        count_query = count_query.where(SurgeEvent.change_pct >= min_pct)
+        conditions.append(SurgeEvent.change_pct >= min_pct)
     if sector:
-        query = query.where(Ticker.sic_description == sector)
-        count_query = count_query.join(Ticker).where(
-            Ticker.sic_description == sector
-        )
+        conditions.append(Ticker.sic_description == sector)
+    return conditions
+
 
-    total_result = await session.execute(count_query)
-    total = total_result.scalar() or 0
+async def get_surges(
+    session: AsyncSession,
+    page: int = 1,
+    page_size: int = 50,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    min_pct: float | None = None,
+    sector: str | None = None,
+    cursor: str | None = None,
+) -> tuple[list[Row], int]:
+    """Get paginated surge events with optional filters.
 
+    Events are ordered by (change_pct, id) descending. With ``cursor`` (from
+    ``encode_cursor``) the page starts after that event via a keyset
+    predicate and ``page`` is ignored, so deep pages cost the same as the
+    first one. Items are rows of ``SURGE_ROW_COLUMNS``.
+    """
+    filters = surge_filters(from_date, to_date, min_pct, sector)
     query = (
-        query.options(joinedload(SurgeEvent.ticker))
-        .order_by(SurgeEvent.change_pct.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
+        select(*SURGE_ROW_COLUMNS)
+        .select_from(SurgeEvent)
+        .join(Ticker, isouter=True)
+        .where(*filters)
     )
-    result = await session.execute(query)
-    items = list(result.unique().scalars().all())
+    count_query = select(func.count(SurgeEvent.id)).where(*filters)
+    if sector:
+        count_query = count_query.join(Ticker)
 
-    return items, total
+    version = await change_counter_service.get_version(
+        session, SurgeEvent.__tablename__
+    )
+    count_key = (from_date, to_date, min_pct, sector, version)
+    total = count_cache.get(count_key)
+    if total is None:
+        total_result = await session.execute(count_query)
+        total = total_result.scalar() or 0
+        count_cache.set(count_key, total)
+
+    if cursor:
+        after_pct, after_id = decode_cursor(cursor)
+        # Written as a range on change_pct so the index can seek to it
+        query = query.where(
+            SurgeEvent.change_pct <= after_pct,
+            or_(SurgeEvent.change_pct < after_pct, SurgeEvent.id < after_id),
+        )
+    else:
+        query = query.offset((page - 1) * page_size)
+
+    query = query.order_by(SurgeEvent.change_pct.desc(), SurgeEvent.id.desc()).limit(
+        page_size
+    )
+    result = await session.execute(query)
+    return list(result.all()), total
 
 
-async def get_today_surges(session: AsyncSession) -> list[SurgeEvent]:
-    """Get today's surge events."""
+async def get_today_surges(session: AsyncSession) -> list[Row]:
+    """Get today's surge events as rows of ``SURGE_ROW_COLUMNS``."""
     today = date.today()
     query = (
-        select(SurgeEvent)
-        .options(joinedload(SurgeEvent.ticker))
+        select(*SURGE_ROW_COLUMNS)
+        .select_from(SurgeEvent)
+        .join(Ticker, isouter=True)
         .where(SurgeEvent.event_date == today)
         .order_by(SurgeEvent.change_pct.desc())
     )
     result = await session.execute(query)
-    return list(result.unique().scalars().all())
+    return list(result.all())
 
 
-async def get_surge_detail(
-    session: AsyncSession, surge_id: int
-) -> SurgeEvent | None:
+async def get_surge_detail(session: AsyncSession, surge_id: int) -> SurgeEvent | None:
     """Get surge event with tracking records."""
     query = (
         select(SurgeEvent)
@@ -80,62 +171,117 @@ async def get_surge_detail(
     return result.unique().scalar_one_or_none()
 
 
+def _avg_change(rollup: SurgeRollup) -> float:
+    return round(rollup.change_sum / rollup.count, 2) if rollup.count else 0.0
+
+
+async def _top_rollups(
+    session: AsyncSession, dimension: str, min_count: int = 1, limit: int = 20
+) -> list[SurgeRollup]:
+    result = await session.execute(
+        select(SurgeRollup)
+        .where(SurgeRollup.dimension == dimension, SurgeRollup.count >= min_count)
+        .order_by(SurgeRollup.count.desc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
 async def get_surge_stats(
     session: AsyncSession,
 ) -> dict:
-    """Get surge statistics."""
-    # Total count
-    total_result = await session.execute(select(func.count(SurgeEvent.id)))
-    total = total_result.scalar() or 0
-
-    # By sector
-    sector_query = (
-        select(
-            Ticker.sic_description,
-            func.count(SurgeEvent.id),
-            func.avg(SurgeEvent.change_pct),
+    """Get surge statistics from the rollup tables.
+
+    Every breakdown reads pre-aggregated rows, so the cost grows with the
+    number of groups rather than the number of events.
+    """
+    # Small fixed-size dimensions in one query
+    result = await session.execute(
+        select(SurgeRollup).where(
+            SurgeRollup.dimension.in_(
+                [rollup_service.WEEKDAY, rollup_service.MONTH, rollup_service.HORIZON]
+            )
+        )
+    )
+    rollups: dict[str, list[SurgeRollup]] = {}
+    for rollup in sorted(result.scalars().all(), key=lambda r: int(r.key)):
+        rollups.setdefault(rollup.dimension, []).append(rollup)
+
+    # Every event has exactly one weekday, so its rollup sums to the total
+    weekdays = rollups.get(rollup_service.WEEKDAY, [])
+    total = sum(r.count for r in weekdays)
+
+    by_day_of_week = [
+        {
+            "day_of_week": int(r.key),
+            "day_name": calendar.day_name[int(r.key)],
+            "count": r.count,
+        }
+        for r in weekdays
+    ]
+    by_month = [
+        {
+            "month": int(r.key),
+            "month_name": calendar.month_name[int(r.key)],
+            "count": r.count,
+        }
+        for r in rollups.get(rollup_service.MONTH, [])
+    ]
+    by_horizon = [
+        {
+            "days_after": int(r.key),
+            "avg_change_pct": _avg_change(r),
+            "win_rate": round(r.win_count / r.count * 100, 2) if r.count else 0.0,
+            "sample_count": r.count,
+        }
+        for r in rollups.get(rollup_service.HORIZON, [])
+    ]
+
+    # Sectors from the tickers table as it is now, via the per-symbol rows
+    sector_count = func.sum(SurgeRollup.count)
+    sector_result = await session.execute(
+        select(Ticker.sic_description, sector_count, func.sum(SurgeRollup.change_sum))
+        .join(Ticker, Ticker.symbol == SurgeRollup.key)
+        .where(
+            SurgeRollup.dimension == rollup_service.SYMBOL,
+            Ticker.sic_description.isnot(None),
         )
-        .join(Ticker)
-        .where(Ticker.sic_description.isnot(None))
         .group_by(Ticker.sic_description)
-        .order_by(func.count(SurgeEvent.id).desc())
+        .order_by(sector_count.desc())
         .limit(20)
     )
-    sector_result = await session.execute(sector_query)
     by_sector = [
-        {"sector": row[0], "count": row[1], "avg_change_pct": round(float(row[2]), 2)}
-        for row in sector_result.all()
+        {
+            "sector": sector,
+            "count": count,
+            "avg_change_pct": round(change_sum / count, 2) if count else 0.0,
+        }
+        for sector, count, change_sum in sector_result.all()
     ]
 
     # Repeat surgers
-    repeat_query = (
-        select(
-            SurgeEvent.symbol,
-            Ticker.name,
-            func.count(SurgeEvent.id).label("cnt"),
-            func.avg(SurgeEvent.change_pct),
+    repeats = await _top_rollups(session, rollup_service.SYMBOL, min_count=2)
+    names_result = await session.execute(
+        select(Ticker.symbol, Ticker.name).where(
+            Ticker.symbol.in_([r.key for r in repeats])
         )
-        .join(Ticker, isouter=True)
-        .group_by(SurgeEvent.symbol, Ticker.name)
-        .having(func.count(SurgeEvent.id) > 1)
-        .order_by(func.count(SurgeEvent.id).desc())
-        .limit(20)
     )
-    repeat_result = await session.execute(repeat_query)
+    names = dict(names_result.all())
     repeat_surgers = [
         {
-            "symbol": row[0],
-            "name": row[1],
-            "surge_count": row[2],
-            "avg_change_pct": round(float(row[3]), 2),
+            "symbol": r.key,
+            "name": names.get(r.key),
+            "surge_count": r.count,
+            "avg_change_pct": _avg_change(r),
         }
-        for row in repeat_result.all()
+        for r in repeats
     ]
 
     return {
         "total_surges": total,
         "by_sector": by_sector,
-        "by_day_of_week": [],
-        "by_month": [],
+        "by_day_of_week": by_day_of_week,
+        "by_month": by_month,
         "repeat_surgers": repeat_surgers,
+        "by_horizon": by_horizon,
     }
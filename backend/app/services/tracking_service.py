@@ -1,110 +1,133 @@
-from sqlalchemy import func, select
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Select, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.surge_event import SurgeEvent
 from app.models.surge_tracking import SurgeTracking
 from app.models.ticker import Ticker
 
+# Reported when quantiles are requested: output field -> quantile
+QUANTILES = {
+    "p25_change_pct": 0.25,
+    "median_change_pct": 0.5,
+    "p75_change_pct": 0.75,
+}
+
+_SUMMARY_COLUMNS = (
+    func.avg(SurgeTracking.change_from_surge_pct),
+    func.count(SurgeTracking.id),
+    # Win count in the same pass: conditional aggregation instead of a
+    # separate COUNT query per group
+    func.sum(case((SurgeTracking.change_from_surge_pct > 0, 1), else_=0)),
+)
+
+
+def _quantile(values: Sequence[float], q: float) -> float:
+    """Linear-interpolated quantile of already sorted values."""
+    position = (len(values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+async def _change_quantiles(
+    session: AsyncSession, query: Select, group_count: int
+) -> dict[tuple, dict[str, float]]:
+    """Quantiles of change_from_surge_pct per group.
+
+    ``query`` selects the group columns followed by the change and is
+    ordered by them, so every group's values arrive sorted in one pass.
+    """
+    result = await session.execute(query)
+    values_by_group: dict[tuple, list[float]] = {}
+    for row in result.all():
+        values_by_group.setdefault(tuple(row[:group_count]), []).append(row[-1])
+    return {
+        group: {field: round(_quantile(values, q), 2) for field, q in QUANTILES.items()}
+        for group, values in values_by_group.items()
+    }
+
+
+def _performance(
+    days_after: int, avg_change: Any, count: int, win_count: Any
+) -> dict[str, Any]:
+    avg_change = float(avg_change) if avg_change else 0.0
+    win_rate = ((win_count or 0) / count * 100) if count > 0 else 0.0
+    return {
+        "days_after": days_after,
+        "avg_change_pct": round(avg_change, 2),
+        "win_rate": round(win_rate, 2),
+        "sample_count": count,
+    }
+
 
 async def get_tracking_performance(
     session: AsyncSession,
+    include_quantiles: bool = False,
 ) -> list[dict]:
     """Get average post-surge performance by days_after."""
     query = (
-        select(
-            SurgeTracking.days_after,
-            func.avg(SurgeTracking.change_from_surge_pct),
-            func.count(SurgeTracking.id),
-        )
+        select(SurgeTracking.days_after, *_SUMMARY_COLUMNS)
         .group_by(SurgeTracking.days_after)
         .order_by(SurgeTracking.days_after)
     )
     result = await session.execute(query)
-    rows = result.all()
+    performance = [_performance(*row) for row in result.all()]
 
-    performance = []
-    for row in rows:
-        days_after = row[0]
-        avg_change = float(row[1]) if row[1] else 0.0
-        count = row[2]
-
-        # Calculate win rate (positive change)
-        win_query = (
-            select(func.count(SurgeTracking.id))
-            .where(
-                SurgeTracking.days_after == days_after,
-                SurgeTracking.change_from_surge_pct > 0,
-            )
-        )
-        win_result = await session.execute(win_query)
-        win_count = win_result.scalar() or 0
-        win_rate = (win_count / count * 100) if count > 0 else 0.0
-
-        performance.append(
-            {
-                "days_after": days_after,
-                "avg_change_pct": round(avg_change, 2),
-                "win_rate": round(win_rate, 2),
-                "sample_count": count,
-            }
+    if include_quantiles:
+        quantiles = await _change_quantiles(
+            session,
+            select(
+                SurgeTracking.days_after, SurgeTracking.change_from_surge_pct
+            ).order_by(SurgeTracking.days_after, SurgeTracking.change_from_surge_pct),
+            group_count=1,
         )
+        for item in performance:
+            item.update(quantiles.get((item["days_after"],), {}))
 
     return performance
 
 
 async def get_tracking_by_sector(
     session: AsyncSession,
+    include_quantiles: bool = False,
 ) -> list[dict]:
     """Get post-surge tracking breakdown by sector."""
-    query = (
-        select(
-            Ticker.sic_description,
-            SurgeTracking.days_after,
-            func.avg(SurgeTracking.change_from_surge_pct),
-            func.count(SurgeTracking.id),
+
+    def sector_query(*columns) -> Select:
+        return (
+            select(Ticker.sic_description, SurgeTracking.days_after, *columns)
+            .join(SurgeEvent, SurgeTracking.surge_event_id == SurgeEvent.id)
+            .join(Ticker, SurgeEvent.symbol == Ticker.symbol)
+            .where(Ticker.sic_description.isnot(None))
         )
-        .join(SurgeEvent, SurgeTracking.surge_event_id == SurgeEvent.id)
-        .join(Ticker, SurgeEvent.symbol == Ticker.symbol)
-        .where(Ticker.sic_description.isnot(None))
+
+    query = (
+        sector_query(*_SUMMARY_COLUMNS)
         .group_by(Ticker.sic_description, SurgeTracking.days_after)
         .order_by(Ticker.sic_description, SurgeTracking.days_after)
     )
     result = await session.execute(query)
     rows = result.all()
 
-    sectors: dict[str, list[dict]] = {}
-    for row in rows:
-        sector = row[0]
-        if sector not in sectors:
-            sectors[sector] = []
-
-        total = row[3]
-        avg_change = float(row[2]) if row[2] else 0.0
-
-        # Win rate per sector/days combination
-        win_query = (
-            select(func.count(SurgeTracking.id))
-            .join(SurgeEvent, SurgeTracking.surge_event_id == SurgeEvent.id)
-            .join(Ticker, SurgeEvent.symbol == Ticker.symbol)
-            .where(
-                Ticker.sic_description == sector,
-                SurgeTracking.days_after == row[1],
-                SurgeTracking.change_from_surge_pct > 0,
-            )
-        )
-        win_result = await session.execute(win_query)
-        win_count = win_result.scalar() or 0
-        win_rate = (win_count / total * 100) if total > 0 else 0.0
-
-        sectors[sector].append(
-            {
-                "days_after": row[1],
-                "avg_change_pct": round(avg_change, 2),
-                "win_rate": round(win_rate, 2),
-                "sample_count": total,
-            }
+    quantiles: dict[tuple, dict[str, float]] = {}
+    if include_quantiles:
+        quantiles = await _change_quantiles(
+            session,
+            sector_query(SurgeTracking.change_from_surge_pct).order_by(
+                Ticker.sic_description,
+                SurgeTracking.days_after,
+                SurgeTracking.change_from_surge_pct,
+            ),
+            group_count=2,
         )
 
-    return [
-        {"sector": sector, "performance": perf} for sector, perf in sectors.items()
-    ]
+    sectors: dict[str, list[dict]] = {}
+    for sector, days_after, *summary in rows:
+        item = _performance(days_after, *summary)
+        item.update(quantiles.get((sector, days_after), {}))
+        sectors.setdefault(sector, []).append(item)
+
+    return [{"sector": sector, "performance": perf} for sector, perf in sectors.items()]
@@ -1,55 +1,469 @@
+import asyncio
 import logging
-from datetime import date, datetime, timedelta
+import time
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime
+from typing import Any
 
+from sqlalchemy import select, update
+
+from app.data_sources.bar_store import DayBars
+from app.data_sources.market_data import market_data
 from app.database import async_session
+from app.models.collected_date import CollectedDate
 from app.models.collection_log import CollectionLog
-from app.tasks.daily_collection import _collect_surges_for_date, _get_threshold
+from app.tasks.daily_collection import (
+    MAX_PREV_DAY_LOOKBACK,
+    _get_threshold,
+    _insert_surge_events,
+    _mark_collected,
+    _update_tracking,
+)
+from app.tasks.job_runner import (
+    INSTANCE_ID,
+    JOB_STAGE_SECONDS,
+    STALE_AFTER_SECONDS,
+    is_orphaned,
+    job_runner,
+    start_collection_log,
+)
+from app.tasks.surge_detection import detect_surges_for_date
+from app.utils.trading_calendar import previous_trading_day, trading_days_between
 
 logger = logging.getLogger(__name__)
 
+# Dates the fetcher may run ahead of detection, and detected dates waiting
+# for the writer; bounds memory to a few grouped snapshots
+FETCH_AHEAD = 8
+WRITE_QUEUE_SIZE = 8
+# Most dates the writer commits in one transaction
+WRITE_BATCH_SIZE = 20
+
+_DONE = object()  # end-of-stream marker passed down the queues
+
+
+async def _pending_dates(
+    from_date: date, to_date: date, threshold: float
+) -> tuple[list[date], int]:
+    """Trading days in range not yet checkpointed. Returns (pending, skipped).
 
-async def run_backfill(from_date: date, to_date: date) -> int:
-    """Backfill surge data for a date range. Returns collection log ID."""
+    A date collected at the same or a lower threshold already holds every
+    event this run would insert, so it is skipped.
+    """
+    dates = trading_days_between(from_date, to_date)
     async with async_session() as session:
-        log = CollectionLog(job_type="backfill", status="running")
-        session.add(log)
-        await session.flush()
-        log_id = log.id
+        result = await session.execute(
+            select(CollectedDate.trade_date).where(
+                CollectedDate.trade_date.between(from_date, to_date),
+                CollectedDate.threshold_pct <= threshold,
+            )
+        )
+        done = set(result.scalars().all())
+    pending = [d for d in dates if d not in done]
+    return pending, len(dates) - len(pending)
 
-        try:
-            threshold = await _get_threshold(session)
-            total_surges = 0
-            current_date = from_date
-
-            while current_date <= to_date:
-                # Skip weekends
-                if current_date.weekday() < 5:
-                    count = await _collect_surges_for_date(
-                        session, current_date, threshold
-                    )
-                    total_surges += count
+
+async def _update_log(log_id: int, **values) -> None:
+    async with async_session() as session:
+        await session.execute(
+            update(CollectionLog).where(CollectionLog.id == log_id).values(**values)
+        )
+        await session.commit()
+
+
+class StageStats:
+    """Throughput of one pipeline stage and occupancy of its input queue.
+
+    Each unit of work is also observed in the job stage metrics.
+    """
+
+    def __init__(
+        self, job_type: str, stage: str, queue: asyncio.Queue | None = None
+    ) -> None:
+        self._queue = queue
+        self._timer = JOB_STAGE_SECONDS.labels(job_type, stage)
+        self.items = 0
+        self.busy_seconds = 0.0
+        self._samples = 0
+        self._occupancy_sum = 0
+        self._occupancy_max = 0
+
+    def record(self, seconds: float, items: int = 1) -> None:
+        self.items += items
+        self.busy_seconds += seconds
+        self._timer.observe(seconds)
+
+    def sample_queue(self) -> None:
+        if self._queue is None:
+            return
+        depth = self._queue.qsize()
+        self._samples += 1
+        self._occupancy_sum += depth
+        self._occupancy_max = max(self._occupancy_max, depth)
+
+    def to_dict(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "per_second": (
+                round(self.items / self.busy_seconds, 2) if self.busy_seconds else None
+            ),
+        }
+        if self._queue is not None:
+            stats["queue_avg"] = (
+                round(self._occupancy_sum / self._samples, 2) if self._samples else 0.0
+            )
+            stats["queue_max"] = self._occupancy_max
+            stats["queue_size"] = self._queue.maxsize
+        return stats
+
+
+async def _previous_bars(
+    target_date: date,
+    load: Callable[[date], Awaitable[DayBars]],
+    last_date: date | None,
+    last_bars: DayBars,
+) -> DayBars | None:
+    """The previous session's bars, reusing the last fetched day when it is that session.
+
+    Only an unscheduled closure missing from the calendar needs a further
+    step back. Returns None when no earlier session has bars.
+    """
+    prev_date = previous_trading_day(target_date)
+    for _ in range(MAX_PREV_DAY_LOOKBACK):
+        if prev_date == last_date:
+            previous = last_bars
+        else:
+            previous = await load(prev_date)
+        if len(previous):
+            return previous
+        logger.info(
+            "No data for %s (unscheduled closure?), trying earlier date", prev_date
+        )
+        prev_date = previous_trading_day(prev_date)
+    logger.warning(
+        "No previous trading day found within %d sessions", MAX_PREV_DAY_LOOKBACK
+    )
+    return None
+
+
+async def _fetch_stage(
+    dates: list[date],
+    load: Callable[[date], Awaitable[DayBars]],
+    out: asyncio.Queue,
+    stats: StageStats,
+) -> None:
+    """Fetch each date (and its previous session) as soon as a token allows.
+
+    Emits (date, bars, previous bars, whether the previous session was found).
+    """
+    last_date, last_bars = None, DayBars()
+    try:
+        for current_date in dates:
+            started = time.monotonic()
+            current = await load(current_date)
+            previous: DayBars | None = DayBars()
+            if len(current):
+                previous = await _previous_bars(
+                    current_date, load, last_date, last_bars
+                )
+            last_date, last_bars = current_date, current
+            stats.record(time.monotonic() - started)
+            found = previous is not None
+            await out.put((current_date, current, previous or DayBars(), found))
+    except Exception:
+        await out.put(_DONE)  # later stages still write what was fetched
+        raise
+    await out.put(_DONE)
+
+
+async def _detect_stage(
+    threshold: float, inbox: asyncio.Queue, out: asyncio.Queue, stats: StageStats
+) -> None:
+    while True:
+        stats.sample_queue()
+        item = await inbox.get()
+        if item is _DONE:
+            break
+        started = time.monotonic()
+        current_date, current, previous, found = item
+        rows = []
+        if found:
+            rows = detect_surges_for_date(current_date, current, previous, threshold)
+        stats.record(time.monotonic() - started)
+        await out.put((current_date, current, rows, found))
+    await out.put(_DONE)
+
+
+async def _write_stage(
+    threshold: float,
+    log_id: int,
+    inbox: asyncio.Queue,
+    stats: StageStats,
+    progress: dict[str, Any],
+    on_commit,
+) -> None:
+    """Insert, track and checkpoint detected dates, several per transaction.
+
+    A date whose previous session is missing still updates tracking but is
+    not checkpointed, so a later run detects it once that session is stored.
+    """
+    finished = False
+    while not finished:
+        stats.sample_queue()
+        batch = [await inbox.get()]
+        while len(batch) < WRITE_BATCH_SIZE and not inbox.empty():
+            batch.append(inbox.get_nowait())
+        if batch[-1] is _DONE:
+            batch.pop()
+            finished = True
+        if not batch:
+            break
+
+        started = time.monotonic()
+        async with async_session() as session:
+            for current_date, current, rows, found in batch:
+                count = await _insert_surge_events(session, rows)
+                # Tracking reads the day already in hand, so it is free here
+                await _update_tracking(session, current_date, current)
+                if not found:
                     logger.info(
-                        "Backfill %s: %d surges", current_date, count
+                        "Backfill %s: no previous session, left pending", current_date
                     )
-                current_date += timedelta(days=1)
-
-            log.status = "completed"
-            log.records_count = total_surges
-            log.completed_at = datetime.utcnow()
+                    continue
+                await _mark_collected(session, current_date, threshold, count, log_id)
+                progress["records_count"] += count
+                logger.info("Backfill %s: %d surges", current_date, count)
+            stats.record(time.monotonic() - started, len(batch))
+            progress["last_completed_date"] = batch[-1][0].isoformat()
+            await on_commit(session, len(batch))
             await session.commit()
 
-            logger.info(
-                "Backfill completed (%s to %s): %d total surges",
-                from_date,
-                to_date,
-                total_surges,
+
+async def _run_stages(stages: list[Awaitable[None]]) -> None:
+    """Run pipeline stages (upstream first) to completion.
+
+    A failing fetcher still lets the later stages drain what it already
+    produced, so completed work is committed before the error is raised; a
+    failure further down stops the whole pipeline.
+    """
+    tasks = [asyncio.ensure_future(stage) for stage in stages]
+    error: BaseException | None = None
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_EXCEPTION
             )
-        except Exception as e:
-            log.status = "failed"
-            log.error_message = str(e)
-            log.completed_at = datetime.utcnow()
-            await session.commit()
-            logger.error("Backfill failed: %s", e)
-            raise
+            for task in done:
+                if task.cancelled() or task.exception() is None:
+                    continue
+                error = error or task.exception()
+                if task is not tasks[0]:
+                    for other in pending:
+                        other.cancel()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    if error is not None:
+        raise error
+
+
+async def run_collection_pipeline(
+    dates: list[date],
+    threshold: float,
+    log_id: int,
+    progress: dict[str, Any],
+    load: Callable[[date], Awaitable[DayBars]] | None = None,
+    job_type: str = "backfill",
+) -> dict[str, StageStats]:
+    """Collect surges for ``dates`` (ascending) through the staged pipeline.
+
+    ``load`` returns a day's bars (default: the bar store, fetching misses
+    from the API). ``progress`` must hold ``dates_done`` and
+    ``records_count``; both are advanced as batches commit, and everything
+    else in it is written to the log details. ``job_type`` labels the stage
+    metrics. Returns the per-stage stats.
+    """
+    fetch_queue: asyncio.Queue = asyncio.Queue(maxsize=FETCH_AHEAD)
+    write_queue: asyncio.Queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+    stage_stats = {
+        "fetch": StageStats(job_type, "fetch"),
+        "detect": StageStats(job_type, "detect", fetch_queue),
+        "write": StageStats(job_type, "write", write_queue),
+    }
+    done_before = progress["dates_done"]
+    started = time.monotonic()
+    fetches_before = market_data.fetch_count
+
+    async def on_commit(session, dates_written: int) -> None:
+        progress["dates_done"] += dates_written
+        written = progress["dates_done"] - done_before
+        progress["api_calls"] = market_data.fetch_count - fetches_before
+        progress["eta_seconds"] = round(
+            (time.monotonic() - started) / written * (len(dates) - written)
+        )
+        progress["pipeline"] = {
+            name: stats.to_dict() for name, stats in stage_stats.items()
+        }
+        details = {k: v for k, v in progress.items() if k != "records_count"}
+        await session.execute(
+            update(CollectionLog)
+            .where(CollectionLog.id == log_id)
+            .values(records_count=progress["records_count"], details=details)
+        )
+
+    await _run_stages(
+        [
+            _fetch_stage(
+                dates,
+                load or market_data.grouped_daily_bars,
+                fetch_queue,
+                stage_stats["fetch"],
+            ),
+            _detect_stage(threshold, fetch_queue, write_queue, stage_stats["detect"]),
+            _write_stage(
+                threshold,
+                log_id,
+                write_queue,
+                stage_stats["write"],
+                progress,
+                on_commit,
+            ),
+        ]
+    )
+    return stage_stats
+
+
+def backfill_details(from_date: date, to_date: date) -> dict[str, Any]:
+    """Log details a backfill is resumed from after a restart."""
+    return {"from_date": from_date.isoformat(), "to_date": to_date.isoformat()}
+
+
+async def run_backfill(
+    from_date: date, to_date: date, log_id: int | None = None
+) -> int:
+    """Backfill surge data for a date range. Returns collection log ID.
+
+    Runs as a pipeline: a fetcher prefetches upcoming dates whenever the
+    rate limiter has a token, a detector finds surges, and a writer commits
+    batches of dates, connected by bounded queues. Every date is
+    checkpointed in ``collected_dates``, so a re-run (or a resume via
+    ``log_id``) continues after the last completed date. Per-stage
+    throughput and queue occupancy are reported in the log details.
+    """
+    range_details = backfill_details(from_date, to_date)
+    async with async_session() as session:
+        log = await start_collection_log(
+            session, "backfill", log_id, details=range_details
+        )
+        log_id = log.id
+        total_surges = log.records_count or 0
+
+    try:
+        async with async_session() as session:
+            threshold = await _get_threshold(session)
+        pending, skipped = await _pending_dates(from_date, to_date, threshold)
+        if skipped:
+            logger.info("Backfill resuming: %d dates already completed", skipped)
+
+        progress: dict[str, Any] = {
+            **range_details,
+            "dates_total": len(pending) + skipped,
+            "dates_done": skipped,
+            "records_count": total_surges,
+        }
+        stage_stats = await run_collection_pipeline(
+            pending, threshold, log_id, progress
+        )
+        total_surges = progress["records_count"]
+
+        await _update_log(
+            log_id,
+            status="completed",
+            records_count=total_surges,
+            completed_at=datetime.utcnow(),
+        )
+        logger.info(
+            "Backfill completed (%s to %s): %d total surges; stages: %s",
+            from_date,
+            to_date,
+            total_surges,
+            {name: stats.to_dict() for name, stats in stage_stats.items()},
+        )
+    except Exception as e:
+        await _update_log(
+            log_id,
+            status="failed",
+            error_message=str(e),
+            completed_at=datetime.utcnow(),
+        )
+        logger.error("Backfill failed: %s", e)
+        raise
 
     return log_id
+
+
+async def _resume_orphaned_jobs() -> int:
+    """Take over orphaned logs. Returns how many are still owned elsewhere."""
+    active = CollectionLog.status.in_(["queued", "running"])
+    async with async_session() as session:
+        result = await session.execute(
+            select(CollectionLog).where(
+                active, CollectionLog.owner.is_distinct_from(INSTANCE_ID)
+            )
+        )
+        logs = result.scalars().all()
+
+    owned_elsewhere = 0
+    for log in logs:
+        # Claim atomically: another process may be resuming the same log
+        async with async_session() as session:
+            claimed = await session.execute(
+                update(CollectionLog)
+                .where(CollectionLog.id == log.id, active, is_orphaned())
+                .values(owner=INSTANCE_ID, heartbeat_at=datetime.utcnow())
+            )
+            await session.commit()
+        if not claimed.rowcount:
+            owned_elsewhere += 1
+            continue
+
+        details = log.details or {}
+        if (
+            log.job_type != "backfill"
+            or "from_date" not in details
+            or "to_date" not in details
+        ):
+            await _update_log(
+                log.id,
+                status="failed",
+                error_message="Interrupted by restart",
+                completed_at=datetime.utcnow(),
+            )
+            continue
+        logger.info("Resuming interrupted backfill %d", log.id)
+        await job_runner.submit(
+            "backfill",
+            run_backfill,
+            date.fromisoformat(details["from_date"]),
+            date.fromisoformat(details["to_date"]),
+            log_id=log.id,
+        )
+    return owned_elsewhere
+
+
+async def resume_interrupted_backfills() -> None:
+    """Re-queue backfills left unfinished by a crash or restart.
+
+    Only logs whose owner is gone are touched: those released by a clean
+    shutdown, or whose heartbeat has gone stale. Jobs of other running
+    processes are left alone. Other job types cannot be resumed and are
+    marked failed.
+    """
+    if await _resume_orphaned_jobs():
+        # A process that just crashed still looks alive; check again once
+        # its heartbeat has had time to go stale
+        await asyncio.sleep(STALE_AFTER_SECONDS)
+        await _resume_orphaned_jobs()
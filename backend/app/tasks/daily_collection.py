@@ -1,19 +1,31 @@
 import logging
-from datetime import date, datetime, timedelta, timezone
+from datetime import UTC, date, datetime
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import and_, exists, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.data_sources.bar_store import DayBars
+from app.data_sources.market_data import market_data
 from app.database import async_session
-from app.data_sources.polygon_client import polygon_client
-from app.models.collection_log import CollectionLog
+from app.models.collected_date import CollectedDate
 from app.models.surge_event import SurgeEvent
 from app.models.surge_tracking import SurgeTracking
 from app.models.ticker import Ticker
 from app.models.user_setting import UserSetting
+from app.services import change_counter_service, rollup_service
+from app.tasks.job_runner import JOB_STAGE_SECONDS, start_collection_log
+from app.tasks.surge_detection import detect_surges_for_date
+from app.utils.trading_calendar import (
+    is_trading_day,
+    previous_trading_day,
+    trading_day_offset,
+)
 
 logger = logging.getLogger(__name__)
 
+# Post-surge tracking horizons, in trading days after the event
 TRACKING_DAYS = [1, 3, 7, 30]
 MAX_PREV_DAY_LOOKBACK = 7
 
@@ -30,140 +42,215 @@ async def _get_threshold(session: AsyncSession) -> float:
     return settings.SURGE_THRESHOLD_PCT
 
 
-async def _ensure_ticker(session: AsyncSession, symbol: str) -> None:
-    result = await session.execute(select(Ticker).where(Ticker.symbol == symbol))
-    if result.scalar_one_or_none() is None:
-        session.add(Ticker(symbol=symbol))
+async def _ensure_tickers(session: AsyncSession, symbols: list[str]) -> None:
+    """Insert placeholder tickers for any unknown symbols in one statement."""
+    if not symbols:
+        return
+    stmt = sqlite_insert(Ticker.__table__).on_conflict_do_nothing(
+        index_elements=["symbol"]
+    )
+    result = await session.execute(stmt, [{"symbol": symbol} for symbol in symbols])
+    if result.rowcount:
+        # Search indexes pick the new symbols up on their next query
+        await change_counter_service.bump(session, Ticker.__tablename__)
 
 
-async def _collect_surges_for_date(
-    session: AsyncSession, target_date: date, threshold: float
+async def _insert_surge_events(
+    session: AsyncSession, rows: list[dict[str, Any]]
 ) -> int:
-    """Collect surge events for a specific date. Returns count of surges found."""
-    results = await polygon_client.grouped_daily(target_date)
-    if not results:
-        logger.info("No results for %s", target_date)
+    """Bulk insert surge events, skipping (symbol, event_date) duplicates.
+
+    Returns the number of newly inserted events.
+    """
+    if not rows:
         return 0
+    await _ensure_tickers(session, sorted({row["symbol"] for row in rows}))
+    table = SurgeEvent.__table__
+    stmt = (
+        sqlite_insert(table)
+        .on_conflict_do_nothing(index_elements=["symbol", "event_date"])
+        .returning(table.c.symbol, table.c.event_date, table.c.change_pct)
+    )
+    result = await session.execute(stmt, rows)
+    inserted = result.all()
+    if inserted:
+        await rollup_service.add_events(session, inserted)
+        await change_counter_service.bump(session, table.name)
+    return len(inserted)
 
-    # Find previous trading day via Polygon API (handles weekends + holidays)
-    prev_close_map: dict[str, float] = {}
-    prev_date = target_date - timedelta(days=1)
-    for _ in range(MAX_PREV_DAY_LOOKBACK):
-        while prev_date.weekday() >= 5:
-            prev_date -= timedelta(days=1)
-        prev_results = await polygon_client.grouped_daily(prev_date)
-        if prev_results:
-            for item in prev_results:
-                symbol = item.get("T", "")
-                close = item.get("c")
-                if symbol and close:
-                    prev_close_map[symbol] = float(close)
-            logger.info("Previous trading day: %s (%d tickers)", prev_date, len(prev_close_map))
-            break
-        logger.info("No data for %s (holiday?), trying earlier date", prev_date)
-        prev_date -= timedelta(days=1)
-    else:
-        logger.warning("No previous trading day found within %d days", MAX_PREV_DAY_LOOKBACK)
 
-    surge_count = 0
-    for item in results:
-        symbol = item.get("T", "")
-        close = item.get("c")
-        if not symbol or close is None:
-            continue
+async def _mark_collected(
+    session: AsyncSession,
+    target_date: date,
+    threshold: float,
+    surge_count: int,
+    log_id: int | None,
+) -> None:
+    """Checkpoint a date whose grouped data is final and has been processed."""
+    if not market_data.store.has(target_date):
+        return  # not published yet, so it must be collected again later
+    stmt = sqlite_insert(CollectedDate.__table__).values(
+        trade_date=target_date,
+        threshold_pct=threshold,
+        surge_count=surge_count,
+        collection_log_id=log_id,
+        completed_at=datetime.utcnow(),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["trade_date"],
+        set_={
+            "threshold_pct": stmt.excluded.threshold_pct,
+            "surge_count": stmt.excluded.surge_count,
+            "collection_log_id": stmt.excluded.collection_log_id,
+            "completed_at": stmt.excluded.completed_at,
+        },
+    )
+    await session.execute(stmt)
 
-        prev_close = prev_close_map.get(symbol)
-        if prev_close is None or prev_close <= 0:
-            continue
 
-        change_pct = (float(close) - prev_close) / prev_close * 100
+async def _collect_surges_for_date(
+    session: AsyncSession, target_date: date, threshold: float
+) -> tuple[int, bool]:
+    """Collect surge events for a specific date.
 
-        if change_pct >= threshold:
-            # Check for duplicate
-            existing = await session.execute(
-                select(SurgeEvent).where(
-                    SurgeEvent.symbol == symbol,
-                    SurgeEvent.event_date == target_date,
-                )
-            )
-            if existing.scalar_one_or_none():
-                continue
-
-            await _ensure_ticker(session, symbol)
-            surge_event = SurgeEvent(
-                symbol=symbol,
-                event_date=target_date,
-                open=float(item.get("o", 0)),
-                high=float(item.get("h", 0)),
-                low=float(item.get("l", 0)),
-                close=float(close),
-                volume=int(item.get("v", 0)),
-                prev_close=prev_close,
-                change_pct=round(change_pct, 2),
-                vwap=float(item["vw"]) if item.get("vw") else None,
+    Returns the count of surges found and whether the date could be
+    processed; it cannot while no previous session with bars is stored.
+    """
+    if not is_trading_day(target_date):
+        logger.info("%s is not a trading day, skipping", target_date)
+        return 0, True
+
+    current = await market_data.grouped_daily_bars(target_date)
+    if not len(current):
+        logger.info("No results for %s", target_date)
+        return 0, True
+
+    # Previous session from the trading calendar; only an unscheduled
+    # closure missing from the calendar needs a further step back.
+    previous = DayBars()
+    prev_date = previous_trading_day(target_date)
+    for _ in range(MAX_PREV_DAY_LOOKBACK):
+        previous = await market_data.grouped_daily_bars(prev_date)
+        if len(previous):
+            logger.info(
+                "Previous trading day: %s (%d tickers)", prev_date, len(previous)
             )
-            session.add(surge_event)
-            surge_count += 1
+            break
+        logger.info(
+            "No data for %s (unscheduled closure?), trying earlier date", prev_date
+        )
+        prev_date = previous_trading_day(prev_date)
+    else:
+        logger.warning(
+            "No previous trading day found within %d sessions", MAX_PREV_DAY_LOOKBACK
+        )
+        return 0, False
 
-    return surge_count
+    rows = detect_surges_for_date(target_date, current, previous, threshold)
+    return await _insert_surge_events(session, rows), True
 
 
-async def _update_tracking(session: AsyncSession, target_date: date) -> None:
-    """Update post-surge tracking for past surge events."""
-    for days in TRACKING_DAYS:
-        check_date = target_date - timedelta(days=days)
-        result = await session.execute(
-            select(SurgeEvent).where(SurgeEvent.event_date == check_date)
-        )
-        surge_events = result.scalars().all()
+async def _update_tracking(
+    session: AsyncSession, target_date: date, current: DayBars | None = None
+) -> int:
+    """Update post-surge tracking for past surge events.
+
+    Closes come from the day's grouped snapshot (already in the bar store
+    after collection, or passed in as ``current``), so tracking costs no
+    extra API calls. Returns the number of tracking records written.
+    """
+    if not is_trading_day(target_date):
+        return 0
+    if current is None:
+        current = await market_data.grouped_daily_bars(target_date)
+    if not len(current):
+        return 0
+    close_by_symbol = dict(zip(current.symbols, current.columns["c"], strict=True))
 
-        for event in surge_events:
-            # Check if tracking already exists
-            existing = await session.execute(
-                select(SurgeTracking).where(
-                    SurgeTracking.surge_event_id == event.id,
+    # All events due at any horizon (in trading days) not tracked yet, in one query
+    horizon_by_date = {
+        trading_day_offset(target_date, -days): days for days in TRACKING_DAYS
+    }
+    pending = or_(
+        *(
+            and_(
+                SurgeEvent.event_date == check_date,
+                ~exists().where(
+                    SurgeTracking.surge_event_id == SurgeEvent.id,
                     SurgeTracking.days_after == days,
-                )
+                ),
             )
-            if existing.scalar_one_or_none():
-                continue
+            for check_date, days in horizon_by_date.items()
+        )
+    )
+    result = await session.execute(
+        select(
+            SurgeEvent.id, SurgeEvent.symbol, SurgeEvent.event_date, SurgeEvent.close
+        ).where(pending)
+    )
 
-            # Get current price from today's grouped daily
-            bars = await polygon_client.aggregate_bars(
-                event.symbol, target_date, target_date
-            )
-            if bars:
-                current_close = float(bars[0].get("c", 0))
-                change_from_surge = (
-                    (current_close - event.close) / event.close * 100
-                )
-                tracking = SurgeTracking(
-                    surge_event_id=event.id,
-                    days_after=days,
-                    close_price=current_close,
-                    change_from_surge_pct=round(change_from_surge, 2),
-                    tracked_date=target_date,
-                )
-                session.add(tracking)
+    rows = []
+    for event_id, symbol, event_date, event_close in result.all():
+        current_close = close_by_symbol.get(symbol)
+        if current_close is None or not current_close > 0 or not event_close:
+            continue
+        change_from_surge = (current_close - event_close) / event_close * 100
+        rows.append(
+            {
+                "surge_event_id": event_id,
+                "days_after": horizon_by_date[event_date],
+                "close_price": current_close,
+                "change_from_surge_pct": round(change_from_surge, 2),
+                "tracked_date": target_date,
+            }
+        )
+
+    if not rows:
+        return 0
+    # Another job may track the same day concurrently; keep whichever lands first
+    table = SurgeTracking.__table__
+    stmt = (
+        sqlite_insert(table)
+        .on_conflict_do_nothing(index_elements=["surge_event_id", "days_after"])
+        .returning(table.c.days_after, table.c.change_from_surge_pct)
+    )
+    result = await session.execute(stmt, rows)
+    inserted = result.all()
+    await rollup_service.add_tracking(session, inserted)
+    return len(inserted)
 
 
-async def run_daily_collection(target_date: date | None = None) -> int:
+async def run_daily_collection(
+    target_date: date | None = None, log_id: int | None = None
+) -> int:
     """Run the daily collection job. Returns the collection log ID."""
     if target_date is None:
-        target_date = datetime.now(timezone.utc).date()
+        target_date = datetime.now(UTC).date()
 
     async with async_session() as session:
-        log = CollectionLog(job_type="daily_collection", status="running")
-        session.add(log)
-        await session.flush()
+        log = await start_collection_log(
+            session,
+            "daily_collection",
+            log_id,
+            details={"target_date": target_date.isoformat()},
+        )
         log_id = log.id
 
         try:
             threshold = await _get_threshold(session)
-            surge_count = await _collect_surges_for_date(
-                session, target_date, threshold
-            )
-            await _update_tracking(session, target_date)
+            with JOB_STAGE_SECONDS.time("daily_collection", "detect"):
+                surge_count, found = await _collect_surges_for_date(
+                    session, target_date, threshold
+                )
+            with JOB_STAGE_SECONDS.time("daily_collection", "tracking"):
+                await _update_tracking(session, target_date)
+            if found:
+                await _mark_collected(
+                    session, target_date, threshold, surge_count, log_id
+                )
+            else:
+                # Left pending: detected once the previous session is stored
+                logger.info("%s has no previous session, left pending", target_date)
 
             log.status = "completed"
             log.records_count = surge_count
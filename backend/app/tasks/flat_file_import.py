@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Any
+
+from app.data_sources.bar_store import DayBars
+from app.data_sources.flat_files import find_flat_files, import_flat_file
+from app.data_sources.market_data import market_data
+from app.database import async_session
+from app.tasks.backfill import _update_log, run_collection_pipeline
+from app.tasks.daily_collection import _get_threshold
+from app.tasks.job_runner import start_collection_log
+from app.utils.trading_calendar import is_trading_day
+
+logger = logging.getLogger(__name__)
+
+# Files parsed between progress updates
+PROGRESS_EVERY = 50
+
+
+async def _parse_files(
+    paths: list[str],
+    store_root: str,
+    workers: int,
+    progress: dict[str, Any],
+    log_id: int,
+) -> list[date]:
+    """Parse files into the bar store across a process pool. Returns their dates.
+
+    At most two files per worker are in flight, so memory stays bounded
+    however many files there are.
+    """
+    loop = asyncio.get_running_loop()
+    # Spawned, not forked: the parent runs an event loop and database threads
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    dates: list[date] = []
+    in_flight: set[asyncio.Future] = set()
+    try:
+        for path in paths:
+            if len(in_flight) >= workers * 2:
+                done, in_flight = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                dates += await _collect(done, progress, log_id)
+            in_flight.add(
+                loop.run_in_executor(pool, import_flat_file, path, store_root)
+            )
+        if in_flight:
+            done, _ = await asyncio.wait(in_flight)
+            dates += await _collect(done, progress, log_id)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    dates.sort()
+    return dates
+
+
+async def _collect(
+    done: set[asyncio.Future], progress: dict[str, Any], log_id: int
+) -> list[date]:
+    dates = []
+    for future in done:
+        file_date, rows = future.result()
+        dates.append(file_date)
+        progress["files_done"] += 1
+        if rows is None:
+            progress["files_skipped"] += 1
+        else:
+            progress["rows"] += rows
+        if progress["files_done"] % PROGRESS_EVERY == 0:
+            await _update_log(log_id, details=dict(progress))
+    return dates
+
+
+async def run_flat_file_import(
+    directory: str, log_id: int | None = None, workers: int | None = None
+) -> int:
+    """Import Polygon day-aggregate flat files, then collect surges from them.
+
+    Every ``YYYY-MM-DD.csv.gz`` under ``directory`` is parsed in a process
+    pool straight into the bar store (days already stored are kept), then
+    the imported trading days run
+    through the collection pipeline (detection, tracking, checkpoints) with
+    bars read from the store only, so no API calls are made. Returns the
+    collection log ID.
+    """
+    async with async_session() as session:
+        log = await start_collection_log(
+            session, "flat_file_import", log_id, details={"directory": directory}
+        )
+        log_id = log.id
+
+    try:
+        files = find_flat_files(directory)
+        workers = workers or os.cpu_count() or 1
+        progress: dict[str, Any] = {
+            "directory": directory,
+            "files_total": len(files),
+            "files_done": 0,
+            "files_skipped": 0,
+            "rows": 0,
+        }
+        started = time.monotonic()
+        store = market_data.store
+        imported = await _parse_files(
+            [path for _, path in files], store.root, workers, progress, log_id
+        )
+        progress["parse_seconds"] = round(time.monotonic() - started, 3)
+        logger.info(
+            "Parsed %d flat files (%d rows) in %.1fs",
+            len(imported),
+            progress["rows"],
+            progress["parse_seconds"],
+        )
+
+        async def load(target_date: date) -> DayBars:
+            return store.load(target_date) or DayBars()
+
+        async with async_session() as session:
+            threshold = await _get_threshold(session)
+        dates = [d for d in imported if is_trading_day(d)]
+        progress.update(dates_total=len(dates), dates_done=0, records_count=0)
+        await run_collection_pipeline(
+            dates, threshold, log_id, progress, load=load, job_type="flat_file_import"
+        )
+
+        await _update_log(
+            log_id,
+            status="completed",
+            records_count=progress["records_count"],
+            details={k: v for k, v in progress.items() if k != "records_count"},
+            completed_at=datetime.utcnow(),
+        )
+        logger.info(
+            "Flat file import completed: %d days, %d surges",
+            len(dates),
+            progress["records_count"],
+        )
+    except Exception as e:
+        await _update_log(
+            log_id,
+            status="failed",
+            error_message=str(e),
+            completed_at=datetime.utcnow(),
+        )
+        logger.error("Flat file import failed: %s", e)
+        raise
+
+    return log_id
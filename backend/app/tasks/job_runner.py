@@ -0,0 +1,241 @@
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import func, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session
+from app.models.collection_log import CollectionLog
+from app.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 2
+
+# Identifies this process's runner as the owner of the logs it queues
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+HEARTBEAT_SECONDS = 30.0
+# A queued/running log without a heartbeat this recent has lost its owner
+STALE_AFTER_SECONDS = 3 * HEARTBEAT_SECONDS
+
+JOB_SECONDS = registry.histogram(
+    "job_duration_seconds",
+    "Background job run time by job type and outcome",
+    ("job_type", "status"),
+    buckets=(1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0, 4 * 3600.0, 24 * 3600.0),
+)
+# Observed by the jobs themselves, per unit of work in each stage
+JOB_STAGE_SECONDS = registry.histogram(
+    "job_stage_duration_seconds",
+    "Time spent per job stage step (a date, a page, a batch)",
+    ("job_type", "stage"),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0),
+)
+
+
+async def start_collection_log(
+    session: AsyncSession,
+    job_type: str,
+    log_id: int | None = None,
+    details: dict[str, Any] | None = None,
+) -> CollectionLog:
+    """Create a running CollectionLog, or mark a queued/resumed one running."""
+    if log_id is None:
+        log = CollectionLog(job_type=job_type, status="running", details=details)
+        session.add(log)
+    else:
+        log = await session.get(CollectionLog, log_id)
+        if log is None:
+            raise ValueError(f"Collection log {log_id} not found")
+        log.status = "running"
+        log.started_at = datetime.utcnow()
+        log.error_message = None
+        log.completed_at = None
+        if details is not None:
+            log.details = {**(log.details or {}), **details}
+    await session.commit()
+    return log
+
+
+def is_orphaned():
+    """Filter for logs whose owning runner is gone.
+
+    That is a log released on shutdown (or predating owners), or one whose
+    heartbeat (start time if it never had one) is older than
+    ``STALE_AFTER_SECONDS``.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=STALE_AFTER_SECONDS)
+    last_seen = func.coalesce(CollectionLog.heartbeat_at, CollectionLog.started_at)
+    return or_(CollectionLog.owner.is_(None), last_seen < cutoff)
+
+
+class JobRunner:
+    """In-process background runner for collection jobs.
+
+    Jobs are tracked by their CollectionLog ID and run on a bounded number
+    of workers. Jobs that spend Polygon quota run one at a time per job
+    type, so two backfills never split the budget between them, while a
+    daily collection or ticker sync is not held up behind a long backfill;
+    the rate limiter paces whatever runs concurrently.
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS) -> None:
+        self._workers = asyncio.Semaphore(max_workers)
+        self._api_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._tasks: dict[int, asyncio.Task] = {}
+        self._heartbeat: asyncio.Task | None = None
+        self._shutting_down = False
+
+    async def submit(
+        self,
+        job_type: str,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+        uses_api: bool = True,
+        log_id: int | None = None,
+        details: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> int:
+        """Queue a job and return its ID immediately.
+
+        ``func`` must accept a ``log_id`` keyword and report into that log.
+        ``details`` is saved on a new log right away, so whatever a restart
+        needs to resume the job survives even if it never started.
+        """
+        now = datetime.utcnow()
+        async with async_session() as session:
+            if log_id is None:
+                log = CollectionLog(
+                    job_type=job_type,
+                    status="queued",
+                    details=details,
+                    owner=INSTANCE_ID,
+                    heartbeat_at=now,
+                )
+                session.add(log)
+                await session.commit()
+                log_id = log.id
+            else:
+                await session.execute(
+                    update(CollectionLog)
+                    .where(CollectionLog.id == log_id)
+                    .values(status="queued", owner=INSTANCE_ID, heartbeat_at=now)
+                )
+                await session.commit()
+
+        task = asyncio.create_task(
+            self._run(job_type, log_id, func, args, kwargs, uses_api),
+            name=f"{job_type}-{log_id}",
+        )
+        self._tasks[log_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(log_id, None))
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.create_task(self._beat(), name="job-heartbeat")
+        return log_id
+
+    async def _beat(self) -> None:
+        """Refresh heartbeat_at on this runner's logs while any job is active."""
+        while self._tasks:
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            if not self._tasks:
+                break
+            try:
+                await self._touch()
+            except Exception:
+                logger.exception("Job heartbeat failed")
+
+    async def _touch(self) -> None:
+        async with async_session() as session:
+            await session.execute(
+                update(CollectionLog)
+                .where(CollectionLog.id.in_(list(self._tasks)))
+                .values(heartbeat_at=datetime.utcnow())
+            )
+            await session.commit()
+
+    def is_active(self, log_id: int) -> bool:
+        return log_id in self._tasks
+
+    def cancel(self, log_id: int) -> bool:
+        """Request cancellation. Returns False if the job is not active."""
+        task = self._tasks.get(log_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    async def shutdown(self) -> None:
+        """Stop all jobs, releasing their logs so the next startup resumes them."""
+        self._shutting_down = True
+        log_ids = list(self._tasks)
+        tasks = list(self._tasks.values())
+        if self._heartbeat is not None:
+            tasks.append(self._heartbeat)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if not log_ids:
+            return
+        async with async_session() as session:
+            await session.execute(
+                update(CollectionLog)
+                .where(
+                    CollectionLog.id.in_(log_ids),
+                    CollectionLog.status.in_(["queued", "running"]),
+                )
+                .values(owner=None)
+            )
+            await session.commit()
+
+    async def _run(
+        self,
+        job_type: str,
+        log_id: int,
+        func: Callable[..., Awaitable[Any]],
+        args: tuple,
+        kwargs: dict[str, Any],
+        uses_api: bool,
+    ) -> None:
+        lock = self._api_locks[job_type] if uses_api else contextlib.nullcontext()
+        started = None
+        status = "completed"
+        try:
+            async with lock, self._workers:
+                started = time.perf_counter()
+                await func(*args, log_id=log_id, **kwargs)
+        except asyncio.CancelledError:
+            status = "cancelled"
+            if self._shutting_down:
+                logger.info("Job %d interrupted by shutdown", log_id)
+                return
+            logger.info("Job %d cancelled", log_id)
+            await self._set_status(log_id, "cancelled")
+        except Exception:
+            status = "failed"
+            # The job has already recorded the failure on its log
+            logger.exception("Job %d failed", log_id)
+        finally:
+            if started is not None:
+                JOB_SECONDS.observe(time.perf_counter() - started, job_type, status)
+
+    async def _set_status(self, log_id: int, status: str) -> None:
+        async with async_session() as session:
+            await session.execute(
+                update(CollectionLog)
+                .where(CollectionLog.id == log_id)
+                .values(status=status, completed_at=datetime.utcnow())
+            )
+            await session.commit()
+
+
+# Singleton instance
+job_runner = JobRunner()
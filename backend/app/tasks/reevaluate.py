@@ -0,0 +1,204 @@
+import logging
+import time
+from datetime import date, datetime
+
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.data_sources.bar_store import DayBars
+from app.data_sources.market_data import market_data
+from app.database import async_session
+from app.models.collected_date import CollectedDate
+from app.models.collection_log import CollectionLog
+from app.models.surge_event import SurgeEvent
+from app.models.surge_tracking import SurgeTracking
+from app.services import change_counter_service, rollup_service
+from app.tasks.daily_collection import (
+    MAX_PREV_DAY_LOOKBACK,
+    _get_threshold,
+    _insert_surge_events,
+    _update_tracking,
+)
+from app.tasks.job_runner import start_collection_log
+from app.tasks.surge_detection import detect_surges_for_date
+from app.utils.trading_calendar import is_trading_day, previous_trading_day
+
+logger = logging.getLogger(__name__)
+
+# Seconds a write transaction may stay open; other writers wait on it
+# (the SQLite busy timeout is 5s)
+COMMIT_SECONDS = 0.5
+
+
+async def _mark_reevaluated(
+    session: AsyncSession,
+    target_date: date,
+    threshold: float,
+    surge_count: int,
+    log_id: int | None,
+) -> None:
+    """Checkpoint a re-evaluated date without raising its threshold.
+
+    Events found earlier at a lower threshold are still in the table, so the
+    date keeps the lower of the two.
+    """
+    table = CollectedDate.__table__
+    stmt = sqlite_insert(table).values(
+        trade_date=target_date,
+        threshold_pct=threshold,
+        surge_count=surge_count,
+        collection_log_id=log_id,
+        completed_at=datetime.utcnow(),
+    )
+    lowered = stmt.excluded.threshold_pct <= table.c.threshold_pct
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["trade_date"],
+        set_={
+            "threshold_pct": func.min(
+                table.c.threshold_pct, stmt.excluded.threshold_pct
+            ),
+            "surge_count": case(
+                (lowered, stmt.excluded.surge_count), else_=table.c.surge_count
+            ),
+            "collection_log_id": case(
+                (lowered, stmt.excluded.collection_log_id),
+                else_=table.c.collection_log_id,
+            ),
+        },
+    )
+    await session.execute(stmt)
+
+
+async def _prune_below(session: AsyncSession, threshold: float) -> int:
+    """Delete events (and their tracking) below ``threshold``. Returns events deleted."""
+    below = select(SurgeEvent.id).where(SurgeEvent.change_pct < threshold)
+    await session.execute(
+        delete(SurgeTracking).where(SurgeTracking.surge_event_id.in_(below))
+    )
+    result = await session.execute(
+        delete(SurgeEvent).where(SurgeEvent.change_pct < threshold)
+    )
+    pruned = result.rowcount or 0
+    if pruned:
+        # Every collected date now holds exactly the events at or above it
+        await session.execute(
+            update(CollectedDate)
+            .where(CollectedDate.threshold_pct < threshold)
+            .values(threshold_pct=threshold)
+        )
+        await rollup_service.rebuild_rollups(session)
+        await change_counter_service.bump(session, SurgeEvent.__tablename__)
+    return pruned
+
+
+async def run_threshold_reevaluation(
+    threshold: float | None = None, prune: bool = False, log_id: int | None = None
+) -> int:
+    """Re-detect surges across every day in the bar store. Returns the log ID.
+
+    Each stored day is decoded once and compared column-wise against the
+    previous stored session, so no API calls are made. New events are
+    inserted (and tracked from later stored closes); with ``prune``, events
+    below ``threshold`` are deleted afterwards. ``threshold`` defaults to
+    the current ``surge_threshold_pct`` setting.
+    """
+    async with async_session() as session:
+        log = await start_collection_log(session, "reevaluation", log_id)
+        log_id = log.id
+        if threshold is None:
+            threshold = await _get_threshold(session)
+        await session.commit()
+
+    store = market_data.store
+    dates = [d for d in store.stored_dates() if is_trading_day(d)]
+    progress = {
+        "threshold_pct": threshold,
+        "prune": prune,
+        "dates_total": len(dates),
+        "dates_done": 0,
+        "inserted": 0,
+        "tracked": 0,
+    }
+    started = time.monotonic()
+    try:
+        previous, previous_date = DayBars(), None
+        empty_dates: set[date] = set()
+        transaction_started = time.monotonic()
+        async with async_session() as session:
+            for index, current_date in enumerate(dates, start=1):
+                current = store.load(current_date)
+                if current is None or not len(current):
+                    empty_dates.add(current_date)
+                else:
+                    # Step back over stored empty days (unscheduled closures)
+                    expected = previous_trading_day(current_date)
+                    for _ in range(MAX_PREV_DAY_LOOKBACK):
+                        if expected not in empty_dates:
+                            break
+                        expected = previous_trading_day(expected)
+                    if expected == previous_date:
+                        rows = detect_surges_for_date(
+                            current_date, current, previous, threshold
+                        )
+                        progress["inserted"] += await _insert_surge_events(
+                            session, rows
+                        )
+                        await _mark_reevaluated(
+                            session, current_date, threshold, len(rows), log_id
+                        )
+                    progress["tracked"] += await _update_tracking(
+                        session, current_date, current
+                    )
+                    previous, previous_date = current, current_date
+
+                progress["dates_done"] = index
+                elapsed = time.monotonic() - transaction_started
+                if elapsed >= COMMIT_SECONDS or index == len(dates):
+                    await session.execute(
+                        update(CollectionLog)
+                        .where(CollectionLog.id == log_id)
+                        .values(
+                            records_count=progress["inserted"], details=dict(progress)
+                        )
+                    )
+                    await session.commit()
+                    transaction_started = time.monotonic()
+
+            if prune:
+                progress["pruned"] = await _prune_below(session, threshold)
+            progress["elapsed_seconds"] = round(time.monotonic() - started, 3)
+            await session.execute(
+                update(CollectionLog)
+                .where(CollectionLog.id == log_id)
+                .values(
+                    status="completed",
+                    records_count=progress["inserted"],
+                    details=dict(progress),
+                    completed_at=datetime.utcnow(),
+                )
+            )
+            await session.commit()
+        logger.info(
+            "Re-evaluated %d stored dates at %.2f%%: %d new surges, %d pruned",
+            len(dates),
+            threshold,
+            progress["inserted"],
+            progress.get("pruned", 0),
+        )
+    except Exception as e:
+        async with async_session() as session:
+            await session.execute(
+                update(CollectionLog)
+                .where(CollectionLog.id == log_id)
+                .values(
+                    status="failed",
+                    error_message=str(e),
+                    completed_at=datetime.utcnow(),
+                )
+            )
+            await session.commit()
+        logger.error("Threshold re-evaluation failed: %s", e)
+        raise
+
+    return log_id
@@ -7,15 +7,32 @@ logger = logging.getLogger(__name__)
 scheduler = AsyncIOScheduler()
 
 
-def setup_scheduler() -> None:
-    """Register scheduled jobs."""
+async def _queue_daily_collection() -> None:
     from app.tasks.daily_collection import run_daily_collection
+    from app.tasks.job_runner import job_runner
+
+    await job_runner.submit("daily_collection", run_daily_collection)
+
+
+async def _queue_ticker_sync() -> None:
+    from app.tasks.job_runner import job_runner
     from app.tasks.ticker_sync import run_ticker_sync
 
-    # Daily collection at 22:00 UTC (after US market close)
+    await job_runner.submit("ticker_sync", run_ticker_sync)
+
+
+def setup_scheduler() -> None:
+    """Register scheduled jobs.
+
+    Jobs are queued on the job runner so they never overlap a manually
+    triggered run of the same job, and share its bounded workers.
+    """
+    # Daily collection at 22:00 UTC (after US market close); holidays are
+    # skipped by the trading calendar without any API call
     scheduler.add_job(
-        run_daily_collection,
+        _queue_daily_collection,
         "cron",
+        day_of_week="mon-fri",
         hour=22,
         minute=0,
         id="daily_collection",
@@ -24,7 +41,7 @@ def setup_scheduler() -> None:
 
     # Weekly ticker sync on Sunday at 00:00 UTC
     scheduler.add_job(
-        run_ticker_sync,
+        _queue_ticker_sync,
         "cron",
         day_of_week="sun",
         hour=0,
@@ -0,0 +1,83 @@
+import math
+from datetime import date
+from itertools import compress, repeat
+from operator import ge, mul
+from typing import Any
+
+from app.data_sources.bar_store import DayBars
+
+
+def detect_surges(
+    current: DayBars, previous: DayBars, threshold: float
+) -> list[dict[str, Any]]:
+    """Detect surges between two whole-market snapshots.
+
+    Previous closes are aligned to the current day's symbol order in a single
+    pass and change_pct is evaluated column-wise, so only rows at or above
+    ``threshold`` are ever materialised. Returns SurgeEvent column values
+    (without ``event_date``), ordered as in ``current``.
+    """
+    if not len(current) or not len(previous):
+        return []
+
+    prev_close_by_symbol = dict(
+        zip(previous.symbols, previous.columns["c"], strict=True)
+    )
+    prev_closes = list(map(prev_close_by_symbol.get, current.symbols, repeat(math.nan)))
+    closes = current.columns["c"]
+
+    # Column-wise prefilter (close >= prev_close * factor) runs entirely in C;
+    # NaN closes or unknown previous closes fail the comparison. The slightly
+    # loose factor keeps boundary rows, which the exact check below settles.
+    factor = (1 + threshold / 100) * (1 - 1e-9)
+    candidates = compress(
+        range(len(closes)), map(ge, closes, map(mul, prev_closes, repeat(factor)))
+    )
+    hits = [
+        i
+        for i in candidates
+        if prev_closes[i] > 0
+        and (closes[i] - prev_closes[i]) / prev_closes[i] * 100 >= threshold
+    ]
+
+    cols = current.columns
+    opens, highs, lows, volumes, vwaps = (
+        cols["o"],
+        cols["h"],
+        cols["l"],
+        cols["v"],
+        cols["vw"],
+    )
+    rows: list[dict[str, Any]] = []
+    for i in hits:
+        close = closes[i]
+        prev_close = prev_closes[i]
+        vwap = vwaps[i]
+        rows.append(
+            {
+                "symbol": current.symbols[i],
+                "open": _or_zero(opens[i]),
+                "high": _or_zero(highs[i]),
+                "low": _or_zero(lows[i]),
+                "close": close,
+                "volume": int(_or_zero(volumes[i])),
+                "prev_close": prev_close,
+                "change_pct": round((close - prev_close) / prev_close * 100, 2),
+                "vwap": vwap if vwap == vwap and vwap else None,
+            }
+        )
+    return rows
+
+
+def detect_surges_for_date(
+    event_date: date, current: DayBars, previous: DayBars, threshold: float
+) -> list[dict[str, Any]]:
+    """detect_surges with ``event_date`` filled in, ready for insertion."""
+    rows = detect_surges(current, previous, threshold)
+    for row in rows:
+        row["event_date"] = event_date
+    return rows
+
+
+def _or_zero(value: float) -> float:
+    return value if value == value else 0.0
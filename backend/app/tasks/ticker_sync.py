@@ -1,86 +1,133 @@
 import logging
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.data_sources.market_data import market_data
 from app.database import async_session
-from app.data_sources.polygon_client import polygon_client
-from app.models.collection_log import CollectionLog
 from app.models.ticker import Ticker
+from app.services import change_counter_service
+from app.tasks.job_runner import JOB_STAGE_SECONDS, start_collection_log
+from app.utils.ticker_index import ticker_index
 
 logger = logging.getLogger(__name__)
 
-
-async def _sync_page(session: AsyncSession, cursor: str | None = None) -> tuple[int, str | None]:
-    """Sync one page of tickers. Returns (count, next_cursor)."""
-    data = await polygon_client.tickers_list(cursor)
+# Safety limit: 1000 tickers per page covers the ~30k-symbol US universe
+MAX_PAGES = 40
+
+# Ticker columns refreshed by sync, mapped from Polygon reference fields
+_SYNC_FIELDS = {
+    "name": "name",
+    "market": "market",
+    "exchange": "primary_exchange",
+    "type": "type",
+    "currency": "currency_name",
+}
+
+
+def _ticker_row(item: dict, now: datetime) -> dict:
+    row = {column: item.get(key) for column, key in _SYNC_FIELDS.items()}
+    row["symbol"] = item["ticker"]
+    row["active"] = item.get("active", True)
+    row["updated_at"] = now
+    return row
+
+
+async def _upsert_tickers(session: AsyncSession, rows: list[dict]) -> dict[str, int]:
+    """Upsert ticker rows in one statement, leaving unchanged rows untouched.
+
+    Returns inserted/updated/unchanged counts.
+    """
+    if not rows:
+        return {"inserted": 0, "updated": 0, "unchanged": 0}
+
+    symbols = [row["symbol"] for row in rows]
+    existing_result = await session.execute(
+        select(Ticker.symbol).where(Ticker.symbol.in_(symbols))
+    )
+    existing_count = len(existing_result.all())
+
+    table = Ticker.__table__
+    stmt = sqlite_insert(table)
+    tracked = [*_SYNC_FIELDS, "active"]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["symbol"],
+        set_={column: stmt.excluded[column] for column in [*tracked, "updated_at"]},
+        where=or_(
+            *(
+                table.c[column].is_distinct_from(stmt.excluded[column])
+                for column in tracked
+            )
+        ),
+    )
+    result = await session.execute(stmt, rows)
+
+    inserted = len(rows) - existing_count
+    updated = result.rowcount - inserted
+    if result.rowcount:
+        await change_counter_service.bump(session, table.name)
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": existing_count - updated,
+    }
+
+
+async def _sync_page(
+    session: AsyncSession, cursor: str | None = None
+) -> tuple[dict[str, int], str | None]:
+    """Sync one page of tickers. Returns (counts, next_cursor)."""
+    with JOB_STAGE_SECONDS.time("ticker_sync", "fetch"):
+        data = await market_data.tickers_list(cursor)
     results = data.get("results", [])
     next_cursor = data.get("next_cursor")
-    count = 0
-
-    for item in results:
-        symbol = item.get("ticker", "")
-        if not symbol:
-            continue
-
-        result = await session.execute(
-            select(Ticker).where(Ticker.symbol == symbol)
-        )
-        existing = result.scalar_one_or_none()
-
-        if existing:
-            existing.name = item.get("name")
-            existing.market = item.get("market")
-            existing.exchange = item.get("primary_exchange")
-            existing.type = item.get("type")
-            existing.currency = item.get("currency_name")
-            existing.active = item.get("active", True)
-            existing.updated_at = datetime.utcnow()
-        else:
-            ticker = Ticker(
-                symbol=symbol,
-                name=item.get("name"),
-                market=item.get("market"),
-                exchange=item.get("primary_exchange"),
-                type=item.get("type"),
-                currency=item.get("currency_name"),
-                active=item.get("active", True),
-            )
-            session.add(ticker)
-        count += 1
 
-    return count, next_cursor
+    now = datetime.utcnow()
+    # Keyed by symbol so a repeated ticker within a page is written once
+    rows = {
+        item["ticker"]: _ticker_row(item, now) for item in results if item.get("ticker")
+    }
+    with JOB_STAGE_SECONDS.time("ticker_sync", "upsert"):
+        counts = await _upsert_tickers(session, list(rows.values()))
+    return counts, next_cursor
 
 
-async def run_ticker_sync() -> int:
+async def run_ticker_sync(log_id: int | None = None) -> int:
     """Run ticker sync job. Returns the collection log ID."""
     async with async_session() as session:
-        log = CollectionLog(job_type="ticker_sync", status="running")
-        session.add(log)
-        await session.flush()
+        log = await start_collection_log(session, "ticker_sync", log_id)
         log_id = log.id
 
         try:
-            total_count = 0
+            totals = {"inserted": 0, "updated": 0, "unchanged": 0}
             cursor: str | None = None
             pages_fetched = 0
-            max_pages = 10  # Safety limit for free tier
 
-            while pages_fetched < max_pages:
-                count, next_cursor = await _sync_page(session, cursor)
-                total_count += count
+            while pages_fetched < MAX_PAGES:
+                counts, next_cursor = await _sync_page(session, cursor)
+                for key, value in counts.items():
+                    totals[key] += value
                 pages_fetched += 1
-                if not next_cursor or count == 0:
+                if not next_cursor or sum(counts.values()) == 0:
                     break
                 cursor = next_cursor
 
             log.status = "completed"
-            log.records_count = total_count
+            log.records_count = sum(totals.values())
+            log.details = {**totals, "pages": pages_fetched}
             log.completed_at = datetime.utcnow()
             await session.commit()
-
-            logger.info("Ticker sync completed: %d tickers synced", total_count)
+            with JOB_STAGE_SECONDS.time("ticker_sync", "index_refresh"):
+                await ticker_index.refresh(session)
+
+            logger.info(
+                "Ticker sync completed: %d inserted, %d updated, %d unchanged",
+                totals["inserted"],
+                totals["updated"],
+                totals["unchanged"],
+            )
         except Exception as e:
             log.status = "failed"
             log.error_message = str(e)
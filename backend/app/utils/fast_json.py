@@ -0,0 +1,18 @@
+from typing import Any
+
+from fastapi import Response
+from pydantic_core import to_json
+
+
+def json_response(content: Any, status_code: int = 200) -> Response:
+    """JSON response encoded in one pass by pydantic-core's Rust serializer.
+
+    Returning a Response skips FastAPI's response_model validation and
+    jsonable_encoder walk, so ``content`` (plain dicts, lists, dates) must
+    already match the endpoint's declared schema.
+    """
+    return Response(
+        content=to_json(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -0,0 +1,271 @@
+import math
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; suits HTTP, SQL and API latencies
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.help}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(f"{line}\n" for line in self._samples())
+
+
+class Counter(_Metric):
+    """Monotonic count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def _samples(self) -> Iterator[str]:
+        for labels, value in sorted(self._values.items()):
+            yield (
+                f"{self.name}{_label_text(self.labelnames, labels)} "
+                f"{_format_value(value)}"
+            )
+
+
+class Gauge(_Metric):
+    """Current value per label set, read from ``collect`` at scrape time.
+
+    Reading state on demand keeps gauges off the hot path entirely.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        collect: Callable[[], dict[tuple[str, ...], float]] | None = None,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self._collect = collect
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def _samples(self) -> Iterator[str]:
+        values = dict(self._values)
+        if self._collect is not None:
+            values.update(self._collect())
+        for labels, value in sorted(values.items()):
+            yield (
+                f"{self.name}{_label_text(self.labelnames, labels)} "
+                f"{_format_value(value)}"
+            )
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self._bounds, value)] += 1
+        self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    """Bucketed observations per label set.
+
+    Buckets are stored non-cumulatively, so an observation is one bisect and
+    two additions; they are accumulated only when rendered.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self._bounds = tuple(sorted(buckets))
+        self._children: dict[tuple[str, ...], _HistogramChild] = {}
+
+    def labels(self, *labels: str) -> _HistogramChild:
+        child = self._children.get(labels)
+        if child is None:
+            child = self._children[labels] = _HistogramChild(self._bounds)
+        return child
+
+    def observe(self, value: float, *labels: str) -> None:
+        self.labels(*labels).observe(value)
+
+    def time(self, *labels: str):
+        """Context manager observing the duration of its block."""
+        return self.labels(*labels).time()
+
+    def _samples(self) -> Iterator[str]:
+        names = (*self.labelnames, "le")
+        for labels, child in sorted(self._children.items()):
+            cumulative = 0
+            bounds = (*self._bounds, math.inf)
+            for bound, count in zip(bounds, child.counts, strict=True):
+                cumulative += count
+                le = "+Inf" if math.isinf(bound) else repr(float(bound))
+                yield (
+                    f"{self.name}_bucket{_label_text(names, (*labels, le))} "
+                    f"{cumulative}"
+                )
+            label_text = _label_text(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(child.sum)}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class Registry:
+    """Named metrics, rendered together in the Prometheus text format.
+
+    Metrics are updated from the event loop thread without locking.
+    Registering an existing name returns the metric already registered.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(
+        self, name: str, help: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        collect: Callable[[], dict[tuple[str, ...], float]] | None = None,
+    ) -> Gauge:
+        return self._register(Gauge(name, help, labelnames, collect))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        return "".join(metric.render() for _, metric in sorted(self._metrics.items()))
+
+
+class HTTPMetricsMiddleware:
+    """ASGI middleware recording request latency per route template.
+
+    Routes are labelled by their path template (``/api/surges/{surge_id}``),
+    so the label set stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app, registry: "Registry") -> None:
+        self.app = app
+        self._latency = registry.histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by route",
+            ("method", "route", "status"),
+        )
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            self._latency.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status),
+            )
+
+
+# Process-wide registry served at /metrics
+registry = Registry()
@@ -1,30 +1,246 @@
 import asyncio
+import os
+import sqlite3
+import threading
 import time
+from collections import deque
 
+from app.utils.metrics import registry
 
-class RateLimiter:
-    """Token bucket rate limiter for API calls."""
+# Lanes in priority order: interactive requests pre-empt queued batch work
+INTERACTIVE = "interactive"
+BATCH = "batch"
+LANES = (INTERACTIVE, BATCH)
+
+WAIT_SECONDS = registry.histogram(
+    "rate_limiter_wait_seconds",
+    "Time callers waited for a rate-limit token, by lane",
+    ("lane",),
+    buckets=(0.001, 0.1, 1.0, 5.0, 10.0, 15.0, 30.0, 60.0, 120.0, 300.0),
+)
+
+
+class TokenBucket:
+    """In-process token bucket state."""
 
-    def __init__(self, max_tokens: int = 5, refill_rate: float = 5 / 60) -> None:
-        self._max_tokens = max_tokens
-        self._refill_rate = refill_rate  # tokens per second
+    def __init__(self, max_tokens: int, refill_rate: float) -> None:
+        self.max_tokens = max_tokens
+        self.refill_rate = refill_rate  # tokens per second
         self._tokens = float(max_tokens)
         self._last_refill = time.monotonic()
-        self._lock = asyncio.Lock()
 
     def _refill(self) -> None:
         now = time.monotonic()
         elapsed = now - self._last_refill
-        self._tokens = min(
-            self._max_tokens, self._tokens + elapsed * self._refill_rate
-        )
+        self._tokens = min(self.max_tokens, self._tokens + elapsed * self.refill_rate)
         self._last_refill = now
 
-    async def acquire(self) -> None:
-        async with self._lock:
-            self._refill()
-            if self._tokens < 1:
-                wait_time = (1 - self._tokens) / self._refill_rate
-                await asyncio.sleep(wait_time)
-                self._refill()
+    async def try_take(self, reserve: int = 0) -> float:
+        """Take a token if more than ``reserve`` remain.
+
+        Returns 0 on success, otherwise the seconds until one can be taken.
+        """
+        self._refill()
+        if self._tokens >= 1 + reserve:
             self._tokens -= 1
+            return 0.0
+        return (1 + reserve - self._tokens) / self.refill_rate
+
+    async def give_back(self) -> None:
+        self._tokens = min(self.max_tokens, self._tokens + 1)
+
+
+class SqliteTokenBucket(TokenBucket):
+    """Token bucket whose state is shared by every process on the host.
+
+    The bucket is a row in a small SQLite file, updated inside a
+    ``BEGIN IMMEDIATE`` transaction so concurrent processes (uvicorn
+    workers, a CLI backfill) take tokens atomically from one budget.
+    """
+
+    def __init__(
+        self, path: str, max_tokens: int, refill_rate: float, name: str = "polygon"
+    ) -> None:
+        super().__init__(max_tokens, refill_rate)
+        self._path = path
+        self._name = name
+        self._conn: sqlite3.Connection | None = None
+        self._conn_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self._path, timeout=10.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_buckets "
+                "(name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _update(self, reserve: int | None) -> float:
+        """Refill and take (or, with ``reserve=None``, return) one token."""
+        with self._conn_lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()  # wall clock: monotonic is per process
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM token_buckets WHERE name = ?",
+                    (self._name,),
+                ).fetchone()
+                if row is None:
+                    tokens = float(self.max_tokens)
+                else:
+                    elapsed = max(0.0, now - row[1])
+                    tokens = min(self.max_tokens, row[0] + elapsed * self.refill_rate)
+
+                wait = 0.0
+                if reserve is None:
+                    tokens = min(self.max_tokens, tokens + 1)
+                elif tokens >= 1 + reserve:
+                    tokens -= 1
+                else:
+                    wait = (1 + reserve - tokens) / self.refill_rate
+
+                conn.execute(
+                    "INSERT INTO token_buckets (name, tokens, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET tokens = excluded.tokens, "
+                    "updated_at = excluded.updated_at",
+                    (self._name, tokens, now),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return wait
+
+    async def try_take(self, reserve: int = 0) -> float:
+        return await asyncio.to_thread(self._update, reserve)
+
+    async def give_back(self) -> None:
+        await asyncio.to_thread(self._update, None)
+
+
+class RateLimiter:
+    """Token bucket rate limiter for API calls, with priority lanes.
+
+    Callers that cannot get a token immediately queue in their lane. Each
+    freed token goes to the oldest waiter of the highest-priority lane, and
+    batch callers also leave ``interactive_reserve`` tokens untouched, so UI
+    requests are never stuck behind a backfill. Token state lives in
+    ``bucket`` (in-process by default, or shared across processes).
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 5,
+        refill_rate: float = 5 / 60,
+        interactive_reserve: int = 0,
+        bucket: TokenBucket | None = None,
+    ) -> None:
+        self._bucket = bucket or TokenBucket(max_tokens, refill_rate)
+        reserve = min(interactive_reserve, self._bucket.max_tokens - 1)
+        self._reserve = {INTERACTIVE: 0, BATCH: reserve}
+        self._waiters: dict[str, deque[asyncio.Future]] = {
+            lane: deque() for lane in LANES
+        }
+        self._dispatcher: asyncio.Task | None = None
+        self._arrival = asyncio.Event()
+        self._acquired = dict.fromkeys(LANES, 0)
+        self._total_wait = dict.fromkeys(LANES, 0.0)
+        self._max_wait = dict.fromkeys(LANES, 0.0)
+
+    def _has_priority_waiters(self, lane: str) -> bool:
+        """Whether anyone is queued in this lane or a higher-priority one."""
+        for other in LANES:
+            if any(not f.done() for f in self._waiters[other]):
+                return True
+            if other == lane:
+                return False
+        return False
+
+    def _next_waiter(self) -> tuple[str, deque[asyncio.Future]] | None:
+        for lane in LANES:
+            queue = self._waiters[lane]
+            while queue and queue[0].done():  # cancelled waiters
+                queue.popleft()
+            if queue:
+                return lane, queue
+        return None
+
+    async def _dispatch(self) -> None:
+        """Hand out tokens to queued waiters until none are left.
+
+        If the bucket fails (e.g. the shared database stays locked), every
+        queued waiter gets the error instead of waiting on a dead dispatcher.
+        """
+        try:
+            while (head := self._next_waiter()) is not None:
+                lane, queue = head
+                wait = await self._bucket.try_take(self._reserve[lane])
+                if wait == 0:
+                    if queue and not queue[0].done():
+                        queue.popleft().set_result(None)
+                    else:
+                        await self._bucket.give_back()  # waiter cancelled meanwhile
+                    continue
+                # Sleep until a token is due, or re-plan when someone new arrives
+                self._arrival.clear()
+                try:
+                    await asyncio.wait_for(self._arrival.wait(), timeout=wait)
+                except TimeoutError:
+                    pass
+        except Exception as e:
+            for queue in self._waiters.values():
+                while queue:
+                    future = queue.popleft()
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def acquire(self, lane: str = BATCH) -> None:
+        start = time.monotonic()
+        if not self._has_priority_waiters(lane):
+            if await self._bucket.try_take(self._reserve[lane]) == 0:
+                self._record(lane, 0.0)
+                return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[lane].append(future)
+        self._arrival.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                await self._bucket.give_back()  # granted just before cancellation
+            raise
+        self._record(lane, time.monotonic() - start)
+
+    def _record(self, lane: str, waited: float) -> None:
+        WAIT_SECONDS.observe(waited, lane)
+        self._acquired[lane] += 1
+        self._total_wait[lane] += waited
+        self._max_wait[lane] = max(self._max_wait[lane], waited)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Per-lane queue depth and wait times (seconds)."""
+        return {
+            lane: {
+                "queue_depth": sum(1 for f in self._waiters[lane] if not f.done()),
+                "acquired": self._acquired[lane],
+                "avg_wait": (
+                    self._total_wait[lane] / self._acquired[lane]
+                    if self._acquired[lane]
+                    else 0.0
+                ),
+                "max_wait": self._max_wait[lane],
+            }
+            for lane in LANES
+        }
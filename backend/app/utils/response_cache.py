@@ -0,0 +1,179 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any
+
+
+class LRUCache:
+    """In-memory LRU cache of encoded values, bounded by their total size.
+
+    Values are bytes, so a hit can be handed out without being copied.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[bool, bytes | None]:
+        """Returns (hit, encoded value)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            self._remove(key)
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, value: bytes, expires_at: float | None) -> None:
+        if len(value) > self._max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, expires_at)
+        self._bytes += len(value)
+        while self._bytes > self._max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def _remove(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value)
+
+
+class DiskCache:
+    """Persistent cache tier: compressed JSON values in a SQLite file.
+
+    Expired rows are purged when the file is opened and every
+    ``PURGE_EVERY`` writes, which also trims it to the ``max_rows`` most
+    recently written entries.
+    """
+
+    PURGE_EVERY = 500
+
+    def __init__(self, path: str, max_rows: int = 100_000) -> None:
+        self._path = path
+        self._max_rows = max_rows
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=10.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+            self._purge(conn)
+            self._conn = conn
+        return self._conn
+
+    def _purge(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (time.time(),))
+        # INSERT OR REPLACE assigns a new rowid, so rowid order is write order
+        conn.execute(
+            "DELETE FROM response_cache WHERE rowid <= ("
+            "SELECT rowid FROM response_cache ORDER BY rowid DESC "
+            "LIMIT 1 OFFSET ?)",
+            (self._max_rows,),
+        )
+        conn.commit()
+
+    def _get(self, key: str) -> tuple[bytes, float | None] | None:
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)
+                )
+                .fetchone()
+            )
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return zlib.decompress(row[0]), row[1]
+
+    def _set(self, key: str, encoded: bytes, expires_at: float | None) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, zlib.compress(encoded), expires_at),
+            )
+            conn.commit()
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self._purge(conn)
+
+    async def get(self, key: str) -> tuple[bytes, float | None] | None:
+        """Returns (encoded value, expires_at), or None on a miss."""
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, encoded: bytes, expires_at: float | None) -> None:
+        await asyncio.to_thread(self._set, key, encoded, expires_at)
+
+
+class TieredCache:
+    """Memory LRU in front of a persistent disk tier.
+
+    Values must be JSON-serialisable; both tiers keep them encoded, so every
+    hit returns a fresh copy that callers are free to modify. ``ttl=None``
+    means the entry never expires (e.g. closed historical ranges).
+    """
+
+    def __init__(self, memory: LRUCache, disk: DiskCache | None = None) -> None:
+        self._memory = memory
+        self._disk = disk
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+    async def get(self, key: str) -> tuple[bool, Any]:
+        """Returns (hit, value)."""
+        hit, encoded = self._memory.get(key)
+        if hit:
+            self.hits["memory"] += 1
+            return True, json.loads(encoded)
+        if self._disk is not None:
+            entry = await self._disk.get(key)
+            if entry is not None:
+                encoded, expires_at = entry
+                self._memory.set(key, encoded, expires_at)
+                self.hits["disk"] += 1
+                return True, json.loads(encoded)
+        self.misses += 1
+        return False, None
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        encoded = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        expires_at = None if ttl is None else time.time() + ttl
+        self._memory.set(key, encoded, expires_at)
+        if self._disk is not None:
+            await self._disk.set(key, encoded, expires_at)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "memory_hits": self.hits["memory"],
+            "disk_hits": self.hits["disk"],
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory.size_bytes,
+        }
@@ -0,0 +1,194 @@
+import asyncio
+import heapq
+import math
+import re
+from bisect import bisect_left
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.ticker import Ticker
+from app.services import change_counter_service
+
+# Fraction of the query's trigrams a name must contain to count as a match
+MIN_NAME_SIMILARITY = 0.6
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+class TickerEntry(NamedTuple):
+    symbol: str
+    name: str | None
+    exchange: str | None
+
+
+def _trigrams(text: str, partial_last_word: bool = False) -> set[str]:
+    """Word trigrams, padded like pg_trgm so short words and prefixes match.
+
+    With ``partial_last_word`` (a query still being typed) the last word
+    gets no end padding, so it matches as a prefix.
+    """
+    grams: set[str] = set()
+    words = _WORD_RE.findall(text.lower())
+    for n, word in enumerate(words, start=1):
+        padded = f"  {word}" if partial_last_word and n == len(words) else f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TickerIndex:
+    """In-memory ticker search: symbol prefix lookup plus fuzzy name matching.
+
+    Symbols are kept in sorted lists (one per symbol length) so a prefix is
+    a bisect range and the shortest matches come first without sorting;
+    names are indexed by trigram. Results rank exact symbol, then symbol
+    prefix, then names by trigram similarity. The structures are rebuilt
+    off the event loop and swapped in whole, so searches never see a
+    half-built index. The tickers change counter tells when the table has
+    changed (in any process) since the last rebuild.
+    """
+
+    def __init__(self) -> None:
+        self._entries: list[TickerEntry] = []
+        # symbol length -> (sorted symbols, entry ids in the same order)
+        self._by_length: dict[int, tuple[list[str], list[int]]] = {}
+        self._postings: dict[str, list[int]] = {}
+        self._name_grams: list[frozenset[str]] = []
+        self._version: int | None = None  # tickers version last built from
+        self._refreshing = asyncio.Lock()
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def build(self, entries: list[TickerEntry]) -> None:
+        by_length: dict[int, list[tuple[str, int]]] = {}
+        for i, entry in enumerate(entries):
+            by_length.setdefault(len(entry.symbol), []).append((entry.symbol, i))
+        postings: dict[str, list[int]] = {}
+        name_grams = []
+        for i, entry in enumerate(entries):
+            grams = frozenset(_trigrams(entry.name or ""))
+            name_grams.append(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        # Shortest names first, see _name_matches
+        name_length = [len(entry.name or "") for entry in entries]
+        for ids in postings.values():
+            ids.sort(key=name_length.__getitem__)
+
+        self._entries, self._by_length, self._postings, self._name_grams = (
+            entries,
+            {
+                length: ([s for s, _ in pairs], [i for _, i in pairs])
+                for length, pairs in sorted(
+                    (length, sorted(pairs)) for length, pairs in by_length.items()
+                )
+            },
+            postings,
+            name_grams,
+        )
+        self.ready = True
+
+    async def refresh(self, session: AsyncSession) -> None:
+        """Rebuild from the tickers table."""
+        async with self._refreshing:
+            await self._rebuild(session)
+
+    async def ensure_current(self, session: AsyncSession) -> None:
+        """Rebuild if the tickers table changed since the last build.
+
+        Searches keep using the current index while a rebuild is under way.
+        """
+        if self._refreshing.locked():
+            return
+        async with self._refreshing:
+            version = await change_counter_service.get_version(
+                session, Ticker.__tablename__
+            )
+            if version != self._version:
+                await self._rebuild(session)
+
+    async def _rebuild(self, session: AsyncSession) -> None:
+        # Read in one transaction, so the version matches the rows
+        version = await change_counter_service.get_version(
+            session, Ticker.__tablename__
+        )
+        result = await session.execute(
+            select(Ticker.symbol, Ticker.name, Ticker.exchange)
+        )
+        entries = [TickerEntry(*row) for row in result.all()]
+        await asyncio.to_thread(self.build, entries)
+        self._version = version
+
+    def _symbol_matches(self, prefix: str, limit: int) -> list[int]:
+        """Symbols starting with ``prefix``: exact first, then shortest."""
+        matches: list[int] = []
+        for length, (symbols, ids) in self._by_length.items():
+            if length < len(prefix):
+                continue
+            start = bisect_left(symbols, prefix)
+            end = start
+            while (
+                end < len(symbols)
+                and end - start < limit - len(matches)
+                and symbols[end].startswith(prefix)
+            ):
+                end += 1
+            matches.extend(ids[start:end])
+            if len(matches) >= limit:
+                break
+        return matches
+
+    def _name_matches(self, query: str, limit: int) -> list[int]:
+        """Names sharing at least MIN_NAME_SIMILARITY of the query's trigrams."""
+        grams = sorted(
+            _trigrams(query, partial_last_word=True),
+            key=lambda g: len(self._postings.get(g, ())),
+        )
+        if not grams:
+            return []
+        needed = math.ceil(len(grams) * MIN_NAME_SIMILARITY)
+        # A match lacks at most len(grams) - needed trigrams, so it must be in
+        # one of the len(grams) - needed + 1 rarest posting lists
+        candidates: set[int] = set()
+        for gram in grams[: len(grams) - needed + 1]:
+            candidates.update(self._postings.get(gram, ()))
+
+        query_grams = frozenset(grams)
+        # Full matches contain the rarest trigram too, and its posting list
+        # is ordered by name length: the first ``limit`` found are the best
+        full = []
+        for i in self._postings.get(grams[0], ()):
+            if query_grams <= self._name_grams[i]:
+                full.append(i)
+                if len(full) == limit:
+                    return full
+
+        scored = []
+        for i in candidates:
+            score = len(query_grams & self._name_grams[i])
+            if score >= needed:
+                # Most similar first; shorter names are the closer match on ties
+                scored.append((-score, len(self._entries[i].name or ""), i))
+        return [i for _, _, i in heapq.nsmallest(limit, scored)]
+
+    def search(self, query: str, limit: int = 20) -> list[TickerEntry]:
+        query = query.strip()
+        if not query:
+            return []
+        matches = self._symbol_matches(query.upper(), limit)
+        if len(matches) < limit:
+            matches += self._name_matches(query, limit)
+        seen: set[int] = set()
+        results: list[TickerEntry] = []
+        for i in matches:
+            if i not in seen:
+                seen.add(i)
+                results.append(self._entries[i])
+        return results[:limit]
+
+
+# Singleton instance
+ticker_index = TickerIndex()
@@ -0,0 +1,165 @@
+"""Offline NYSE/Nasdaq trading calendar.
+
+Regular holidays are generated from the exchange rules, unscheduled
+closures are listed explicitly, and the result is precomputed into a
+sorted table of trading days so every lookup is a dict hit or a bisect.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+
+CALENDAR_START = date(1990, 1, 1)
+CALENDAR_END = date(2099, 12, 31)
+
+# Unscheduled full-day closures (national mourning, weather, 9/11)
+SPECIAL_CLOSURES = frozenset(
+    {
+        date(1994, 4, 27),  # President Nixon
+        date(2001, 9, 11),
+        date(2001, 9, 12),
+        date(2001, 9, 13),
+        date(2001, 9, 14),
+        date(2004, 6, 11),  # President Reagan
+        date(2007, 1, 2),  # President Ford
+        date(2012, 10, 29),  # Hurricane Sandy
+        date(2012, 10, 30),
+        date(2018, 12, 5),  # President George H.W. Bush
+        date(2025, 1, 9),  # President Carter
+    }
+)
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    ell = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * ell) // 451
+    month, day = divmod(h + ell - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th given weekday of a month (n=-1 for the last one)."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day: date) -> date:
+    """Saturday holidays move to Friday, Sunday holidays to Monday."""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def _holidays(year: int) -> set[date]:
+    holidays = {
+        _nth_weekday(year, 2, 0, 3),  # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),  # Memorial Day
+        _observed(date(year, 7, 4)),  # Independence Day
+        _nth_weekday(year, 9, 0, 1),  # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        _observed(date(year, 12, 25)),  # Christmas
+    }
+    # New Year's Day is not moved back into the previous year
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.add(_observed(new_year))
+    if year >= 1998:
+        holidays.add(_nth_weekday(year, 1, 0, 3))  # Martin Luther King Jr. Day
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+    return holidays
+
+
+def _early_closes(year: int) -> set[date]:
+    """13:00 ET closes: July 3rd, the day after Thanksgiving, Christmas Eve."""
+    closes = {_nth_weekday(year, 11, 3, 4) + timedelta(days=1)}
+    for day in (date(year, 7, 3), date(year, 12, 24)):
+        if day.weekday() <= 3:  # Mon-Thu; on Fridays it is the observed holiday
+            closes.add(day)
+    return closes
+
+
+def _build() -> tuple[list[date], dict[date, int], frozenset[date]]:
+    closed: set[date] = set(SPECIAL_CLOSURES)
+    early: set[date] = set()
+    for year in range(CALENDAR_START.year, CALENDAR_END.year + 1):
+        closed |= _holidays(year)
+        early |= _early_closes(year)
+
+    days: list[date] = []
+    day = CALENDAR_START
+    while day <= CALENDAR_END:
+        if day.weekday() < 5 and day not in closed:
+            days.append(day)
+        day += timedelta(days=1)
+    return days, {d: i for i, d in enumerate(days)}, frozenset(early - closed)
+
+
+_TRADING_DAYS, _INDEX, _EARLY_CLOSES = _build()
+
+
+def _check_range(day: date) -> None:
+    if not CALENDAR_START <= day <= CALENDAR_END:
+        raise ValueError(
+            f"{day} is outside the trading calendar "
+            f"({CALENDAR_START} to {CALENDAR_END})"
+        )
+
+
+def is_trading_day(day: date) -> bool:
+    return day in _INDEX
+
+
+def is_early_close(day: date) -> bool:
+    """Whether the market closes at 13:00 ET on this trading day."""
+    return day in _EARLY_CLOSES
+
+
+def trading_day_offset(day: date, offset: int) -> date:
+    """The trading day ``offset`` sessions after (or before, if negative) a date.
+
+    For a non-trading ``day``, +1 is the next session and -1 the previous one.
+    """
+    _check_range(day)
+    if offset == 0:
+        if day not in _INDEX:
+            raise ValueError(f"{day} is not a trading day")
+        return day
+    if offset > 0:
+        position = bisect_right(_TRADING_DAYS, day) + offset - 1
+    else:
+        position = bisect_left(_TRADING_DAYS, day) + offset
+    if not 0 <= position < len(_TRADING_DAYS):
+        raise ValueError(f"Offset {offset} from {day} is outside the trading calendar")
+    return _TRADING_DAYS[position]
+
+
+def next_trading_day(day: date) -> date:
+    """First trading day strictly after ``day``."""
+    return trading_day_offset(day, 1)
+
+
+def previous_trading_day(day: date) -> date:
+    """Last trading day strictly before ``day``."""
+    return trading_day_offset(day, -1)
+
+
+def trading_days_between(from_date: date, to_date: date) -> list[date]:
+    """Trading days in the inclusive range, in ascending order."""
+    start = bisect_left(_TRADING_DAYS, from_date)
+    end = bisect_right(_TRADING_DAYS, to_date)
+    return _TRADING_DAYS[start:end]
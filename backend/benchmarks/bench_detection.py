@@ -0,0 +1,127 @@
+"""Benchmark surge detection on a synthetic whole-market day.
+
+Compares the original per-dict detection loop with the columnar
+``detect_surges`` engine.
+
+    cd backend && python -m benchmarks.bench_detection --symbols 12000
+"""
+
+import argparse
+import random
+import string
+import time
+
+from app.data_sources.bar_store import DayBars
+from app.tasks.surge_detection import detect_surges
+
+
+def _synthetic_day(
+    symbols: list[str], rng: random.Random, base: dict[str, float]
+) -> list[dict]:
+    results = []
+    for symbol in symbols:
+        # ~0.5% of the market gaps up hard, the rest drifts
+        change = rng.uniform(0.2, 1.5) if rng.random() < 0.005 else rng.gauss(0, 0.03)
+        close = max(0.01, base[symbol] * (1 + change))
+        results.append(
+            {
+                "T": symbol,
+                "o": base[symbol],
+                "h": max(close, base[symbol]) * 1.01,
+                "l": min(close, base[symbol]) * 0.99,
+                "c": close,
+                "v": float(rng.randint(1_000, 5_000_000)),
+                "vw": (close + base[symbol]) / 2,
+                "t": 1736888400000,
+                "n": rng.randint(10, 50_000),
+            }
+        )
+    return results
+
+
+def _legacy_detect(
+    results: list[dict], prev_results: list[dict], threshold: float
+) -> list[dict]:
+    prev_close_map: dict[str, float] = {}
+    for item in prev_results:
+        symbol = item.get("T", "")
+        close = item.get("c")
+        if symbol and close:
+            prev_close_map[symbol] = float(close)
+
+    rows = []
+    for item in results:
+        symbol = item.get("T", "")
+        close = item.get("c")
+        if not symbol or close is None:
+            continue
+        prev_close = prev_close_map.get(symbol)
+        if prev_close is None or prev_close <= 0:
+            continue
+        change_pct = (float(close) - prev_close) / prev_close * 100
+        if change_pct >= threshold:
+            rows.append(
+                {
+                    "symbol": symbol,
+                    "open": float(item.get("o", 0)),
+                    "high": float(item.get("h", 0)),
+                    "low": float(item.get("l", 0)),
+                    "close": float(close),
+                    "volume": int(item.get("v", 0)),
+                    "prev_close": prev_close,
+                    "change_pct": round(change_pct, 2),
+                    "vwap": float(item["vw"]) if item.get("vw") else None,
+                }
+            )
+    return rows
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=12_000)
+    parser.add_argument("--threshold", type=float, default=20.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    symbols = sorted(
+        {
+            "".join(rng.choices(string.ascii_uppercase, k=rng.randint(1, 5)))
+            for _ in range(args.symbols * 2)
+        }
+    )[: args.symbols]
+    base = {s: rng.uniform(1, 300) for s in symbols}
+    prev_results = [{"T": s, "c": base[s]} for s in symbols]
+    results = _synthetic_day(symbols, rng, base)
+
+    current = DayBars.from_results(results)
+    previous = DayBars.from_results(prev_results)
+
+    legacy = _legacy_detect(results, prev_results, args.threshold)
+    columnar = detect_surges(current, previous, args.threshold)
+    assert legacy == columnar, "engines disagree"
+
+    legacy_s = _best_of(
+        lambda: _legacy_detect(results, prev_results, args.threshold), args.repeat
+    )
+    columnar_s = _best_of(
+        lambda: detect_surges(current, previous, args.threshold), args.repeat
+    )
+
+    print(f"symbols={len(symbols)} surges={len(columnar)} threshold={args.threshold}%")
+    print(f"legacy per-dict loop : {legacy_s * 1000:8.3f} ms")
+    print(f"columnar engine      : {columnar_s * 1000:8.3f} ms")
+    print(f"speedup              : {legacy_s / columnar_s:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Benchmark the collection pipeline end to end against a synthetic market.
+
+Runs ticker sync, a backfill of N trading days and one daily collection
+for each scale against its own scratch SQLite file and bar store, and
+reports per stage: wall time, SQL statements issued, peak RSS and data
+source calls. Each stage runs in a fresh subprocess, so its peak RSS is
+its own rather than the high-water mark of everything before it. Results
+are written as JSON so runs from different commits can be compared.
+
+    cd backend && python -m benchmarks.bench_pipeline --symbols 1000 --days 1,250
+    cd backend && python -m benchmarks.bench_pipeline --compare old.json new.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import UTC, date, datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+
+# Last backfilled session; the daily collection runs on the one after it
+END_DATE = date(2025, 6, 30)
+# In order: each stage works on the database the previous ones left behind
+STAGES = ("ticker_sync", "backfill", "daily_collection")
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def _run_worker(stage: str, days: int) -> dict:
+    # Imported here: settings are read from the environment set by the parent
+    from sqlalchemy import event
+
+    from app.data_sources.base import DataSourceWrapper
+    from app.data_sources.market_data import market_data
+    from app.database import engine, init_db
+    from app.tasks.backfill import run_backfill
+    from app.tasks.daily_collection import run_daily_collection
+    from app.tasks.ticker_sync import run_ticker_sync
+    from app.utils.trading_calendar import next_trading_day, trading_day_offset
+
+    calls: Counter[str] = Counter()
+
+    class CountingSource(DataSourceWrapper):
+        async def grouped_daily(self, target_date):
+            calls["grouped_daily"] += 1
+            return await self._inner.grouped_daily(target_date)
+
+        async def tickers_list(self, cursor=None):
+            calls["tickers_list"] += 1
+            return await self._inner.tickers_list(cursor)
+
+    market_data._inner = CountingSource(market_data.inner)
+
+    statements = 0
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        statements += 1
+
+    await init_db()
+    start_date = trading_day_offset(END_DATE, -(days - 1))
+    runs = {
+        "ticker_sync": lambda: run_ticker_sync(),
+        "backfill": lambda: run_backfill(start_date, END_DATE),
+        "daily_collection": lambda: run_daily_collection(next_trading_day(END_DATE)),
+    }
+
+    statements = 0
+    started = time.perf_counter()
+    await runs[stage]()
+    report = {
+        "wall_s": round(time.perf_counter() - started, 3),
+        "statements": statements,
+        "api_calls": sum(calls.values()),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    await engine.dispose()
+    return report
+
+
+def _run_scale(symbols: int, days: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as scratch:
+        env = {
+            **os.environ,
+            "DATA_SOURCE": "synthetic",
+            "SYNTHETIC_SYMBOLS": str(symbols),
+            "DATABASE_URL": f"sqlite+aiosqlite:///{scratch}/bench.db",
+            "BAR_STORE_DIR": os.path.join(scratch, "bars"),
+            "RESPONSE_CACHE_PATH": os.path.join(scratch, "response_cache.db"),
+            "RATE_LIMITER_BACKEND": "memory",
+        }
+        stages = {}
+        for stage in STAGES:
+            out = os.path.join(scratch, f"{stage}.json")
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.bench_pipeline",
+                    "--worker",
+                    stage,
+                    "--days",
+                    str(days),
+                    "--output",
+                    out,
+                ],
+                cwd=BACKEND_DIR,
+                env=env,
+                check=True,
+            )
+            with open(out) as f:
+                stages[stage] = json.load(f)
+        return {"symbols": symbols, "days": days, "stages": stages}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(old_path: str, new_path: str) -> None:
+    with open(old_path) as f:
+        old = {(r["symbols"], r["days"]): r["stages"] for r in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = json.load(f)["results"]
+    print(f"{'scale':>14} {'stage':<17} {'wall_s':>17} {'statements':>21}")
+    for result in new:
+        scale = (result["symbols"], result["days"])
+        for stage, metrics in result["stages"].items():
+            before = old.get(scale, {}).get(stage)
+            if before is None:
+                continue
+            ratio = metrics["wall_s"] / before["wall_s"] if before["wall_s"] else 0.0
+            print(
+                f"{scale[0]:>6}x{scale[1]:<7} {stage:<17} "
+                f"{before['wall_s']:>7.2f}->{metrics['wall_s']:<7.2f}({ratio:.2f}x) "
+                f"{before['statements']:>9}->{metrics['statements']:<9}"
+            )
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=_int_list, default=[1_000, 12_000, 30_000])
+    parser.add_argument("--days", type=_int_list, default=[1, 250, 1_250])
+    parser.add_argument("--output", help="JSON results path")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--worker", choices=STAGES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        _compare(*args.compare)
+        return
+
+    if args.worker:
+        report = asyncio.run(_run_worker(args.worker, args.days[0]))
+        with open(args.output, "w") as f:
+            json.dump(report, f)
+        return
+
+    commit = _git_commit()
+    results = []
+    for symbols in args.symbols:
+        for days in args.days:
+            result = _run_scale(symbols, days)
+            results.append(result)
+            for stage, m in result["stages"].items():
+                print(
+                    f"symbols={symbols:<6} days={days:<5} {stage:<17} "
+                    f"{m['wall_s']:>8.2f}s {m['statements']:>8} stmts "
+                    f"{m['api_calls']:>6} calls {m['peak_rss_mb']:>8.1f} MB"
+                )
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"pipeline-{commit or 'unknown'}.json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(
+            {
+                "commit": commit,
+                "created_at": datetime.now(UTC).isoformat(),
+                "python": platform.python_version(),
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
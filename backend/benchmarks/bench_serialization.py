@@ -0,0 +1,147 @@
+"""Benchmark the /api/surges list endpoint serialization path.
+
+Compares the original implementation (ORM entities with a joined ticker,
+hand-built SurgeEventResponse models, FastAPI response_model validation)
+with the column-select + single-pass JSON encoding path. Both endpoints
+run through the full ASGI stack against the same scratch SQLite file.
+
+    cd backend && python -m benchmarks.bench_serialization --page-size 200
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from fastapi import Depends, FastAPI, Query
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import joinedload
+
+from app.database import get_session
+from app.models import Base, SurgeEvent, Ticker
+from app.routers import surges
+from app.schemas.surge import SurgeEventResponse, SurgeListResponse
+
+
+async def _legacy_list(
+    page_size: int = Query(50, ge=1, le=200),
+    session: AsyncSession = Depends(get_session),
+):
+    query = (
+        select(SurgeEvent)
+        .join(Ticker, isouter=True)
+        .options(joinedload(SurgeEvent.ticker))
+        .order_by(SurgeEvent.change_pct.desc(), SurgeEvent.id.desc())
+        .limit(page_size)
+    )
+    items = (await session.execute(query)).unique().scalars().all()
+    return SurgeListResponse(
+        items=[
+            SurgeEventResponse(
+                id=s.id,
+                symbol=s.symbol,
+                event_date=s.event_date,
+                open=s.open,
+                high=s.high,
+                low=s.low,
+                close=s.close,
+                volume=s.volume,
+                prev_close=s.prev_close,
+                change_pct=s.change_pct,
+                vwap=s.vwap,
+                created_at=s.created_at,
+                ticker_name=s.ticker.name if s.ticker else None,
+                sic_description=s.ticker.sic_description if s.ticker else None,
+            )
+            for s in items
+        ],
+        total=len(items),
+        page=1,
+        page_size=page_size,
+    )
+
+
+async def _seed(session_factory, events: int) -> None:
+    rng = random.Random(0)
+    symbols = [f"S{i:04d}" for i in range(max(1, events // 5))]
+    async with session_factory() as session:
+        session.add_all(
+            Ticker(symbol=s, name=f"{s} Holdings Inc.", sic_description="Technology")
+            for s in symbols
+        )
+        session.add_all(
+            SurgeEvent(
+                symbol=rng.choice(symbols),
+                event_date=date(2020, 1, 1) + timedelta(days=i),
+                open=10.0,
+                high=14.0,
+                low=9.5,
+                close=13.0,
+                volume=rng.randint(1_000, 5_000_000),
+                prev_close=10.0,
+                change_pct=round(rng.uniform(20, 300), 2),
+                vwap=12.1,
+            )
+            for i in range(events)
+        )
+        await session.commit()
+
+
+async def _time(client: AsyncClient, url: str, params: dict, requests: int) -> float:
+    await client.get(url, params=params)  # warm-up
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+    return (time.perf_counter() - start) / requests
+
+
+async def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as scratch:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{scratch}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        await _seed(session_factory, args.events)
+
+        async def override_get_session():
+            async with session_factory() as session:
+                yield session
+
+        app = FastAPI()
+        app.include_router(surges.router)
+        app.add_api_route("/legacy", _legacy_list, response_model=SurgeListResponse)
+        app.dependency_overrides[get_session] = override_get_session
+
+        params = {"page_size": args.page_size}
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://bench"
+        ) as client:
+            legacy_items = (await client.get("/legacy", params=params)).json()["items"]
+            fast_items = (await client.get("/api/surges/", params=params)).json()[
+                "items"
+            ]
+            assert legacy_items == fast_items, "responses differ"
+
+            legacy_s = await _time(client, "/legacy", params, args.requests)
+            fast_s = await _time(client, "/api/surges/", params, args.requests)
+        await engine.dispose()
+
+    print(f"events={args.events} page_size={args.page_size} requests={args.requests}")
+    print(f"ORM + response_model : {legacy_s * 1000:8.3f} ms/request")
+    print(f"columns + to_json    : {fast_s * 1000:8.3f} ms/request")
+    print(f"speedup              : {legacy_s / fast_s:8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=5_000)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -1,26 +1,121 @@
 from collections.abc import AsyncGenerator
+from datetime import date
 
+import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.data_sources.base import StockDataSource
 from app.models.ticker import Base
+from app.services import surge_service
+from app.tasks import (
+    backfill,
+    daily_collection,
+    flat_file_import,
+    job_runner,
+    reevaluate,
+    ticker_sync,
+)
+
+# A grouped_daily response
+SAMPLE = [
+    {
+        "T": "AAPL",
+        "o": 150.0,
+        "h": 155.0,
+        "l": 149.0,
+        "c": 154.0,
+        "v": 1000000.0,
+        "vw": 152.1,
+        "t": 1736888400000,
+        "n": 1200,
+    },
+    {
+        "T": "GME",
+        "o": 10.0,
+        "h": 15.0,
+        "l": 9.0,
+        "c": 14.0,
+        "v": 500.0,
+        "t": 1736888400000,
+    },
+]
+
+
+class FakeSource(StockDataSource):
+    """Serves grouped_daily from ``days`` and records the dates asked for."""
+
+    def __init__(self, days: dict[date, list[dict]]) -> None:
+        self.days = days
+        self.calls: list[date] = []
+
+    async def grouped_daily(self, target_date):
+        self.calls.append(target_date)
+        return self.days.get(target_date, [])
+
+    async def ticker_details(self, symbol):
+        return None
+
+    async def search_tickers(self, query, limit=20):
+        return []
+
+    async def tickers_list(self, cursor=None):
+        return {"results": [], "next_cursor": None, "count": 0}
+
+    async def aggregate_bars(self, symbol, from_date, to_date):
+        return []
+
+
+def surge_row(symbol: str, event_date: date, change_pct: float = 25.0) -> dict:
+    """A surge_events row as the collection tasks insert it."""
+    return {
+        "symbol": symbol,
+        "event_date": event_date,
+        "open": 10.0,
+        "high": 13.0,
+        "low": 9.5,
+        "close": 12.5,
+        "volume": 1000,
+        "prev_close": 10.0,
+        "change_pct": change_pct,
+        "vwap": None,
+    }
 
 
 @pytest_asyncio.fixture
-async def db_engine():
+async def db_engine(monkeypatch):
     engine = create_async_engine(
         "sqlite+aiosqlite:///:memory:",
         connect_args={"check_same_thread": False},
     )
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # Cached totals are keyed on change counters, which restart at 0 in
+    # every fresh database, so each test gets an empty cache too
+    monkeypatch.setattr(surge_service, "count_cache", surge_service.CountCache())
     yield engine
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
     await engine.dispose()
 
 
+@pytest.fixture
+def session_factory(db_engine, monkeypatch):
+    """Session factory for the test database, also used by the background tasks."""
+    factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    for module in (
+        backfill,
+        daily_collection,
+        flat_file_import,
+        job_runner,
+        reevaluate,
+        ticker_sync,
+    ):
+        monkeypatch.setattr(module, "async_session", factory)
+    return factory
+
+
 @pytest_asyncio.fixture
 async def db_session(db_engine) -> AsyncGenerator[AsyncSession, None]:
     session_factory = async_sessionmaker(
@@ -17,3 +17,21 @@ async def test_health_check(client):
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_job_status_not_found(client):
+    response = await client.get("/api/admin/jobs/999")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_import_flat_files_rejects_outside_directory(client):
+    response = await client.post(
+        "/api/admin/import-flat-files", params={"directory": "../.."}
+    )
+    assert response.status_code == 400
+    response = await client.post(
+        "/api/admin/import-flat-files", params={"directory": "/"}
+    )
+    assert response.status_code == 400
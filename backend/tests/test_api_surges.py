@@ -1,5 +1,6 @@
+from datetime import date
+
 import pytest
-from datetime import date, datetime
 
 from app.models.surge_event import SurgeEvent
 from app.models.ticker import Ticker
@@ -96,3 +97,115 @@ async def test_today_surges(client):
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
+
+
+@pytest.mark.asyncio
+async def test_list_surges_keyset_pagination(client, db_session):
+    from app.services.surge_service import count_cache
+
+    db_session.add(Ticker(symbol="GME", name="GameStop Corp."))
+    # Tied change_pct values are ordered by id
+    for day, pct in enumerate([30.0, 50.0, 30.0, 40.0, 30.0], start=6):
+        db_session.add(
+            SurgeEvent(
+                symbol="GME",
+                event_date=date(2025, 1, day),
+                open=10.0,
+                high=15.0,
+                low=9.0,
+                close=14.0,
+                volume=1000,
+                prev_close=10.0,
+                change_pct=pct,
+            )
+        )
+    await db_session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"page_size": 2, **({"cursor": cursor} if cursor else {})}
+        data = (await client.get("/api/surges/", params=params)).json()
+        assert data["total"] == 5
+        seen += [(item["change_pct"], item["event_date"]) for item in data["items"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [
+        (50.0, "2025-01-07"),
+        (40.0, "2025-01-09"),
+        (30.0, "2025-01-10"),
+        (30.0, "2025-01-08"),
+        (30.0, "2025-01-06"),
+    ]
+    # Every page after the first reused the cached total
+    assert len(count_cache) == 1
+
+    response = await client.get("/api/surges/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_surges_streams_all_formats(client, db_session, monkeypatch):
+    import csv
+    import io
+    import json
+
+    from app.models.surge_tracking import SurgeTracking
+    from app.services import export_service
+
+    # Small batches so the export spans several cursor fetches
+    monkeypatch.setattr(export_service, "EXPORT_BATCH_SIZE", 2)
+
+    db_session.add(
+        Ticker(symbol="GME", name="GameStop Corp.", sic_description="Retail")
+    )
+    events = [
+        SurgeEvent(
+            symbol="GME",
+            event_date=date(2025, 1, day),
+            open=10.0,
+            high=15.0,
+            low=9.0,
+            close=14.0,
+            volume=1000,
+            prev_close=10.0,
+            change_pct=pct,
+        )
+        for day, pct in [(6, 30.0), (7, 50.0), (8, 20.0)]
+    ]
+    db_session.add_all(events)
+    await db_session.flush()
+    db_session.add(
+        SurgeTracking(
+            surge_event_id=events[0].id,
+            days_after=1,
+            close_price=15.0,
+            change_from_surge_pct=7.14,
+            tracked_date=date(2025, 1, 7),
+        )
+    )
+    await db_session.commit()
+
+    response = await client.get("/api/surges/export", params={"min_pct": 25})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(r["event_date"], r["change_1d"]) for r in rows] == [
+        ("2025-01-06", "7.14"),
+        ("2025-01-07", ""),
+    ]
+
+    response = await client.get("/api/surges/export", params={"format": "ndjson"})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["change_pct"] for line in lines] == [30.0, 50.0, 20.0]
+    assert lines[0]["ticker_name"] == "GameStop Corp."
+
+    response = await client.get("/api/surges/export", params={"format": "columnar"})
+    batches = [json.loads(line) for line in response.text.splitlines()]
+    assert [b["rows"] for b in batches] == [2, 1]
+    assert batches[0]["columns"]["change_1d"] == [7.14, None]
+
+    response = await client.get("/api/surges/export", params={"format": "xml"})
+    assert response.status_code == 422
@@ -0,0 +1,212 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.data_sources.bar_store import BarStore, StoredBarSource
+from app.models.collected_date import CollectedDate
+from app.models.collection_log import CollectionLog
+from app.models.surge_event import SurgeEvent
+from app.tasks import backfill, daily_collection
+from app.tasks.job_runner import INSTANCE_ID, JobRunner
+from tests.conftest import FakeSource
+
+# 2025-01-13 (Mon) .. 2025-01-17 (Fri); every day AAA gains 25%
+DAYS = {
+    date(2025, 1, 10 + offset): [
+        {"T": "AAA", "c": 10.0 * 1.25**offset},
+        {"T": "BBB", "c": 5.0},
+    ]
+    for offset in range(8)
+}
+
+
+class FlakySource(FakeSource):
+    def __init__(self, days, fail_on: date | None = None) -> None:
+        super().__init__(days)
+        self.fail_on = fail_on
+
+    async def grouped_daily(self, target_date):
+        if target_date == self.fail_on:
+            raise RuntimeError("connection reset")
+        return await super().grouped_daily(target_date)
+
+
+@pytest.mark.asyncio
+async def test_backfill_resumes_after_failure(session_factory, tmp_path, monkeypatch):
+    store = BarStore(str(tmp_path))
+    inner = FlakySource(DAYS, fail_on=date(2025, 1, 16))
+    market_data = StoredBarSource(inner, store)
+    monkeypatch.setattr(daily_collection, "market_data", market_data)
+    monkeypatch.setattr(backfill, "market_data", market_data)
+
+    with pytest.raises(RuntimeError):
+        await backfill.run_backfill(date(2025, 1, 13), date(2025, 1, 17))
+
+    async with session_factory() as session:
+        log = (await session.execute(select(CollectionLog))).scalar_one()
+        assert log.status == "failed"
+        assert log.details["dates_done"] == 3
+        done = (await session.execute(select(CollectedDate.trade_date))).scalars().all()
+        assert sorted(done) == [date(2025, 1, 13), date(2025, 1, 14), date(2025, 1, 15)]
+
+    inner.fail_on = None
+    inner.calls.clear()
+    log_id = await backfill.run_backfill(
+        date(2025, 1, 13), date(2025, 1, 17), log_id=log.id
+    )
+    assert log_id == log.id
+    # Completed dates are not fetched again
+    assert inner.calls == [date(2025, 1, 16), date(2025, 1, 17)]
+
+    async with session_factory() as session:
+        log = await session.get(CollectionLog, log_id)
+        assert log.status == "completed"
+        assert log.records_count == 5
+        assert log.details["dates_done"] == 5
+        events = await session.execute(select(func.count(SurgeEvent.id)))
+        assert events.scalar() == 5
+
+
+@pytest.mark.asyncio
+async def test_backfill_pipeline_fetches_each_day_once(
+    session_factory, tmp_path, monkeypatch
+):
+    inner = FakeSource(DAYS)
+    market_data = StoredBarSource(inner, BarStore(str(tmp_path)))
+    monkeypatch.setattr(daily_collection, "market_data", market_data)
+    monkeypatch.setattr(backfill, "market_data", market_data)
+
+    log_id = await backfill.run_backfill(date(2025, 1, 13), date(2025, 1, 17))
+    # Each fetched day is reused as the next day's previous session
+    assert inner.calls == [
+        date(2025, 1, 13),
+        date(2025, 1, 10),
+        date(2025, 1, 14),
+        date(2025, 1, 15),
+        date(2025, 1, 16),
+        date(2025, 1, 17),
+    ]
+
+    async with session_factory() as session:
+        log = await session.get(CollectionLog, log_id)
+        stages = log.details["pipeline"]
+        assert [stages[name]["items"] for name in ("fetch", "detect", "write")] == [
+            5
+        ] * 3
+        assert stages["detect"]["queue_size"] == backfill.FETCH_AHEAD
+        assert log.details["api_calls"] == 6
+
+
+@pytest.mark.asyncio
+async def test_backfill_writer_failure_stops_pipeline(
+    session_factory, tmp_path, monkeypatch
+):
+    market_data = StoredBarSource(FakeSource(DAYS), BarStore(str(tmp_path)))
+    monkeypatch.setattr(daily_collection, "market_data", market_data)
+    monkeypatch.setattr(backfill, "market_data", market_data)
+    monkeypatch.setattr(backfill, "FETCH_AHEAD", 1)
+    monkeypatch.setattr(backfill, "WRITE_QUEUE_SIZE", 1)
+
+    async def broken_insert(session, rows):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(backfill, "_insert_surge_events", broken_insert)
+    with pytest.raises(RuntimeError, match="disk full"):
+        await asyncio.wait_for(
+            backfill.run_backfill(date(2025, 1, 13), date(2025, 1, 17)), timeout=5
+        )
+
+    async with session_factory() as session:
+        log = (await session.execute(select(CollectionLog))).scalar_one()
+        assert log.status == "failed"
+        done = await session.execute(select(func.count()).select_from(CollectedDate))
+        assert done.scalar() == 0
+
+
+@pytest.mark.asyncio
+async def test_resume_only_takes_over_orphaned_logs(session_factory, monkeypatch):
+    submitted: list[int] = []
+
+    async def submit(job_type, func, *args, log_id=None, **kwargs):
+        submitted.append(log_id)
+        return log_id
+
+    monkeypatch.setattr(backfill.job_runner, "submit", submit)
+    monkeypatch.setattr(backfill, "STALE_AFTER_SECONDS", 0)
+    now = datetime.utcnow()
+    dates = {"from_date": "2025-01-13", "to_date": "2025-01-17"}
+    logs = {
+        "live": CollectionLog(
+            job_type="backfill",
+            status="running",
+            details=dates,
+            owner="other-host:1:a",
+            heartbeat_at=now,
+        ),
+        "crashed": CollectionLog(
+            job_type="backfill",
+            status="running",
+            details=dates,
+            owner="other-host:2:b",
+            heartbeat_at=now - timedelta(hours=1),
+        ),
+        "released": CollectionLog(
+            job_type="ticker_sync", status="queued", owner=None, heartbeat_at=now
+        ),
+    }
+    async with session_factory() as session:
+        session.add_all(logs.values())
+        await session.commit()
+
+    await backfill.resume_interrupted_backfills()
+
+    assert submitted == [logs["crashed"].id]
+    async with session_factory() as session:
+        live = await session.get(CollectionLog, logs["live"].id)
+        assert (live.status, live.owner) == ("running", "other-host:1:a")
+        crashed = await session.get(CollectionLog, logs["crashed"].id)
+        assert crashed.owner == INSTANCE_ID
+        released = await session.get(CollectionLog, logs["released"].id)
+        assert released.status == "failed"
+
+
+@pytest.mark.asyncio
+async def test_resume_backfill_that_crashed_while_queued(session_factory, monkeypatch):
+    runner = JobRunner(max_workers=0)  # the job never gets a worker
+    log_id = await runner.submit(
+        "backfill",
+        backfill.run_backfill,
+        date(2025, 1, 13),
+        date(2025, 1, 17),
+        details=backfill.backfill_details(date(2025, 1, 13), date(2025, 1, 17)),
+    )
+
+    # Crash: the task dies with the process, its log still queued and owned
+    runner._shutting_down = True
+    tasks = [*runner._tasks.values(), runner._heartbeat]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    async with session_factory() as session:
+        await session.execute(
+            update(CollectionLog)
+            .where(CollectionLog.id == log_id)
+            .values(
+                owner="crashed-host:1:a",
+                heartbeat_at=datetime.utcnow() - timedelta(hours=1),
+            )
+        )
+        await session.commit()
+
+    submitted = []
+
+    async def submit(job_type, func, *args, log_id=None, **kwargs):
+        submitted.append((log_id, args))
+        return log_id
+
+    monkeypatch.setattr(backfill.job_runner, "submit", submit)
+    await backfill.resume_interrupted_backfills()
+
+    assert submitted == [(log_id, (date(2025, 1, 13), date(2025, 1, 17)))]
@@ -0,0 +1,49 @@
+from datetime import date
+
+import pytest
+
+from app.data_sources.bar_store import BarStore, DayBars, StoredBarSource
+from tests.conftest import SAMPLE, FakeSource
+
+
+def test_day_bars_roundtrip():
+    bars = DayBars.decode(DayBars.from_results(SAMPLE).encode())
+    assert bars.to_results() == SAMPLE
+
+
+def test_bar_store_save_and_load(tmp_path):
+    store = BarStore(str(tmp_path))
+    assert store.load(date(2025, 1, 15)) is None
+
+    store.save(date(2025, 1, 15), DayBars.from_results(SAMPLE))
+    store.save(date(2025, 1, 20), DayBars())
+
+    assert store.load(date(2025, 1, 15)).to_results() == SAMPLE
+    assert len(store.load(date(2025, 1, 20))) == 0
+    assert store.stored_dates() == [date(2025, 1, 15), date(2025, 1, 20)]
+
+
+def test_bar_store_latest_session_is_scanned_once(tmp_path, monkeypatch):
+    store = BarStore(str(tmp_path))
+    store.save(date(2025, 1, 15), DayBars.from_results(SAMPLE))
+    store.save(date(2025, 1, 20), DayBars())  # holiday marker
+    assert store.latest_session() == date(2025, 1, 15)
+
+    monkeypatch.setattr(store, "stored_dates", lambda: pytest.fail("rescanned"))
+    store.save(date(2025, 1, 21), DayBars.from_results(SAMPLE))
+    store.save(date(2025, 1, 17), DayBars.from_results(SAMPLE))
+    assert store.latest_session() == date(2025, 1, 21)
+
+
+@pytest.mark.asyncio
+async def test_stored_source_fetches_each_date_once(tmp_path):
+    inner = FakeSource({date(2025, 1, 15): SAMPLE})
+    source = StoredBarSource(inner, BarStore(str(tmp_path)))
+
+    assert await source.grouped_daily(date(2025, 1, 15)) == SAMPLE
+    assert await source.grouped_daily(date(2025, 1, 15)) == SAMPLE
+    # Past empty day (holiday) is remembered as well
+    assert await source.grouped_daily(date(2025, 1, 20)) == []
+    assert await source.grouped_daily(date(2025, 1, 20)) == []
+
+    assert inner.calls == [date(2025, 1, 15), date(2025, 1, 20)]
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from app import config
+from app.config import Settings, resolve_data_path, resolve_database_url
+
+
+def test_data_paths_default_to_project_root(monkeypatch):
+    monkeypatch.setattr(config.settings, "DATA_ROOT", "")
+    assert resolve_data_path("data/bars") == os.path.join(
+        config.PROJECT_ROOT, "data/bars"
+    )
+    assert resolve_data_path("/srv/bars") == "/srv/bars"
+
+
+def test_container_layout_shares_one_data_root(monkeypatch):
+    # In the image config.py is /app/app/config.py, so PROJECT_ROOT is "/";
+    # the ./data volume is mounted at /app/data
+    monkeypatch.setattr(config, "PROJECT_ROOT", "/")
+    monkeypatch.setattr(config.settings, "DATA_ROOT", "/app")
+
+    assert resolve_data_path("data/bars") == "/app/data/bars"
+    assert resolve_data_path("data/rate_limit.db") == "/app/data/rate_limit.db"
+    assert (
+        resolve_database_url("sqlite:///data/stocks.db")
+        == "sqlite+aiosqlite:////app/data/stocks.db"
+    )
+    assert (
+        resolve_database_url("sqlite+aiosqlite:///data/stocks.db")
+        == "sqlite+aiosqlite:////app/data/stocks.db"
+    )
+    assert resolve_database_url("sqlite+aiosqlite:///:memory:") == (
+        "sqlite+aiosqlite:///:memory:"
+    )
+
+
+def test_offline_sources_get_their_own_data(monkeypatch):
+    monkeypatch.delenv("BAR_STORE_DIR", raising=False)
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+
+    live = Settings(_env_file=None)
+    assert live.BAR_STORE_DIR == "data/bars"
+
+    synthetic = Settings(_env_file=None, DATA_SOURCE="synthetic")
+    assert synthetic.BAR_STORE_DIR == "data/synthetic/bars"
+    assert synthetic.DATABASE_URL == "sqlite+aiosqlite:///data/synthetic/stocks.db"
+
+    custom = Settings(
+        _env_file=None, DATA_SOURCE="replay", BAR_STORE_DIR="/tmp/replay-bars"
+    )
+    assert custom.BAR_STORE_DIR == "/tmp/replay-bars"
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"BAR_STORE_DIR": "data/bars/"},
+        {"DATABASE_URL": "sqlite:///data/stocks.db"},
+    ],
+)
+def test_offline_sources_refuse_live_data(monkeypatch, overrides):
+    monkeypatch.delenv("BAR_STORE_DIR", raising=False)
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    with pytest.raises(ValueError, match="live data location"):
+        Settings(_env_file=None, DATA_SOURCE="record", **overrides)
@@ -0,0 +1,135 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.data_sources.bar_store import BarStore, DayBars, StoredBarSource
+from app.models.collected_date import CollectedDate
+from app.models.surge_event import SurgeEvent
+from app.models.surge_rollup import SurgeRollup
+from app.models.surge_tracking import SurgeTracking
+from app.models.ticker import Ticker
+from app.services import rollup_service
+from app.tasks import daily_collection
+from app.tasks.daily_collection import _insert_surge_events
+from tests.conftest import FakeSource, surge_row
+
+
+@pytest.mark.asyncio
+async def test_insert_surge_events_is_idempotent(db_session):
+    db_session.add(Ticker(symbol="AAPL", name="Apple Inc."))
+    await db_session.flush()
+
+    rows = [surge_row("AAPL", date(2025, 1, 15)), surge_row("NEWCO", date(2025, 1, 15))]
+    assert await _insert_surge_events(db_session, rows) == 2
+    assert await _insert_surge_events(db_session, rows) == 0
+    assert (
+        await _insert_surge_events(
+            db_session, rows + [surge_row("AAPL", date(2025, 1, 16))]
+        )
+        == 1
+    )
+    await db_session.commit()
+
+    event_count = await db_session.execute(select(func.count(SurgeEvent.id)))
+    assert event_count.scalar() == 3
+
+    tickers = await db_session.execute(select(Ticker).order_by(Ticker.symbol))
+    assert [(t.symbol, t.name) for t in tickers.scalars()] == [
+        ("AAPL", "Apple Inc."),
+        ("NEWCO", None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_update_tracking_uses_stored_snapshot(db_session, tmp_path, monkeypatch):
+    class NoNetwork(StoredBarSource):
+        async def aggregate_bars(self, symbol, from_date, to_date):
+            raise AssertionError("tracking must not call the API")
+
+    store = BarStore(str(tmp_path))
+    store.save(
+        date(2025, 1, 16),
+        DayBars.from_results([{"T": "AAPL", "c": 15.0}, {"T": "NEWCO", "c": 10.0}]),
+    )
+    monkeypatch.setattr(daily_collection, "market_data", NoNetwork(None, store))
+
+    await _insert_surge_events(
+        db_session,
+        [surge_row("AAPL", date(2025, 1, 15)), surge_row("NEWCO", date(2025, 1, 13))],
+    )
+    assert await daily_collection._update_tracking(db_session, date(2025, 1, 16)) == 2
+    assert await daily_collection._update_tracking(db_session, date(2025, 1, 16)) == 0
+    await db_session.commit()
+
+    result = await db_session.execute(
+        select(SurgeTracking.days_after, SurgeTracking.change_from_surge_pct).order_by(
+            SurgeTracking.days_after
+        )
+    )
+    assert result.all() == [(1, 20.0), (3, -20.0)]
+
+
+@pytest.mark.asyncio
+async def test_update_tracking_skips_rows_tracked_concurrently(db_session):
+    await _insert_surge_events(
+        db_session,
+        [surge_row("AAPL", date(2025, 1, 15)), surge_row("NEWCO", date(2025, 1, 13))],
+    )
+    aapl_id = (
+        await db_session.execute(
+            select(SurgeEvent.id).where(SurgeEvent.symbol == "AAPL")
+        )
+    ).scalar_one()
+    current = DayBars.from_results(
+        [{"T": "AAPL", "c": 15.0}, {"T": "NEWCO", "c": 10.0}]
+    )
+
+    execute = db_session.execute
+
+    async def racing_execute(statement, *args, **kwargs):
+        if getattr(statement, "table", None) is SurgeTracking.__table__:
+            # Another job tracks AAPL between the pending query and the insert
+            await execute(
+                insert(SurgeTracking).values(
+                    surge_event_id=aapl_id,
+                    days_after=1,
+                    close_price=15.0,
+                    change_from_surge_pct=20.0,
+                    tracked_date=date(2025, 1, 16),
+                )
+            )
+        return await execute(statement, *args, **kwargs)
+
+    db_session.execute = racing_execute
+    tracked = await daily_collection._update_tracking(
+        db_session, date(2025, 1, 16), current
+    )
+    db_session.execute = execute
+    assert tracked == 1
+
+    rollups = await db_session.execute(
+        select(SurgeRollup.key, SurgeRollup.count).where(
+            SurgeRollup.dimension == rollup_service.HORIZON
+        )
+    )
+    # Only the row this call inserted is rolled up; the other job rolls up its own
+    assert rollups.all() == [("3", 1)]
+
+
+@pytest.mark.asyncio
+async def test_daily_collection_without_previous_session_is_not_checkpointed(
+    session_factory, tmp_path, monkeypatch
+):
+    day = date(2025, 1, 15)
+    store = BarStore(str(tmp_path))
+    store.save(day, DayBars.from_results([{"T": "AAA", "c": 12.5}]))
+    # Every earlier session comes back empty
+    monkeypatch.setattr(
+        daily_collection, "market_data", StoredBarSource(FakeSource({}), store)
+    )
+
+    await daily_collection.run_daily_collection(day)
+
+    async with session_factory() as session:
+        assert (await session.scalar(select(func.count(CollectedDate.trade_date)))) == 0
@@ -0,0 +1,108 @@
+import gzip
+import math
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app.data_sources.bar_store import BarStore, DayBars, StoredBarSource
+from app.data_sources.flat_files import (
+    find_flat_files,
+    import_flat_file,
+    read_flat_file,
+)
+from app.models.collected_date import CollectedDate
+from app.models.collection_log import CollectionLog
+from app.models.surge_event import SurgeEvent
+from app.models.surge_tracking import SurgeTracking
+from app.tasks import backfill, daily_collection, flat_file_import
+from tests.conftest import FakeSource
+
+HEADER = "ticker,volume,open,close,high,low,window_start,transactions\n"
+
+
+class OfflineSource(FakeSource):
+    async def grouped_daily(self, target_date):
+        raise AssertionError(f"API called for {target_date}")
+
+
+def _write_day(directory, day: date, rows: list[str]) -> None:
+    path = directory / f"{day:%Y}" / f"{day:%m}" / f"{day.isoformat()}.csv.gz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wt") as f:
+        f.write(HEADER + "".join(f"{row}\n" for row in rows))
+
+
+def test_read_flat_file(tmp_path):
+    _write_day(
+        tmp_path,
+        date(2025, 1, 13),
+        [
+            "AAA,1500,10.0,12.5,13.0,9.5,1736744400000000000,42",
+            "BBB,,5.0,5.1,5.2,4.9,1736744400000000000,",
+        ],
+    )
+    [(day, path)] = find_flat_files(str(tmp_path))
+    assert day == date(2025, 1, 13)
+
+    bars = read_flat_file(path)
+    assert bars.symbols == ["AAA", "BBB"]
+    assert list(bars.columns["c"]) == [12.5, 5.1]
+    assert bars.columns["t"][0] == 1736744400000  # ns -> ms
+    assert math.isnan(bars.columns["v"][1])
+    assert all(math.isnan(v) for v in bars.columns["vw"])
+    assert bars.to_results()[0]["n"] == 42
+
+
+def test_import_flat_file_keeps_stored_day(tmp_path):
+    day = date(2025, 1, 13)
+    store = BarStore(str(tmp_path / "bars"))
+    store.save(day, DayBars.from_results([{"T": "AAA", "c": 12.0, "vw": 11.8}]))
+    _write_day(tmp_path / "flat", day, ["AAA,1500,10.0,12.5,13.0,9.5,0,42"])
+    [(_, path)] = find_flat_files(str(tmp_path / "flat"))
+
+    assert import_flat_file(path, store.root) == (day, None)
+    assert store.load(day).to_results()[0]["vw"] == 11.8
+
+
+@pytest.mark.asyncio
+async def test_flat_file_import_collects_without_api(
+    session_factory, tmp_path, monkeypatch
+):
+    market_data = StoredBarSource(OfflineSource({}), BarStore(str(tmp_path / "bars")))
+    for module in (backfill, daily_collection, flat_file_import):
+        monkeypatch.setattr(module, "market_data", market_data)
+
+    files = tmp_path / "flat"
+    # 2025-01-13 (Mon) .. 2025-01-17 (Fri); AAA gains 25% a day
+    for offset in range(5):
+        _write_day(
+            files,
+            date(2025, 1, 13 + offset),
+            [
+                f"AAA,1000,1.0,{10.0 * 1.25**offset},20.0,1.0,0,1",
+                "BBB,1000,5,5,5,5,0,1",
+            ],
+        )
+
+    log_id = await flat_file_import.run_flat_file_import(str(files), workers=2)
+
+    async with session_factory() as session:
+        log = await session.get(CollectionLog, log_id)
+        assert log.status == "completed"
+        assert log.records_count == 4
+        assert log.details["files_done"] == 5
+        assert log.details["rows"] == 10
+        events = await session.execute(
+            select(SurgeEvent.event_date).order_by(SurgeEvent.event_date)
+        )
+        assert events.scalars().all() == [date(2025, 1, 14 + i) for i in range(4)]
+        tracked = await session.execute(
+            select(func.count(SurgeTracking.id)).where(SurgeTracking.days_after == 1)
+        )
+        assert tracked.scalar() == 3
+        # The first file has no previous session, so it is left pending
+        collected = await session.execute(
+            select(CollectedDate.trade_date).order_by(CollectedDate.trade_date)
+        )
+        assert collected.scalars().all() == [date(2025, 1, 14 + i) for i in range(4)]
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from app.models.collection_log import CollectionLog
+from app.tasks.job_runner import INSTANCE_ID, JobRunner, start_collection_log
+
+
+@pytest.mark.asyncio
+async def test_api_jobs_run_one_at_a_time_per_type(session_factory):
+    runner = JobRunner(max_workers=4)
+    running = 0
+    peak = 0
+    collected = asyncio.Event()
+
+    async def job(job_type: str, log_id: int) -> None:
+        nonlocal running, peak
+        async with session_factory() as session:
+            log = await start_collection_log(session, job_type, log_id)
+            if job_type == "daily_collection":
+                collected.set()
+            else:
+                running += 1
+                peak = max(peak, running)
+                # Only finishes if the collection is not queued behind it
+                await asyncio.wait_for(collected.wait(), timeout=5)
+                running -= 1
+            log.status = "completed"
+            await session.commit()
+
+    ids = [await runner.submit("backfill", job, "backfill") for _ in range(3)]
+    ids.append(await runner.submit("daily_collection", job, "daily_collection"))
+    async with session_factory() as session:
+        assert (await session.get(CollectionLog, ids[2])).status == "queued"
+
+    while any(runner.is_active(job_id) for job_id in ids):
+        await asyncio.sleep(0.01)
+    assert peak == 1
+
+    async with session_factory() as session:
+        for job_id in ids:
+            assert (await session.get(CollectionLog, job_id)).status == "completed"
+
+
+@pytest.mark.asyncio
+async def test_cancel_job(session_factory):
+    runner = JobRunner()
+    started = asyncio.Event()
+
+    async def job(log_id: int) -> None:
+        started.set()
+        await asyncio.sleep(60)
+
+    job_id = await runner.submit("test", job)
+    await started.wait()
+    assert runner.cancel(job_id)
+    while runner.is_active(job_id):
+        await asyncio.sleep(0.01)
+    assert not runner.cancel(job_id)
+
+    async with session_factory() as session:
+        assert (await session.get(CollectionLog, job_id)).status == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_and_release_on_shutdown(session_factory):
+    runner = JobRunner()
+    started = asyncio.Event()
+
+    async def job(log_id: int) -> None:
+        async with session_factory() as session:
+            await start_collection_log(session, "test", log_id)
+        started.set()
+        await asyncio.sleep(60)
+
+    job_id = await runner.submit("test", job)
+    await started.wait()
+    async with session_factory() as session:
+        first = (await session.get(CollectionLog, job_id)).heartbeat_at
+    await asyncio.sleep(0.01)
+    await runner._touch()  # what the heartbeat task does every 30s
+    async with session_factory() as session:
+        log = await session.get(CollectionLog, job_id)
+        assert log.owner == INSTANCE_ID
+        assert log.heartbeat_at > first
+
+    await runner.shutdown()
+    async with session_factory() as session:
+        log = await session.get(CollectionLog, job_id)
+        # Still running, but released for the next startup to resume
+        assert log.status == "running"
+        assert log.owner is None
@@ -0,0 +1,47 @@
+import pytest
+
+from app.utils.metrics import Registry
+
+
+def test_render_prometheus_text():
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests", ("endpoint",))
+    latency = registry.histogram(
+        "latency_seconds", "Latency", ("endpoint",), buckets=(0.1, 1.0)
+    )
+    registry.gauge("queue_depth", "Depth", ("lane",), collect=lambda: {("batch",): 3})
+
+    requests.inc("grouped_daily")
+    requests.inc("grouped_daily")
+    latency.observe(0.05, "grouped_daily")
+    latency.observe(0.1, "grouped_daily")  # bounds are inclusive
+    latency.observe(2.5, "grouped_daily")
+    # Registering the same name again returns the existing metric
+    assert registry.counter("requests_total", "Requests", ("endpoint",)) is requests
+
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'requests_total{endpoint="grouped_daily"} 2' in lines
+    assert 'queue_depth{lane="batch"} 3' in lines
+    assert 'latency_seconds_bucket{endpoint="grouped_daily",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{endpoint="grouped_daily",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{endpoint="grouped_daily",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{endpoint="grouped_daily"} 2.65' in lines
+    assert 'latency_seconds_count{endpoint="grouped_daily"} 3' in lines
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client):
+    await client.get("/api/surges/", params={"page_size": 5})
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    body = response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/surges/",'
+        'status="200"}'
+    ) in body
+    assert 'rate_limiter_queue_depth{lane="interactive"} 0' in body
+    assert "# TYPE db_statement_duration_seconds histogram" in body
+    assert "# TYPE job_stage_duration_seconds histogram" in body
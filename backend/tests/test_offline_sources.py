@@ -0,0 +1,71 @@
+from datetime import date
+
+import pytest
+
+from app.data_sources.bar_store import BarStore, DayBars, StoredBarSource
+from app.data_sources.cassette import Cassette, RecordingSource, ReplaySource
+from app.data_sources.synthetic import SyntheticMarketSource
+from app.tasks.surge_detection import detect_surges
+from tests.conftest import SAMPLE, FakeSource
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay(tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    recorder = RecordingSource(FakeSource({date(2025, 1, 15): SAMPLE}), Cassette(path))
+    await recorder.grouped_daily(date(2025, 1, 15))
+    await recorder.ticker_details("AAPL")
+    await recorder.tickers_list()
+
+    replay = ReplaySource(Cassette(path))
+    assert await replay.grouped_daily(date(2025, 1, 15)) == SAMPLE
+    assert await replay.ticker_details("AAPL") is None
+    assert (await replay.tickers_list())["results"] == []
+    with pytest.raises(LookupError):
+        await replay.grouped_daily(date(2025, 1, 16))
+
+
+@pytest.mark.asyncio
+async def test_recording_refetches_stored_dates(tmp_path):
+    day = date(2025, 1, 15)
+    store = BarStore(str(tmp_path / "bars"))
+    store.save(day, DayBars.from_results(SAMPLE))
+    cassette = Cassette(str(tmp_path / "cassette.jsonl.gz"))
+    source = StoredBarSource(
+        RecordingSource(FakeSource({day: SAMPLE}), cassette), store, refetch=True
+    )
+
+    await source.grouped_daily(day)
+    await source.grouped_daily(day)
+
+    assert source.fetch_count == 1  # once per process, then from the store
+    assert len(cassette) == 1
+
+
+@pytest.mark.asyncio
+async def test_synthetic_market_is_deterministic():
+    a = SyntheticMarketSource(symbol_count=500, seed=7)
+    b = SyntheticMarketSource(symbol_count=500, seed=7)
+    day = date(2025, 1, 15)
+
+    bars = await a.grouped_daily(day)
+    assert bars == await b.grouped_daily(day)
+    assert 450 < len(bars) < 500  # a few symbols skip the session
+    assert all(bar["l"] <= min(bar["o"], bar["c"]) for bar in bars)
+    assert await a.grouped_daily(date(2025, 1, 18)) == []  # Saturday
+
+
+@pytest.mark.asyncio
+async def test_synthetic_market_produces_surges():
+    source = SyntheticMarketSource(symbol_count=2000, seed=1, surge_rate=0.01)
+    previous = await source.grouped_daily(date(2025, 1, 14))
+    current = await source.grouped_daily(date(2025, 1, 15))
+    surges = detect_surges(
+        DayBars.from_results(current), DayBars.from_results(previous), 20.0
+    )
+    assert 5 <= len(surges) <= 60
+
+    chart = await source.aggregate_bars(
+        current[0]["T"], date(2025, 1, 13), date(2025, 1, 17)
+    )
+    assert 3 <= len(chart) <= 5
@@ -0,0 +1,59 @@
+import asyncio
+from datetime import date
+
+import httpx
+import pytest
+
+from app.data_sources.polygon_client import PolygonFreeSource
+from app.utils.rate_limiter import RateLimiter
+
+
+def _source(handler) -> PolygonFreeSource:
+    source = PolygonFreeSource()
+    source._rate_limiter = RateLimiter(max_tokens=100, refill_rate=100.0)
+    source._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return source
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_are_coalesced():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"results": [{"c": 1.0, "t": 0}]})
+
+    source = _source(handler)
+    results = await asyncio.gather(
+        *(
+            source.aggregate_bars("AAPL", date(2025, 1, 1), date(2025, 1, 31))
+            for _ in range(5)
+        ),
+        source.aggregate_bars("MSFT", date(2025, 1, 1), date(2025, 1, 31)),
+    )
+
+    assert all(r == [{"c": 1.0, "t": 0}] for r in results)
+    assert len(calls) == 2
+    assert source.stats() == {"requests": 2, "coalesced": 4, "in_flight": 0}
+
+    # Once finished, the same request goes to the API again
+    await source.aggregate_bars("AAPL", date(2025, 1, 1), date(2025, 1, 31))
+    assert len(calls) == 3
+    await source.close()
+
+
+@pytest.mark.asyncio
+async def test_coalesced_callers_share_errors():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        return httpx.Response(500)
+
+    source = _source(handler)
+    results = await asyncio.gather(
+        *(source.grouped_daily(date(2025, 1, 15)) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, httpx.HTTPStatusError) for r in results)
+    assert source.stats()["requests"] == 1
+    await source.close()
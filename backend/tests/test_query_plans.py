@@ -0,0 +1,107 @@
+"""EXPLAIN QUERY PLAN regression tests for the hot query shapes.
+
+Every hot query must seek through an index (SEARCH). Only whole-table
+aggregates may scan, and then only a covering index. Anything else reads
+every row and degrades linearly with table size.
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import and_, exists, func, or_, select
+from sqlalchemy.dialects import sqlite
+
+from app.database import _migrate
+from app.models.surge_event import SurgeEvent
+from app.models.surge_tracking import SurgeTracking
+from app.models.ticker import Ticker
+
+DAY = date(2025, 1, 15)
+
+
+def _hot_queries():
+    keyset = or_(SurgeEvent.change_pct < 30.0, SurgeEvent.id < 100)
+    return {
+        "today_surges": select(SurgeEvent)
+        .where(SurgeEvent.event_date == DAY)
+        .order_by(SurgeEvent.change_pct.desc()),
+        "date_range_page": select(SurgeEvent)
+        .where(SurgeEvent.event_date.between(date(2025, 1, 1), DAY))
+        .order_by(SurgeEvent.change_pct.desc(), SurgeEvent.id.desc())
+        .limit(50),
+        "keyset_page": select(SurgeEvent)
+        .where(SurgeEvent.change_pct <= 30.0, keyset)
+        .order_by(SurgeEvent.change_pct.desc(), SurgeEvent.id.desc())
+        .limit(50),
+        "min_pct_count": select(func.count(SurgeEvent.id)).where(
+            SurgeEvent.change_pct >= 50.0
+        ),
+        "sector_count": select(func.count(SurgeEvent.id))
+        .join(Ticker)
+        .where(Ticker.sic_description == "Retail"),
+        "dedupe_lookup": select(SurgeEvent.id).where(
+            SurgeEvent.symbol == "GME", SurgeEvent.event_date == DAY
+        ),
+        "symbol_history": select(SurgeEvent)
+        .where(SurgeEvent.symbol == "GME")
+        .order_by(SurgeEvent.event_date.desc()),
+        "tracking_pending": select(SurgeEvent.id, SurgeEvent.symbol).where(
+            or_(
+                *(
+                    and_(
+                        SurgeEvent.event_date == date(2025, 1, day),
+                        ~exists().where(
+                            SurgeTracking.surge_event_id == SurgeEvent.id,
+                            SurgeTracking.days_after == days,
+                        ),
+                    )
+                    for day, days in [(14, 1), (10, 3)]
+                )
+            )
+        ),
+        "tracking_performance": select(
+            SurgeTracking.days_after,
+            func.avg(SurgeTracking.change_from_surge_pct),
+            func.count(SurgeTracking.id),
+        ).group_by(SurgeTracking.days_after),
+        "tracking_quantiles": select(
+            SurgeTracking.days_after, SurgeTracking.change_from_surge_pct
+        ).order_by(SurgeTracking.days_after, SurgeTracking.change_from_surge_pct),
+    }
+
+
+def _full_scans(plan: list[str]) -> list[str]:
+    return [
+        step
+        for step in plan
+        if step.startswith("SCAN") and "COVERING INDEX" not in step
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", list(_hot_queries()))
+async def test_hot_query_uses_an_index(db_engine, name):
+    sql = _hot_queries()[name].compile(
+        dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    async with db_engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+        plan = [row[3] for row in result.all()]
+    assert not _full_scans(plan), f"{name} plan: {plan}"
+
+
+@pytest.mark.asyncio
+async def test_migrate_replaces_superseded_indexes(db_engine):
+    async with db_engine.begin() as conn:
+        await conn.exec_driver_sql("DROP INDEX uq_surge_tracking_event_days")
+        await conn.exec_driver_sql(
+            "CREATE INDEX ix_surge_tracking_surge_event_id ON surge_tracking (surge_event_id)"
+        )
+        await conn.run_sync(_migrate)
+        result = await conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE tbl_name = 'surge_tracking' "
+            "AND type = 'index'"
+        )
+        names = {row[0] for row in result.all()}
+    assert "uq_surge_tracking_event_days" in names
+    assert "ix_surge_tracking_surge_event_id" not in names
@@ -1,9 +1,16 @@
 import asyncio
+import sqlite3
 import time
 
 import pytest
 
-from app.utils.rate_limiter import RateLimiter
+from app.utils.rate_limiter import (
+    BATCH,
+    INTERACTIVE,
+    RateLimiter,
+    SqliteTokenBucket,
+    TokenBucket,
+)
 
 
 @pytest.mark.asyncio
@@ -35,3 +42,85 @@ async def test_rate_limiter_refill():
     # Should refill quickly
     await asyncio.sleep(0.01)
     await limiter.acquire()  # Should succeed after refill
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_interactive_preempts_batch():
+    limiter = RateLimiter(max_tokens=1, refill_rate=50.0)
+    await limiter.acquire()
+    order: list[str] = []
+
+    async def request(name: str, lane: str) -> None:
+        await limiter.acquire(lane)
+        order.append(name)
+
+    batch = [asyncio.create_task(request(f"batch-{i}", BATCH)) for i in range(3)]
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(request("interactive", INTERACTIVE))
+    await asyncio.gather(*batch, interactive)
+
+    assert order[0] == "interactive"
+    assert order[1:] == ["batch-0", "batch-1", "batch-2"]
+    stats = limiter.stats()
+    assert stats[BATCH]["acquired"] == 4
+    assert stats[INTERACTIVE]["acquired"] == 1
+    assert stats[BATCH]["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_reserves_tokens_for_interactive():
+    limiter = RateLimiter(max_tokens=2, refill_rate=0.001, interactive_reserve=1)
+    await limiter.acquire(BATCH)
+    # The last token is held back from batch work...
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(limiter.acquire(BATCH), timeout=0.05)
+    # ...but is available to an interactive request straight away
+    await asyncio.wait_for(limiter.acquire(INTERACTIVE), timeout=0.05)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_bucket_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "rate_limit.db")
+    first = SqliteTokenBucket(path, max_tokens=2, refill_rate=0.001)
+    second = SqliteTokenBucket(path, max_tokens=2, refill_rate=0.001)
+
+    assert await first.try_take() == 0
+    assert await second.try_take() == 0
+    # Both "processes" drew from the same two-token budget
+    assert await first.try_take() > 0
+    assert await second.try_take() > 0
+
+    await first.give_back()
+    assert await second.try_take() == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_with_shared_bucket(tmp_path):
+    bucket = SqliteTokenBucket(
+        str(tmp_path / "rate_limit.db"), max_tokens=1, refill_rate=100.0
+    )
+    limiter = RateLimiter(bucket=bucket)
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.acquire()
+    assert time.monotonic() - start < 1.0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_fails_waiters_when_bucket_errors():
+    class LockedBucket(TokenBucket):
+        calls = 0
+
+        async def try_take(self, reserve: int = 0) -> float:
+            self.calls += 1
+            if self.calls == 1:
+                return 0.05  # the first caller queues and starts the dispatcher
+            raise sqlite3.OperationalError("database is locked")
+
+    limiter = RateLimiter(bucket=LockedBucket(max_tokens=1, refill_rate=1.0))
+    waiters = [asyncio.create_task(limiter.acquire()) for _ in range(3)]
+    results = await asyncio.wait_for(
+        asyncio.gather(*waiters, return_exceptions=True), timeout=1.0
+    )
+    assert all(isinstance(r, sqlite3.OperationalError) for r in results)
+    assert limiter.stats()[BATCH]["queue_depth"] == 0
@@ -0,0 +1,90 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app.data_sources.bar_store import BarStore, StoredBarSource
+from app.models.collected_date import CollectedDate
+from app.models.collection_log import CollectionLog
+from app.models.surge_event import SurgeEvent
+from app.models.surge_rollup import SurgeRollup
+from app.models.surge_tracking import SurgeTracking
+from app.services import rollup_service
+from app.tasks import backfill, daily_collection, reevaluate
+from tests.conftest import FakeSource
+
+# 2025-01-10 (Fri) .. 2025-01-17 (Fri); AAA gains 25% a day, BBB 12%
+DAYS = {
+    date(2025, 1, 10 + offset): [
+        {"T": "AAA", "c": 10.0 * 1.25**offset},
+        {"T": "BBB", "c": 5.0 * 1.12**offset},
+    ]
+    for offset in range(8)
+}
+
+
+async def _counts(session_factory) -> dict[str, int]:
+    async with session_factory() as session:
+        result = await session.execute(
+            select(SurgeEvent.symbol, func.count()).group_by(SurgeEvent.symbol)
+        )
+        return dict(result.all())
+
+
+@pytest.mark.asyncio
+async def test_reevaluation_uses_stored_bars_only(
+    session_factory, tmp_path, monkeypatch
+):
+    inner = FakeSource(DAYS)
+    market_data = StoredBarSource(inner, BarStore(str(tmp_path)))
+    monkeypatch.setattr(daily_collection, "market_data", market_data)
+    monkeypatch.setattr(backfill, "market_data", market_data)
+    monkeypatch.setattr(reevaluate, "market_data", market_data)
+
+    await backfill.run_backfill(date(2025, 1, 10), date(2025, 1, 17))
+    # Monday's move is measured from Friday, so BBB clears 20% once
+    assert await _counts(session_factory) == {"AAA": 5, "BBB": 1}
+    inner.calls.clear()
+
+    log_id = await reevaluate.run_threshold_reevaluation(threshold=10.0)
+    assert inner.calls == []
+    assert await _counts(session_factory) == {"AAA": 5, "BBB": 5}
+
+    async with session_factory() as session:
+        log = await session.get(CollectionLog, log_id)
+        assert log.status == "completed"
+        assert log.records_count == 4
+        assert log.details["dates_done"] == log.details["dates_total"]
+        # BBB's new events are tracked from the later stored closes
+        tracked = await session.execute(
+            select(func.count(SurgeTracking.id))
+            .join(SurgeEvent)
+            .where(SurgeEvent.symbol == "BBB", SurgeTracking.days_after == 1)
+        )
+        assert tracked.scalar() == 4
+        thresholds = await session.execute(
+            select(CollectedDate.trade_date, CollectedDate.threshold_pct)
+        )
+        # The first stored session has no previous day, so it is never checkpointed
+        assert dict(thresholds.all()) == {
+            date(2025, 1, day): 10.0 for day in range(13, 18)
+        }
+
+    await reevaluate.run_threshold_reevaluation(threshold=20.0, prune=True)
+    assert await _counts(session_factory) == {"AAA": 5, "BBB": 1}
+
+    async with session_factory() as session:
+        orphans = await session.execute(
+            select(func.count(SurgeTracking.id)).where(
+                SurgeTracking.surge_event_id.not_in(select(SurgeEvent.id))
+            )
+        )
+        assert orphans.scalar() == 0
+        thresholds = await session.execute(select(CollectedDate.threshold_pct))
+        assert set(thresholds.scalars().all()) == {20.0}
+        symbol_rollups = await session.execute(
+            select(SurgeRollup.key, SurgeRollup.count).where(
+                SurgeRollup.dimension == rollup_service.SYMBOL
+            )
+        )
+        assert dict(symbol_rollups.all()) == {"AAA": 5, "BBB": 1}
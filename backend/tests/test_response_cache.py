@@ -0,0 +1,120 @@
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from app.data_sources.bar_store import BarStore, DayBars
+from app.data_sources.cached_source import OPEN_RANGE_TTL, CachedSource
+from app.utils.response_cache import DiskCache, LRUCache, TieredCache
+from tests.conftest import FakeSource
+
+
+def test_lru_evicts_by_size():
+    cache = LRUCache(max_bytes=10)
+    cache.set("a", b"1111", None)
+    cache.set("b", b"2222", None)
+    assert cache.get("a") == (True, b"1111")  # "a" is now most recent
+    cache.set("c", b"3333", None)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, b"1111")
+    assert cache.size_bytes == 8
+
+
+def test_lru_expiry():
+    cache = LRUCache(max_bytes=10)
+    cache.set("a", b"1", expires_at=0.0)
+    assert cache.get("a") == (False, None)
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_hits_are_copies():
+    cache = TieredCache(LRUCache(1024))
+    await cache.set("k", [{"c": 1.5}])
+    _, value = await cache.get("k")
+    value[0]["c"] = 99.0
+    assert await cache.get("k") == (True, [{"c": 1.5}])
+
+
+def test_disk_cache_purges_expired_and_oldest_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(DiskCache, "PURGE_EVERY", 4)
+    path = str(tmp_path / "cache.db")
+    disk = DiskCache(path, max_rows=2)
+    disk._set("expired", b"1", expires_at=0.0)
+    for key in ("a", "b", "c"):
+        disk._set(key, b"1", None)  # the 4th write purges
+
+    assert disk._get("a") is None
+    assert disk._get("c") is not None
+    rows = sqlite3.connect(path).execute("SELECT key FROM response_cache").fetchall()
+    assert sorted(rows) == [("b",), ("c",)]
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_promotes_from_disk(tmp_path):
+    disk = DiskCache(str(tmp_path / "cache.db"))
+    await TieredCache(LRUCache(1024), disk).set("k", [{"c": 1.5}])
+
+    # A fresh process only has the disk tier
+    cache = TieredCache(LRUCache(1024), disk)
+    assert await cache.get("k") == (True, [{"c": 1.5}])
+    assert await cache.get("k") == (True, [{"c": 1.5}])
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.stats()["memory_hits"] == 1
+
+
+class CountingSource(FakeSource):
+    def __init__(self) -> None:
+        super().__init__({})
+        self.bar_calls = 0
+
+    async def aggregate_bars(self, symbol, from_date, to_date):
+        self.bar_calls += 1
+        return [{"c": 1.0, "t": 0}]
+
+
+@pytest.mark.asyncio
+async def test_cached_source_serves_repeat_chart_views(tmp_path):
+    inner = CountingSource()
+    source = CachedSource(inner, TieredCache(LRUCache(1024 * 1024)))
+
+    closed = (date(2025, 1, 1), date(2025, 3, 31))
+    for _ in range(3):
+        assert await source.aggregate_bars("AAPL", *closed) == [{"c": 1.0, "t": 0}]
+    assert inner.bar_calls == 1
+
+    today = date.today() + timedelta(days=1)
+    await source.aggregate_bars("AAPL", date(2025, 1, 1), today)
+    await source.aggregate_bars("AAPL", date(2025, 1, 1), today)
+    assert inner.bar_calls == 2
+
+
+class RecordingCache(TieredCache):
+    def __init__(self) -> None:
+        super().__init__(LRUCache(1024 * 1024))
+        self.ttls: dict[str, float | None] = {}
+
+    async def set(self, key, value, ttl=None):
+        self.ttls[key] = ttl
+        await super().set(key, value, ttl)
+
+
+@pytest.mark.asyncio
+async def test_cached_source_pins_only_published_sessions(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.save(date(2025, 1, 15), DayBars.from_results([{"T": "AAPL", "c": 1.0}]))
+    store.save(date(2025, 1, 16), DayBars())  # holiday marker, not a session
+    cache = RecordingCache()
+    source = CachedSource(CountingSource(), cache, store)
+
+    await source.aggregate_bars("AAPL", date(2025, 1, 1), date(2025, 1, 15))
+    # Polygon may not have published the 16th yet
+    await source.aggregate_bars("AAPL", date(2025, 1, 1), date(2025, 1, 16))
+    await CachedSource(CountingSource(), cache).aggregate_bars(
+        "MSFT", date(2025, 1, 1), date(2025, 1, 15)
+    )
+    assert cache.ttls == {
+        "aggs:AAPL:2025-01-01:2025-01-15": None,
+        "aggs:AAPL:2025-01-01:2025-01-16": OPEN_RANGE_TTL,
+        "aggs:MSFT:2025-01-01:2025-01-15": OPEN_RANGE_TTL,
+    }
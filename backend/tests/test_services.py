@@ -1,9 +1,19 @@
-import pytest
 from datetime import date
 
+import pytest
+
 from app.models.surge_event import SurgeEvent
+from app.models.surge_tracking import SurgeTracking
 from app.models.ticker import Ticker
-from app.services import surge_service, settings_service
+from app.services import (
+    rollup_service,
+    settings_service,
+    surge_service,
+    tracking_service,
+)
+from app.tasks.daily_collection import _insert_surge_events
+from app.tasks.reevaluate import _prune_below
+from tests.conftest import surge_row
 
 
 @pytest.mark.asyncio
@@ -22,14 +32,24 @@ async def test_get_surges_with_filter(db_session):
     surge1 = SurgeEvent(
         symbol="GME",
         event_date=date(2025, 1, 10),
-        open=10.0, high=15.0, low=9.0, close=14.0,
-        volume=100000, prev_close=10.0, change_pct=40.0,
+        open=10.0,
+        high=15.0,
+        low=9.0,
+        close=14.0,
+        volume=100000,
+        prev_close=10.0,
+        change_pct=40.0,
     )
     surge2 = SurgeEvent(
         symbol="GME",
         event_date=date(2025, 1, 11),
-        open=14.0, high=16.0, low=13.0, close=15.5,
-        volume=80000, prev_close=14.0, change_pct=10.71,
+        open=14.0,
+        high=16.0,
+        low=13.0,
+        close=15.5,
+        volume=80000,
+        prev_close=14.0,
+        change_pct=10.71,
     )
     db_session.add_all([surge1, surge2])
     await db_session.commit()
@@ -53,3 +73,124 @@ async def test_update_settings(db_session):
         db_session, {"surge_threshold_pct": "15.0"}
     )
     assert updated["surge_threshold_pct"] == "15.0"
+
+
+@pytest.mark.asyncio
+async def test_tracking_aggregates_in_one_pass(db_session):
+    db_session.add_all(
+        [
+            Ticker(symbol="GME", sic_description="Retail"),
+            Ticker(symbol="AMC", sic_description="Theaters"),
+        ]
+    )
+    events = [
+        SurgeEvent(
+            symbol=symbol,
+            event_date=date(2025, 1, day),
+            open=10.0,
+            high=15.0,
+            low=9.0,
+            close=14.0,
+            volume=1000,
+            prev_close=10.0,
+            change_pct=40.0,
+        )
+        for symbol, day in [("GME", 10), ("GME", 13), ("AMC", 10)]
+    ]
+    db_session.add_all(events)
+    await db_session.flush()
+    for event, change in zip(events, [10.0, -5.0, 3.0], strict=True):
+        db_session.add(
+            SurgeTracking(
+                surge_event_id=event.id,
+                days_after=1,
+                close_price=14.0,
+                change_from_surge_pct=change,
+                tracked_date=event.event_date,
+            )
+        )
+    await db_session.commit()
+
+    performance = await tracking_service.get_tracking_performance(
+        db_session, include_quantiles=True
+    )
+    assert performance == [
+        {
+            "days_after": 1,
+            "avg_change_pct": 2.67,
+            "win_rate": 66.67,
+            "sample_count": 3,
+            "p25_change_pct": -1.0,
+            "median_change_pct": 3.0,
+            "p75_change_pct": 6.5,
+        }
+    ]
+
+    sectors = await tracking_service.get_tracking_by_sector(db_session)
+    assert [s["sector"] for s in sectors] == ["Retail", "Theaters"]
+    retail = sectors[0]["performance"][0]
+    assert (retail["sample_count"], retail["win_rate"]) == (2, 50.0)
+    assert "median_change_pct" not in retail
+
+
+@pytest.mark.asyncio
+async def test_surge_stats_read_incremental_rollups(db_session):
+    db_session.add(
+        Ticker(symbol="GME", name="GameStop Corp.", sic_description="Retail")
+    )
+    await db_session.flush()
+    rows = [
+        surge_row("GME", date(2025, 1, 15), 40.0),
+        surge_row("GME", date(2025, 2, 13), 20.0),
+        surge_row("AMC", date(2025, 1, 15), 30.0),
+    ]
+    await _insert_surge_events(db_session, rows)
+    await _insert_surge_events(db_session, rows)  # duplicates are not counted
+    await db_session.commit()
+
+    stats = await surge_service.get_surge_stats(db_session)
+    assert stats["total_surges"] == 3
+    assert stats["by_sector"] == [
+        {"sector": "Retail", "count": 2, "avg_change_pct": 30.0}
+    ]
+    assert stats["by_day_of_week"] == [
+        {"day_of_week": 2, "day_name": "Wednesday", "count": 2},
+        {"day_of_week": 3, "day_name": "Thursday", "count": 1},
+    ]
+    assert [(m["month"], m["count"]) for m in stats["by_month"]] == [(1, 2), (2, 1)]
+    assert stats["repeat_surgers"] == [
+        {
+            "symbol": "GME",
+            "name": "GameStop Corp.",
+            "surge_count": 2,
+            "avg_change_pct": 30.0,
+        }
+    ]
+
+    await rollup_service.rebuild_rollups(db_session)
+    await db_session.commit()
+    assert await surge_service.get_surge_stats(db_session) == stats
+
+    # AMC was inserted as a placeholder; a later ticker sync fills its sector
+    amc = await db_session.get(Ticker, "AMC")
+    amc.sic_description = "Theaters"
+    await db_session.commit()
+    stats = await surge_service.get_surge_stats(db_session)
+    assert stats["by_sector"] == [
+        {"sector": "Retail", "count": 2, "avg_change_pct": 30.0},
+        {"sector": "Theaters", "count": 1, "avg_change_pct": 30.0},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_count_cache_sees_deletes_of_older_events(db_session):
+    rows = [surge_row("GME", date(2025, 1, 13), 21.0)]
+    rows += [surge_row("GME", date(2025, 1, day)) for day in (14, 15)]
+    await _insert_surge_events(db_session, rows)
+    await db_session.commit()
+    assert (await surge_service.get_surges(db_session))[1] == 3
+
+    # Deletes the oldest event, not the newest
+    assert await _prune_below(db_session, 22.0) == 1
+    await db_session.commit()
+    assert (await surge_service.get_surges(db_session))[1] == 2
@@ -0,0 +1,59 @@
+from datetime import date
+
+from app.data_sources.bar_store import DayBars
+from app.tasks.surge_detection import detect_surges, detect_surges_for_date
+
+PREVIOUS = DayBars.from_results(
+    [
+        {"T": "AAA", "c": 10.0},
+        {"T": "BBB", "c": 50.0},
+        {"T": "CCC", "c": 0.0},
+        {"T": "DDD", "c": 5.0},
+    ]
+)
+CURRENT = DayBars.from_results(
+    [
+        {
+            "T": "AAA",
+            "o": 10.0,
+            "h": 13.0,
+            "l": 9.5,
+            "c": 12.0,
+            "v": 1000.0,
+            "vw": 11.5,
+        },
+        {"T": "BBB", "o": 50.0, "h": 52.0, "l": 49.0, "c": 51.0, "v": 500.0},
+        {"T": "CCC", "o": 1.0, "h": 1.0, "l": 1.0, "c": 1.0, "v": 10.0},
+        {"T": "DDD", "o": 5.0, "h": 9.0, "l": 5.0, "c": 8.0, "v": 20.0},
+        {"T": "NEW", "o": 1.0, "h": 9.0, "l": 1.0, "c": 9.0, "v": 20.0},
+    ]
+)
+
+
+def test_detect_surges_threshold_and_alignment():
+    rows = detect_surges(CURRENT, PREVIOUS, 20.0)
+    assert [r["symbol"] for r in rows] == ["AAA", "DDD"]
+    assert rows[0] == {
+        "symbol": "AAA",
+        "open": 10.0,
+        "high": 13.0,
+        "low": 9.5,
+        "close": 12.0,
+        "volume": 1000,
+        "prev_close": 10.0,
+        "change_pct": 20.0,
+        "vwap": 11.5,
+    }
+    assert rows[1]["change_pct"] == 60.0
+    assert rows[1]["vwap"] is None
+
+
+def test_detect_surges_without_previous_day():
+    assert detect_surges(CURRENT, DayBars(), 20.0) == []
+
+
+def test_detect_surges_for_date_sets_event_date():
+    rows = detect_surges_for_date(date(2025, 1, 15), CURRENT, PREVIOUS, 50.0)
+    assert [(r["symbol"], r["event_date"]) for r in rows] == [
+        ("DDD", date(2025, 1, 15))
+    ]
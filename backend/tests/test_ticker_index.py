@@ -0,0 +1,70 @@
+import pytest
+
+from app.models.ticker import Ticker
+from app.tasks.daily_collection import _ensure_tickers
+from app.utils.ticker_index import TickerEntry, TickerIndex
+
+ENTRIES = [
+    TickerEntry("AAPL", "Apple Inc.", "XNAS"),
+    TickerEntry("AAP", "Advance Auto Parts Inc.", "XNYS"),
+    TickerEntry("APLE", "Apple Hospitality REIT Inc.", "XNYS"),
+    TickerEntry("MSFT", "Microsoft Corporation", "XNAS"),
+    TickerEntry("GME", "GameStop Corp.", "XNYS"),
+]
+
+
+def _index() -> TickerIndex:
+    index = TickerIndex()
+    index.build(list(ENTRIES))
+    return index
+
+
+def test_exact_symbol_ranks_before_prefix_and_names():
+    symbols = [e.symbol for e in _index().search("aap")]
+    assert symbols[:2] == ["AAP", "AAPL"]
+
+
+def test_fuzzy_name_match():
+    index = _index()
+    assert index.search("microsft")[0].symbol == "MSFT"  # typo
+    # Equal similarity: the shorter (closer) name first
+    assert [e.symbol for e in index.search("apple")] == ["AAPL", "APLE"]
+    assert index.search("gamestop")[0].symbol == "GME"
+    assert index.search("zzzz") == []
+
+
+def test_limit():
+    assert len(_index().search("a", limit=2)) == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_from_table(db_session):
+    db_session.add_all(
+        [Ticker(symbol="TSLA", name="Tesla, Inc."), Ticker(symbol="NEWCO")]
+    )
+    await db_session.commit()
+
+    index = TickerIndex()
+    assert not index.ready
+    await index.refresh(db_session)
+    assert index.ready and len(index) == 2
+    assert index.search("tesla") == [TickerEntry("TSLA", "Tesla, Inc.", None)]
+    assert index.search("NEW")[0].symbol == "NEWCO"
+
+
+@pytest.mark.asyncio
+async def test_index_picks_up_placeholder_tickers(db_session):
+    db_session.add(Ticker(symbol="TSLA", name="Tesla, Inc."))
+    await db_session.commit()
+    index = TickerIndex()
+    await index.refresh(db_session)
+    await db_session.commit()
+
+    # Collection inserts placeholders for symbols missing from the table
+    await _ensure_tickers(db_session, ["NEWCO", "TSLA"])
+    await db_session.commit()
+    assert index.search("NEWCO") == []
+
+    await index.ensure_current(db_session)
+    assert index.search("NEWCO") == [TickerEntry("NEWCO", None, None)]
+    assert len(index) == 2
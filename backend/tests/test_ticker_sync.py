@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import select
+
+from app.models.ticker import Ticker
+from app.tasks.ticker_sync import _upsert_tickers
+
+
+def _row(symbol: str, name: str, exchange: str = "XNAS") -> dict:
+    return {
+        "symbol": symbol,
+        "name": name,
+        "market": "stocks",
+        "exchange": exchange,
+        "type": "CS",
+        "currency": "usd",
+        "active": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_upsert_tickers_counts(db_session):
+    first = [_row("AAPL", "Apple Inc."), _row("MSFT", "Microsoft Corp")]
+    assert await _upsert_tickers(db_session, first) == {
+        "inserted": 2,
+        "updated": 0,
+        "unchanged": 0,
+    }
+
+    second = [
+        _row("AAPL", "Apple Inc."),
+        _row("MSFT", "Microsoft Corporation"),
+        _row("NVDA", "NVIDIA Corp"),
+    ]
+    assert await _upsert_tickers(db_session, second) == {
+        "inserted": 1,
+        "updated": 1,
+        "unchanged": 1,
+    }
+    await db_session.commit()
+
+    result = await db_session.execute(select(Ticker).order_by(Ticker.symbol))
+    assert [(t.symbol, t.name) for t in result.scalars()] == [
+        ("AAPL", "Apple Inc."),
+        ("MSFT", "Microsoft Corporation"),
+        ("NVDA", "NVIDIA Corp"),
+    ]
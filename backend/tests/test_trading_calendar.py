@@ -0,0 +1,64 @@
+from datetime import date
+
+import pytest
+
+from app.utils.trading_calendar import (
+    is_early_close,
+    is_trading_day,
+    next_trading_day,
+    previous_trading_day,
+    trading_day_offset,
+    trading_days_between,
+)
+
+
+@pytest.mark.parametrize(
+    "holiday",
+    [
+        date(2024, 1, 1),  # New Year's Day
+        date(2024, 1, 15),  # MLK Day
+        date(2024, 2, 19),  # Washington's Birthday
+        date(2024, 3, 29),  # Good Friday
+        date(2024, 5, 27),  # Memorial Day
+        date(2024, 6, 19),  # Juneteenth
+        date(2024, 7, 4),  # Independence Day
+        date(2024, 9, 2),  # Labor Day
+        date(2024, 11, 28),  # Thanksgiving
+        date(2024, 12, 25),  # Christmas
+        date(2022, 12, 26),  # Christmas observed on Monday
+        date(2025, 1, 9),  # Special closure
+    ],
+)
+def test_holidays_are_not_trading_days(holiday):
+    assert not is_trading_day(holiday)
+
+
+def test_saturday_new_year_is_not_observed_on_friday():
+    assert is_trading_day(date(2021, 12, 31))
+
+
+def test_sessions_per_year():
+    assert len(trading_days_between(date(2023, 1, 1), date(2023, 12, 31))) == 250
+    assert len(trading_days_between(date(2024, 1, 1), date(2024, 12, 31))) == 252
+
+
+def test_early_closes():
+    assert is_early_close(date(2024, 7, 3))
+    assert is_early_close(date(2024, 11, 29))
+    assert is_early_close(date(2024, 12, 24))
+    assert not is_early_close(date(2024, 7, 5))
+
+
+def test_offsets_skip_weekends_and_holidays():
+    # Friday before MLK Day
+    assert next_trading_day(date(2025, 1, 17)) == date(2025, 1, 21)
+    assert previous_trading_day(date(2025, 1, 21)) == date(2025, 1, 17)
+    assert trading_day_offset(date(2025, 1, 17), 3) == date(2025, 1, 23)
+    # Offsets from a weekend count from the adjacent sessions
+    assert trading_day_offset(date(2025, 1, 18), 1) == date(2025, 1, 21)
+    assert trading_day_offset(date(2025, 1, 18), -1) == date(2025, 1, 17)
+
+
+def test_out_of_range():
+    with pytest.raises(ValueError):
+        next_trading_day(date(1980, 1, 1))